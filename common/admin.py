@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from common.models import Comment
+from common.models import BackgroundTask, Comment
 
 # Register your models here.
 admin.site.register(Comment)
+admin.site.register(BackgroundTask)
@@ -0,0 +1,170 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import UserRateThrottle
+
+from manga_back.throttling import UserTokenBucketThrottle
+
+
+class CountingCache:
+    """
+    Wrapper of the default cache that counts the calls made through it.
+    """
+
+    def __init__(self):
+        """
+        Initialize the counter.
+
+        Returns:
+            None
+        """
+        self.calls = 0
+
+    def __getattr__(self, name):
+        """
+        Count and forward a cache method.
+
+        Args:
+            name (str): The method name.
+
+        Returns:
+            callable: The cache method.
+        """
+        self.calls += 1
+        return getattr(cache, name)
+
+
+class BenchmarkUser:
+    """
+    Authenticated stand-in user, so the benchmark needs no database rows.
+    """
+
+    is_authenticated = True
+
+    def __init__(self, pk):
+        """
+        Initialize the user.
+
+        Args:
+            pk (int): The user ID.
+
+        Returns:
+            None
+        """
+        self.pk = pk
+
+
+class BenchmarkView:
+    """
+    Stand-in view with the throttle scope of the comment endpoints.
+    """
+
+    throttle_scope = "comments"
+
+
+class Command(BaseCommand):
+    """
+    Management command that measures the overhead of the write throttles per request.
+
+    Each simulated client sends --requests POST requests to the token bucket throttle and to DRF's
+    UserRateThrottle at the same rate, the second keeping the history of every request within the period.
+    The buckets use the configured default cache, so run it with REDIS_URL set to include the round trips.
+    """
+
+    help = "Benchmark the token bucket throttle against DRF's request history throttle."
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments.
+
+        Args:
+            parser: The argument parser.
+
+        Returns:
+            None
+        """
+        parser.add_argument("--clients", type=int, default=100, help="Number of simulated users.")
+        parser.add_argument("--requests", type=int, default=100, help="Requests per user.")
+        parser.add_argument("--rate", default="1000/min", help="Rate of both throttles.")
+
+    def handle(self, *args, **options):
+        """
+        Time both throttles and print the cost per request.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Returns:
+            None
+        """
+        rate = options["rate"]
+        requests = self.build_requests(options["clients"], options["requests"])
+        history_throttle = type("HistoryThrottle", (UserRateThrottle,), {"rate": rate, "cache": CountingCache()})
+        bucket_throttle = type("BucketThrottle", (UserTokenBucketThrottle,), {"cache": CountingCache()})
+        with self.settings_rate(rate):
+            for name, throttle_class in (("token bucket", bucket_throttle), ("request history", history_throttle)):
+                cache.clear()
+                allowed, elapsed = self.run(throttle_class, requests)
+                self.stdout.write(
+                    f"{name}: {elapsed / len(requests) * 1_000_000:.1f} us and "
+                    f"{throttle_class.cache.calls / len(requests):.1f} cache calls per request, "
+                    f"{allowed} of {len(requests)} allowed."
+                )
+        cache.clear()
+
+    def build_requests(self, clients, per_client):
+        """
+        Build the POST requests of every client, interleaved.
+
+        Args:
+            clients (int): Number of users.
+            per_client (int): Requests per user.
+
+        Returns:
+            list: The requests.
+        """
+        factory = APIRequestFactory()
+        requests = []
+        for _ in range(per_client):
+            for pk in range(clients):
+                request = factory.post("/commn/comments/")
+                request.user = BenchmarkUser(pk)
+                requests.append(request)
+        return requests
+
+    def run(self, throttle_class, requests):
+        """
+        Check every request against a throttle.
+
+        Args:
+            throttle_class (type): The throttle.
+            requests (list): The requests.
+
+        Returns:
+            tuple: Number of allowed requests and the elapsed seconds.
+        """
+        view = BenchmarkView()
+        allowed = 0
+        started = time.perf_counter()
+        for request in requests:
+            allowed += throttle_class().allow_request(request, view)
+        return allowed, time.perf_counter() - started
+
+    def settings_rate(self, rate):
+        """
+        Use the given rate for the comment scope of the token bucket throttle.
+
+        Args:
+            rate (str): The rate.
+
+        Returns:
+            override_settings: The settings override.
+        """
+        rest_framework = {**settings.REST_FRAMEWORK}
+        rest_framework["DEFAULT_THROTTLE_RATES"] = {**rest_framework["DEFAULT_THROTTLE_RATES"], "comments.user": rate}
+        return override_settings(REST_FRAMEWORK=rest_framework)
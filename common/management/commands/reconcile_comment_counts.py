@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from common.service.service import reconcile_comment_counts
+from manga.models import Chapter, Manga
+
+
+class Command(BaseCommand):
+    """
+    Management command that recounts the comments of every manga and chapter.
+    """
+
+    help = "Fix Manga.comment_count and Chapter.comment_count values that drifted from the comments."
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments.
+
+        Args:
+            parser: The argument parser.
+
+        Returns:
+            None
+        """
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of objects checked per query.")
+
+    def handle(self, *args, **options):
+        """
+        Recount the comments and report the corrected counters.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Returns:
+            None
+        """
+        for model in (Manga, Chapter):
+            corrected = reconcile_comment_counts(model, options["batch_size"])
+            self.stdout.write(f"{model._meta.verbose_name_plural}: corrected {corrected} counters.")
+        self.stdout.write(self.style.SUCCESS("Comment counters reconciled."))
@@ -0,0 +1,51 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from common.service.service_tasks import requeue_stale_tasks, run_pending_tasks
+
+
+class Command(BaseCommand):
+    """
+    Management command that runs the background task worker.
+    """
+
+    help = "Run queued background tasks (thumbnails, notifications) until stopped."
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments.
+
+        Args:
+            parser: The argument parser.
+
+        Returns:
+            None
+        """
+        parser.add_argument("--once", action="store_true", help="Run the due tasks and exit.")
+        parser.add_argument("--sleep", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--stale-minutes", type=int, default=15, help="Requeue tasks running longer than this.")
+
+    def handle(self, *args, **options):
+        """
+        Poll the queue and run due tasks.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Returns:
+            None
+        """
+        requeued = requeue_stale_tasks(timedelta(minutes=options["stale_minutes"]))
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale tasks.")
+        while True:
+            count = run_pending_tasks()
+            if count:
+                self.stdout.write(f"Ran {count} tasks.")
+            if options["once"]:
+                break
+            if not count:
+                time.sleep(options["sleep"])
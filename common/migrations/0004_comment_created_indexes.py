@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("common", "0003_background_task"),
+        ("manga", "0006_notification_watermark"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["manga", "-created_at", "-id"], name="comment_manga_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["chapter", "-created_at", "-id"], name="comment_chapter_created_idx"),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("common", "0004_comment_created_indexes"),
+        ("manga", "0007_comment_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["user", "-created_at", "-id"], name="comment_user_created_idx"),
+        ),
+    ]
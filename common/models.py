@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 
 from manga.models import Chapter, Manga
 from users.models import CustomUser
@@ -31,6 +33,12 @@ class Comment(models.Model):
         """
 
         ordering = ["-created_at"]
+        indexes = [
+            # Comment listings are paginated by (created_at, id) per manga, per chapter and per user.
+            models.Index(fields=["manga", "-created_at", "-id"], name="comment_manga_created_idx"),
+            models.Index(fields=["chapter", "-created_at", "-id"], name="comment_chapter_created_idx"),
+            models.Index(fields=["user", "-created_at", "-id"], name="comment_user_created_idx"),
+        ]
 
     def __str__(self):
         """
@@ -54,8 +62,56 @@ class Comment(models.Model):
         """
         if not self.pk:
             self.user = self.user or get_user_model().objects.get(pk=self.user_id)  # Make sure the user has installed
-        super().save(*args, **kwargs)
+        if self._state.adding:
+            counted_manga_id = counted_chapter_id = None
+        else:
+            counted_manga_id, counted_chapter_id = getattr(self, "_counted_for", (self.manga_id, self.chapter_id))
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            move_comment_count(Manga, counted_manga_id, self.manga_id)
+            move_comment_count(Chapter, counted_chapter_id, self.chapter_id)
+        self._counted_for = (self.manga_id, self.chapter_id)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Load a comment and remember the manga and chapter it is counted for.
+
+        Args:
+            db (str): The database alias.
+            field_names (list): Names of the loaded fields.
+            values (list): Values of the loaded fields.
+
+        Returns:
+            Comment: The comment.
+        """
+        instance = super().from_db(db, field_names, values)
+        if "manga_id" in instance.__dict__ and "chapter_id" in instance.__dict__:
+            instance._counted_for = (instance.manga_id, instance.chapter_id)
+        return instance
+
+
+def move_comment_count(model, old_id, new_id):
+    """
+    Move one comment from the counter of one manga or chapter to another with F-expression updates.
+
+    Args:
+        model (type): Manga or Chapter.
+        old_id (int or None): The object the comment was counted for, None for a new comment.
+        new_id (int or None): The object the comment is counted for now, None for a deleted comment.
 
+    Returns:
+        None
+
+    Example:
+        move_comment_count(Manga, None, comment.manga_id)
+    """
+    if old_id == new_id:
+        return
+    if old_id is not None:
+        model.objects.filter(pk=old_id, comment_count__gt=0).update(comment_count=F("comment_count") - 1)
+    if new_id is not None:
+        model.objects.filter(pk=new_id).update(comment_count=F("comment_count") + 1)
 
 
 class MangaRating(models.Model):
@@ -93,18 +149,53 @@ class MangaRating(models.Model):
         return f"{self.user.username} rated {self.manga.name_manga} - {self.rating}/5"
 
 
-    def save(self, *args, **kwargs):
+class BackgroundTask(models.Model):
+    """
+    Model representing a job queued for the background worker (``manage.py run_tasks``).
+
+    Attributes:
+        name (str): Dotted path of the function to call.
+        key (str): Optional key, a pending task with the same name and key is not queued twice.
+        kwargs (dict): Keyword arguments passed to the function.
+        status (str): Pending, running or failed.
+        attempts (int): Number of times the task was started.
+        run_after (datetime): The task is not started before this time.
+        error (str): Last error message.
+        created_at (datetime): The date and time the task was queued.
+        updated_at (datetime): The date and time the task was last updated.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    FAILED = "failed"
+    STATUS_CHOICES = [(PENDING, "Pending"), (RUNNING, "Running"), (FAILED, "Failed")]
+
+    name = models.CharField(max_length=200)
+    key = models.CharField(max_length=100, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """
+        Meta options for BackgroundTask model.
         """
-        Save the MangaRating instance to the database.
 
-        Args:
-            *args: Variable length argument list.
-            **kwargs: Arbitrary keyword arguments.
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+            models.Index(fields=["name", "key"]),
+        ]
 
-        Returns:
-            None
+    def __str__(self):
         """
-        if not self.pk:
-            self.user = self.user or get_user_model().objects.get(pk=self.user_id)
-        super().save(*args, **kwargs)
+        Return a string representation of the BackgroundTask instance.
 
+        Returns:
+            str: Task name, key and status.
+        """
+        return f"{self.name}({self.key}) - {self.status}"
@@ -4,6 +4,7 @@ from manga.models import Manga
 from users.models import CustomUser
 
 from .models import Comment, MangaRating
+from .service.service import rate_manga
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -121,10 +122,12 @@ class MangaRatingSerializer(serializers.ModelSerializer):
     """
     Serializer for MangaRating model.
 
-    Serializes rating and manga_slug fields. Handles creation and update of ratings.
+    Serializes rating and manga_slug fields. Saving creates or updates the rating of the request user.
     """
 
-    manga_slug = serializers.SlugRelatedField(queryset=Manga.objects.all(), slug_field="slug", source="manga")
+    manga_slug = serializers.SlugRelatedField(
+        queryset=Manga.objects.only("id", "slug"), slug_field="slug", source="manga"
+    )
 
     class Meta:
         model = MangaRating
@@ -132,7 +135,7 @@ class MangaRatingSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """
-        Create or update a MangaRating for the current user and manga.
+        Create or update a MangaRating for the current user and manga with one upsert.
 
         Args:
             validated_data (dict): Validated data for MangaRating.
@@ -140,18 +143,4 @@ class MangaRatingSerializer(serializers.ModelSerializer):
         Returns:
             MangaRating: Created or updated MangaRating instance.
         """
-        user = self.context["request"].user
-        manga_slug = self.context["request"].data["manga_slug"]
-        manga = Manga.objects.get(slug=manga_slug)
-
-        # Check whether a rating already exists for this user and manga
-        existing_rating = MangaRating.objects.filter(user=user, manga=manga).first()
-        if existing_rating:
-            # If the assessment already exists, just update it
-            existing_rating.rating = validated_data["rating"]
-            existing_rating.save()
-            return existing_rating
-
-        validated_data["user"] = user
-        validated_data["manga"] = manga
-        return super().create(validated_data)
+        return rate_manga(self.context["request"].user, validated_data["manga"], validated_data["rating"])
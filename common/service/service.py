@@ -1,10 +1,17 @@
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
 from common.models import Comment, MangaRating
+from manga.models import Manga
 
 
 def comment_object_filter(model: str, slug) -> Comment:
     """
     Retrieve comments filtered by model type (manga or chapter) and slug.
 
+    The authors are joined in the same query and only the rendered columns are loaded.
+
     Args:
         model (str): The type of model ('manga' or 'chapter').
         slug (str): The slug identifier for the manga or chapter.
@@ -19,32 +26,97 @@ def comment_object_filter(model: str, slug) -> Comment:
         comment_object_filter('manga', 'naruto')
     """
     if model == "manga":
-        return Comment.objects.filter(manga__slug=slug)
+        comments = Comment.objects.filter(manga__slug=slug)
     elif model == "chapter":
-        print(Comment.objects.filter(chapter__slug=slug))
-        return Comment.objects.filter(chapter__slug=slug)
+        comments = Comment.objects.filter(chapter__slug=slug)
     else:
         return Comment.objects.none()
+    return comments.select_related("user").only("id", "content", "created_at", "user", "user__username", "user__slug")
 
 
-def mangarating_object_filter(
-    manga_id,
-    user_id,
-) -> MangaRating:
+def refresh_manga_rating(manga_id):
     """
-    Retrieve the manga rating for a specific user and manga.
+    Recompute the stored rating count and sum of a manga from its ratings with one UPDATE.
+
+    The aggregates are recounted over the manga's ratings rather than adjusted, so values left stale by
+    concurrent writes are corrected by the next rating of the manga.
 
     Args:
-        manga_id: The ID of the manga.
-        user_id: The ID of the user.
+        manga_id (int): The manga ID.
 
     Returns:
-        MangaRating: The MangaRating object or None if not found.
-
-    Raises:
         None
 
     Example:
-        mangarating_object_filter(1, 42)
+        refresh_manga_rating(manga.pk)
+    """
+    ratings = MangaRating.objects.filter(manga=OuterRef("pk")).order_by().values("manga")
+    Manga.objects.filter(pk=manga_id).update(
+        rating_count=Coalesce(Subquery(ratings.annotate(n=Count("id")).values("n")), 0),
+        rating_sum=Coalesce(Subquery(ratings.annotate(total=Sum("rating")).values("total")), 0),
+    )
+
+
+def rate_manga(user, manga, rating):
+    """
+    Create or change the user's rating of a manga.
+
+    The rating is written with one INSERT ... ON CONFLICT (user, manga) DO UPDATE and the manga's stored
+    aggregates are refreshed in the same transaction.
+
+    Args:
+        user (CustomUser): The user rating the manga.
+        manga (Manga): The rated manga.
+        rating (int): The rating, 1 to 5.
+
+    Returns:
+        MangaRating: The written rating.
+
+    Example:
+        rate_manga(request.user, manga, 5)
+    """
+    manga_rating = MangaRating(user=user, manga=manga, rating=rating)
+    with transaction.atomic():
+        MangaRating.objects.bulk_create(
+            [manga_rating],
+            update_conflicts=True,
+            unique_fields=["user", "manga"],
+            update_fields=["rating", "updated_at"],
+        )
+        refresh_manga_rating(manga.pk)
+    return manga_rating
+
+
+def reconcile_comment_counts(model, batch_size=1000):
+    """
+    Recount the comments of every manga or chapter and fix the counters that drifted.
+
+    Objects are checked in primary key batches with a COUNT subquery. The drifted rows of a batch are
+    recounted in the UPDATE itself, so comments added meanwhile are not lost.
+
+    Args:
+        model (type): Manga or Chapter.
+        batch_size (int, optional): Objects checked per query.
+
+    Returns:
+        int: Number of corrected counters.
+
+    Example:
+        reconcile_comment_counts(Manga)
     """
-    return MangaRating.objects.filter(manga=manga_id, user=user_id).first()
+    field = model._meta.model_name
+    counts = (
+        Comment.objects.filter(**{field: OuterRef("pk")}).order_by().values(field).annotate(n=Count("id")).values("n")
+    )
+    actual = Coalesce(Subquery(counts), 0)
+    objects = model.objects.annotate(actual=actual).order_by("pk")
+    corrected = 0
+    last_pk = 0
+    while True:
+        batch = list(objects.filter(pk__gt=last_pk).values_list("pk", "comment_count", "actual")[:batch_size])
+        if not batch:
+            return corrected
+        last_pk = batch[-1][0]
+        drifted = [pk for pk, stored, counted in batch if stored != counted]
+        if drifted:
+            corrected += model.objects.filter(pk__in=drifted).update(comment_count=actual)
@@ -0,0 +1,264 @@
+import hashlib
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import locks
+from django.http import Http404
+
+from manga.models import Manga, Page
+from manga_back.images import IMAGE_FORMATS, render_variant
+from users.models import CustomUser
+
+IMAGE_SOURCES = {
+    "manga": (Manga, "slug", "avatar"),
+    "page": (Page, "pk", "image"),
+    "user": (CustomUser, "slug", "avatar"),
+}
+# Cached variants are touched at most this often (seconds) to keep their LRU position.
+TOUCH_INTERVAL = 60
+
+
+class VariantCache:
+    """
+    Disk cache of rendered image variants with a size quota and least-recently-used eviction.
+
+    The modification time of a cached file is its last use. Concurrent requests for the same
+    variant wait for a single render, across threads with a lock per key and across processes
+    with a lock file.
+    """
+
+    def __init__(self, root, max_bytes):
+        """
+        Initialize the cache.
+
+        Args:
+            root (str): Cache directory.
+            max_bytes (int): Disk quota in bytes.
+
+        Returns:
+            None
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self._key_locks = {}
+        self._key_locks_guard = threading.Lock()
+        self._size_guard = threading.Lock()
+        self._size = None
+
+    def path(self, key, extension):
+        """
+        Return the file path of a cached variant.
+
+        Args:
+            key (str): SHA-256 hex key of the variant.
+            extension (str): File extension.
+
+        Returns:
+            str: Absolute path.
+        """
+        return os.path.join(self.root, key[:2], key[2:4], f"{key}.{extension}")
+
+    def get_or_render(self, key, extension, render):
+        """
+        Return the path of a cached variant, rendering it on the first request.
+
+        Args:
+            key (str): SHA-256 hex key of the variant.
+            extension (str): File extension.
+            render (callable): Called with a binary file object to write the variant into.
+
+        Returns:
+            str: Absolute path of the cached variant.
+
+        Example:
+            cache.get_or_render(key, "webp", lambda target: img.save(target, "WEBP"))
+        """
+        path = self.path(key, extension)
+        if self.touch(path):
+            return path
+        with self.key_lock(key):
+            if self.touch(path):
+                return path
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f"{path}.lock", "wb") as lock_file:
+                locks.lock(lock_file, locks.LOCK_EX)
+                try:
+                    if not os.path.exists(path):
+                        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                        try:
+                            with open(tmp_path, "wb") as target:
+                                render(target)
+                            os.replace(tmp_path, path)
+                        finally:
+                            if os.path.exists(tmp_path):
+                                os.remove(tmp_path)
+                        self.add_size(os.path.getsize(path))
+                finally:
+                    locks.unlock(lock_file)
+            try:
+                os.remove(f"{path}.lock")
+            except FileNotFoundError:
+                pass
+        return path
+
+    def key_lock(self, key):
+        """
+        Return the in-process lock of a variant key.
+
+        Args:
+            key (str): SHA-256 hex key of the variant.
+
+        Returns:
+            threading.Lock: The lock shared by all threads rendering this key.
+        """
+        with self._key_locks_guard:
+            if len(self._key_locks) > 1024:
+                self._key_locks = {k: lock for k, lock in self._key_locks.items() if lock.locked()}
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def touch(self, path):
+        """
+        Mark a cached variant as used.
+
+        Args:
+            path (str): Absolute path.
+
+        Returns:
+            bool: True if the variant is cached.
+        """
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return False
+        if time.time() - mtime > TOUCH_INTERVAL:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                return False
+        return True
+
+    def add_size(self, size):
+        """
+        Account for a newly written variant and evict old ones when the quota is exceeded.
+
+        Args:
+            size (int): Size of the new file in bytes.
+
+        Returns:
+            None
+        """
+        with self._size_guard:
+            if self._size is None:
+                self._size = self.scan()[1]
+            else:
+                self._size += size
+            if self._size > self.max_bytes:
+                self._size = self.evict()
+
+    def scan(self):
+        """
+        List the cached variants.
+
+        Returns:
+            tuple: (list of (mtime, size, path), total size in bytes)
+        """
+        entries = []
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith((".lock", ".tmp")):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries, sum(entry[1] for entry in entries)
+
+    def evict(self):
+        """
+        Delete the least recently used variants until the cache is at 90% of its quota.
+
+        Returns:
+            int: Cache size in bytes after eviction.
+        """
+        entries, total = self.scan()
+        target = self.max_bytes * 0.9
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
+
+
+_variant_caches = {}
+
+
+def get_variant_cache():
+    """
+    Return the variant cache configured in settings.
+
+    Returns:
+        VariantCache: The cache for the current MEDIA_ROOT and quota.
+    """
+    root = os.path.join(settings.MEDIA_ROOT, settings.IMAGE_VARIANT_CACHE_DIR)
+    key = (root, settings.IMAGE_VARIANT_CACHE_MAX_BYTES)
+    if key not in _variant_caches:
+        _variant_caches[key] = VariantCache(*key)
+    return _variant_caches[key]
+
+
+def image_variant(kind, lookup, preset, image_format):
+    """
+    Return a resized variant of a manga avatar, page image or user avatar, rendering it if needed.
+
+    Args:
+        kind (str): Key of IMAGE_SOURCES ("manga", "page" or "user").
+        lookup (str): Manga or user slug, or page ID.
+        preset (str): Key of settings.IMAGE_VARIANT_PRESETS.
+        image_format (str): Key of IMAGE_FORMATS.
+
+    Returns:
+        tuple: (absolute path, name relative to MEDIA_ROOT)
+
+    Raises:
+        Http404: If the source, preset or format is unknown or the source cannot be rendered.
+
+    Example:
+        image_variant("manga", "naruto", "cover-md", "webp")
+    """
+    presets = settings.IMAGE_VARIANT_PRESETS
+    if kind not in IMAGE_SOURCES or preset not in presets or image_format not in IMAGE_FORMATS:
+        raise Http404("Unknown image variant.")
+    model, lookup_field, field_name = IMAGE_SOURCES[kind]
+    try:
+        source_name = model.objects.filter(**{lookup_field: lookup}).values_list(field_name, flat=True).first()
+    except (ValueError, ValidationError) as e:
+        raise Http404("Image not found.") from e
+    if not source_name:
+        raise Http404("Image not found.")
+
+    storage = model._meta.get_field(field_name).storage
+    size, crop = tuple(presets[preset]["size"]), presets[preset]["crop"]
+    pillow_format = IMAGE_FORMATS[image_format]
+
+    def render(target):
+        with storage.open(source_name) as source:
+            img = render_variant(source, size, crop, image_format)
+        img.save(target, format=pillow_format, quality=settings.IMAGE_VARIANT_QUALITY)
+
+    cache = get_variant_cache()
+    key = hashlib.sha256(f"{source_name}|{preset}".encode()).hexdigest()
+    try:
+        path = cache.get_or_render(key, image_format, render)
+    except Exception as e:
+        # Unreadable files and images Pillow cannot convert or decode are treated as missing.
+        raise Http404("Image cannot be rendered.") from e
+    return path, os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, "/")
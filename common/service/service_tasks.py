@@ -0,0 +1,135 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from common.models import BackgroundTask
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_task(name: str, key: str = "", **kwargs) -> BackgroundTask | None:
+    """
+    Queue a function call for the background worker.
+
+    The task row is written in the caller's transaction, so the worker only sees it after commit.
+    With BACKGROUND_TASKS_EAGER enabled the function runs right after the transaction commits instead.
+
+    Args:
+        name (str): Dotted path of the function to call.
+        key (str, optional): A pending task with the same name and key is reused instead of queued again.
+        **kwargs: JSON-serializable keyword arguments for the function.
+
+    Returns:
+        BackgroundTask: The queued task, or None in eager mode.
+
+    Example:
+        enqueue_task("manga.tasks.generate_manga_thumbnail", key="42", manga_id=42)
+    """
+    if settings.BACKGROUND_TASKS_EAGER:
+        transaction.on_commit(lambda: import_string(name)(**kwargs))
+        return None
+    if key:
+        pending = BackgroundTask.objects.filter(name=name, key=key, status=BackgroundTask.PENDING).first()
+        if pending:
+            return pending
+    return BackgroundTask.objects.create(name=name, key=key, kwargs=kwargs)
+
+
+def claim_task() -> BackgroundTask | None:
+    """
+    Claim the oldest due pending task.
+
+    A task is claimed by a conditional UPDATE, so concurrent workers never start the same task twice.
+
+    Returns:
+        BackgroundTask: The claimed task or None if nothing is due.
+
+    Example:
+        claim_task()
+    """
+    due = BackgroundTask.objects.filter(status=BackgroundTask.PENDING, run_after__lte=timezone.now())
+    for task_id in due.values_list("id", flat=True)[:10]:
+        claimed = BackgroundTask.objects.filter(id=task_id, status=BackgroundTask.PENDING).update(
+            status=BackgroundTask.RUNNING, attempts=F("attempts") + 1, updated_at=timezone.now()
+        )
+        if claimed:
+            return BackgroundTask.objects.get(id=task_id)
+    return None
+
+
+def run_task(task: BackgroundTask) -> bool:
+    """
+    Run a claimed task and record the outcome.
+
+    Finished tasks are deleted. Failed tasks are retried with exponential backoff until
+    BACKGROUND_TASKS_MAX_ATTEMPTS is reached and then kept with the failed status.
+
+    Args:
+        task (BackgroundTask): The claimed task.
+
+    Returns:
+        bool: True if the task succeeded.
+
+    Example:
+        run_task(claim_task())
+    """
+    try:
+        import_string(task.name)(**task.kwargs)
+    except Exception as e:
+        logger.exception("Background task %s failed", task)
+        task.error = f"{type(e).__name__}: {e}"
+        if task.attempts >= settings.BACKGROUND_TASKS_MAX_ATTEMPTS:
+            task.status = BackgroundTask.FAILED
+        else:
+            task.status = BackgroundTask.PENDING
+            task.run_after = timezone.now() + timedelta(seconds=2**task.attempts * 10)
+        task.save(update_fields=["status", "error", "run_after", "updated_at"])
+        return False
+    task.delete()
+    return True
+
+
+def run_pending_tasks(limit: int | None = None) -> int:
+    """
+    Run due tasks until the queue is empty or the limit is reached.
+
+    Args:
+        limit (int, optional): Maximum number of tasks to run.
+
+    Returns:
+        int: Number of tasks that were run.
+
+    Example:
+        run_pending_tasks(limit=100)
+    """
+    count = 0
+    while limit is None or count < limit:
+        task = claim_task()
+        if task is None:
+            break
+        run_task(task)
+        count += 1
+    return count
+
+
+def requeue_stale_tasks(older_than: timedelta) -> int:
+    """
+    Put tasks left running by a crashed worker back into the queue.
+
+    Args:
+        older_than (timedelta): Running tasks not updated for this long are considered stale.
+
+    Returns:
+        int: Number of requeued tasks.
+
+    Example:
+        requeue_stale_tasks(timedelta(minutes=15))
+    """
+    return BackgroundTask.objects.filter(
+        status=BackgroundTask.RUNNING, updated_at__lt=timezone.now() - older_than
+    ).update(status=BackgroundTask.PENDING)
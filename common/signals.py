@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.models import Comment, MangaRating, move_comment_count
+from common.service.service import refresh_manga_rating
+from manga.models import Chapter, Manga
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_counts(sender, instance, **kwargs):
+    """
+    Signal receiver that removes a deleted comment from the counters of its manga and chapter.
+
+    A receiver rather than Comment.delete(), so queryset and cascade deletes are counted as well.
+
+    Args:
+        sender (type): The model class sending the signal (Comment).
+        instance (Comment): The deleted comment.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        None
+    """
+    move_comment_count(Manga, instance.manga_id, None)
+    move_comment_count(Chapter, instance.chapter_id, None)
+
+
+@receiver(post_save, sender=MangaRating)
+@receiver(post_delete, sender=MangaRating)
+def refresh_rating_aggregates(sender, instance, **kwargs):
+    """
+    Signal receiver that refreshes the stored rating aggregates of a manga after one of its ratings changed.
+
+    Covers ratings saved or deleted through the ORM (admin, updates, cascades). rate_manga() upserts
+    without signals and refreshes the aggregates itself.
+
+    Args:
+        sender (type): The model class sending the signal (MangaRating).
+        instance (MangaRating): The saved or deleted rating.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        None
+    """
+    refresh_manga_rating(instance.manga_id)
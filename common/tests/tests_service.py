@@ -0,0 +1,269 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from common.models import Comment, MangaRating
+from common.service.service import reconcile_comment_counts
+from manga.models import Category, Chapter, Manga
+from manga.service.service import top_manga_comments_annotate_serializer
+from users.models import CustomUser
+
+
+class CommentListingTest(TestCase):
+    """
+    Test suite for the paginated manga and chapter comment listings.
+    """
+
+    def setUp(self):
+        """
+        Set up a manga and a chapter with 30 comments each by different users, some created at the same time.
+
+        Returns:
+            None
+        """
+        category = Category.objects.create(category_name="Manga")
+        self.manga = Manga.objects.create(
+            category=category, name_manga="Manga", english_only_field="manga", review="Review", slug="manga"
+        )
+        self.chapter = Chapter.objects.create(manga=self.manga, chapter_number=1, volume=1)
+        users = [CustomUser.objects.create(username=f"user-{index}", slug=f"user-{index}") for index in range(30)]
+        for user in users:
+            Comment.objects.create(user=user, manga=self.manga, content=f"About the manga from {user.username}")
+            Comment.objects.create(user=user, chapter=self.chapter, content=f"About the chapter from {user.username}")
+        Comment.objects.filter(pk__in=Comment.objects.order_by("pk").values("pk")[:20]).update(
+            created_at=timezone.now()
+        )
+        self.client = APIClient()
+
+    def walk(self, url, page_size):
+        """
+        Helper method to read every page of a comment listing.
+
+        Args:
+            url (str): The listing endpoint.
+            page_size (int): Comments per page.
+
+        Returns:
+            list: IDs of the listed comments in order.
+        """
+        ids = []
+        response = self.client.get(url, {"page_size": page_size})
+        while True:
+            ids.extend(comment["id"] for comment in response.data["results"])
+            if response.data["next"] is None:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def test_pages_cost_one_query(self):
+        """
+        Test that a page of comments and their authors is loaded with one query whatever its size.
+
+        Returns:
+            None
+        """
+        for url in ("/commn/mangas/manga/comments/", f"/commn/chapters/{self.chapter.slug}/comments/"):
+            for page_size in (5, 25):
+                with self.assertNumQueries(1):
+                    response = self.client.get(url, {"page_size": page_size})
+                self.assertEqual(len(response.data["results"]), page_size)
+                self.assertTrue(response.data["results"][0]["user"]["username"].startswith("user-"))
+
+    def test_pages_cover_every_comment_once(self):
+        """
+        Test that walking the pages lists every comment once, newest first, even with equal creation times.
+
+        Returns:
+            None
+        """
+        ids = self.walk("/commn/mangas/manga/comments/", 7)
+
+        comments = Comment.objects.filter(manga=self.manga).order_by("-created_at", "-id")
+        self.assertEqual(ids, list(comments.values_list("pk", flat=True)))
+
+
+class CommentCountTest(TestCase):
+    """
+    Test suite for the comment counters of manga and chapters.
+    """
+
+    def setUp(self):
+        """
+        Set up two manga with a chapter each and a user.
+
+        Returns:
+            None
+        """
+        category = Category.objects.create(category_name="Manga")
+        self.user = CustomUser.objects.create(username="reader", slug="reader")
+        self.manga = [
+            Manga.objects.create(
+                category=category, name_manga=slug, english_only_field=slug, review="Review", slug=slug
+            )
+            for slug in ("first", "second")
+        ]
+        self.chapters = [Chapter.objects.create(manga=manga, chapter_number=1, volume=1) for manga in self.manga]
+
+    def assert_counts(self, manga, chapters):
+        """
+        Assert the stored comment counters.
+
+        Args:
+            manga (list): Expected counters of the two manga.
+            chapters (list): Expected counters of the two chapters.
+
+        Returns:
+            None
+        """
+        self.assertEqual([m.comment_count for m in Manga.objects.order_by("pk")], manga)
+        self.assertEqual([c.comment_count for c in Chapter.objects.order_by("pk")], chapters)
+
+    def test_counters_follow_saves_and_deletes(self):
+        """
+        Test that creating, moving and deleting comments keeps the counters right, cascades included.
+
+        Returns:
+            None
+        """
+        comment = Comment.objects.create(user=self.user, manga=self.manga[0], content="One")
+        Comment.objects.create(user=self.user, manga=self.manga[0], content="Two")
+        Comment.objects.create(user=self.user, chapter=self.chapters[0], content="Three")
+        self.assert_counts([2, 0], [1, 0])
+
+        comment = Comment.objects.get(pk=comment.pk)
+        comment.manga = self.manga[1]
+        comment.save()
+        comment.content = "Edited"
+        comment.save()
+        self.assert_counts([1, 1], [1, 0])
+
+        comment.delete()
+        Comment.objects.filter(chapter=self.chapters[0]).delete()
+        self.assert_counts([1, 0], [0, 0])
+
+        self.user.delete()
+        self.assert_counts([0, 0], [0, 0])
+
+    def test_reconcile_fixes_drifted_counters(self):
+        """
+        Test that the reconciliation recounts drifted counters in batches and leaves correct ones alone.
+
+        Returns:
+            None
+        """
+        Comment.objects.create(user=self.user, manga=self.manga[1], content="One")
+        Comment.objects.create(user=self.user, chapter=self.chapters[0], content="Two")
+        Manga.objects.filter(pk=self.manga[0].pk).update(comment_count=5)
+        Chapter.objects.update(comment_count=0)
+
+        self.assertEqual(reconcile_comment_counts(Manga, batch_size=1), 1)
+        out = StringIO()
+        call_command("reconcile_comment_counts", stdout=out)
+
+        self.assertIn("chapters: corrected 1 counters", out.getvalue())
+        self.assert_counts([0, 1], [1, 0])
+
+    def test_top_manga_by_comments_reads_the_counter(self):
+        """
+        Test that the top list is ordered by the stored counter.
+
+        Returns:
+            None
+        """
+        Manga.objects.filter(pk=self.manga[1].pk).update(comment_count=3)
+
+        data = top_manga_comments_annotate_serializer().data
+
+        self.assertEqual([manga["url"] for manga in data], ["/second/", "/first/"])
+        self.assertEqual(data[0]["comment_count"], 3)
+
+
+class MangaRatingUpsertTest(TestCase):
+    """
+    Test suite for rating writes and the stored rating aggregates.
+    """
+
+    def setUp(self):
+        """
+        Set up a manga and two users.
+
+        Returns:
+            None
+        """
+        category = Category.objects.create(category_name="Manga")
+        self.manga = Manga.objects.create(
+            category=category, name_manga="Manga", english_only_field="manga", review="Review", slug="manga"
+        )
+        self.users = [CustomUser.objects.create(username=name, slug=name) for name in ("first", "second")]
+        self.client = APIClient()
+
+    def rate(self, user, rating):
+        """
+        Helper method to rate the manga through the API.
+
+        Args:
+            user (CustomUser): The user rating the manga.
+            rating (int): The rating.
+
+        Returns:
+            Response: The response.
+        """
+        self.client.force_authenticate(user)
+        return self.client.post("/commn/manga-ratings/", {"manga_slug": "manga", "rating": rating}, format="json")
+
+    def test_rating_is_upserted_with_the_aggregates(self):
+        """
+        Test that rating again changes the existing rating and the manga's aggregates in the same transaction.
+
+        Returns:
+            None
+        """
+        self.rate(self.users[1], 2)
+        # Manga lookup, savepoint, upsert, aggregate update, savepoint release.
+        with self.assertNumQueries(5):
+            response = self.rate(self.users[0], 5)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"rating": 5, "manga_slug": "manga"})
+
+        self.rate(self.users[0], 3)
+
+        self.assertEqual(
+            list(MangaRating.objects.order_by("user__username").values_list("user__username", "rating")),
+            [("first", 3), ("second", 2)],
+        )
+        self.manga.refresh_from_db()
+        self.assertEqual((self.manga.rating_count, self.manga.rating_sum), (2, 5))
+        self.assertEqual(self.manga.average_rating(), 2.5)
+
+    def test_orm_writes_refresh_the_aggregates(self):
+        """
+        Test that ratings saved or deleted through the ORM keep the aggregates right.
+
+        Returns:
+            None
+        """
+        rating = MangaRating.objects.create(user=self.users[0], manga=self.manga, rating=4)
+        self.users[1].delete()
+        self.manga.refresh_from_db()
+        self.assertEqual((self.manga.rating_count, self.manga.rating_sum), (1, 4))
+
+        rating.delete()
+        self.manga.refresh_from_db()
+        self.assertEqual((self.manga.rating_count, self.manga.rating_sum, self.manga.average_rating()), (0, 0, None))
+
+    def test_invalid_ratings_are_rejected(self):
+        """
+        Test that unknown manga, out of range ratings and anonymous users are rejected without writes.
+
+        Returns:
+            None
+        """
+        self.assertEqual(self.rate(self.users[0], 6).status_code, 400)
+        response = self.client.post("/commn/manga-ratings/", {"manga_slug": "missing", "rating": 3}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.client.force_authenticate(None)
+        response = self.client.post("/commn/manga-ratings/", {"manga_slug": "manga", "rating": 3}, format="json")
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(MangaRating.objects.exists())
@@ -0,0 +1,177 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from io import BytesIO
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import Http404
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from common.service.service_images import VariantCache, image_variant
+from manga.models import Category, Manga
+
+
+class ImageVariantTest(TestCase):
+    """
+    Test suite for the on-demand image variants.
+    """
+
+    def setUp(self):
+        """
+        Set up a temporary media root and a manga with a JPEG avatar.
+
+        Returns:
+            None
+        """
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        img_io = BytesIO()
+        Image.new("RGB", (900, 1200), color="red").save(img_io, "JPEG")
+        self.manga = Manga.objects.create(
+            category=Category.objects.create(category_name="Manga"),
+            name_manga="manga-1",
+            english_only_field="manga-1",
+            review="Test Review 1",
+            avatar=SimpleUploadedFile("cover.jpg", img_io.getvalue(), content_type="image/jpeg"),
+            slug="manga-1",
+        )
+
+    def tearDown(self):
+        """
+        Remove the temporary media root.
+
+        Returns:
+            None
+        """
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_variant_is_rendered_once(self):
+        """
+        Test that a variant has the preset size and format and is served from the cache afterwards.
+
+        Returns:
+            None
+        """
+        path, name = image_variant("manga", "manga-1", "cover-md", "webp")
+        self.assertTrue(name.startswith("variants/"))
+        with Image.open(path) as img:
+            self.assertEqual(img.size, (240, 340))
+            self.assertEqual(img.format, "WEBP")
+        mtime = os.stat(path).st_mtime_ns
+        self.assertEqual(image_variant("manga", "manga-1", "cover-md", "webp")[0], path)
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+
+    def test_view_serves_variant(self):
+        """
+        Test that the endpoint returns the variant with a short cache lifetime.
+
+        Returns:
+            None
+        """
+        response = self.client.get("/commn/images/manga/manga-1/cover-sm.png")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertNotIn("immutable", response["Cache-Control"])
+
+    def test_unknown_variant(self):
+        """
+        Test that unknown kinds, presets, formats and sources raise Http404.
+
+        Returns:
+            None
+        """
+        for args in (
+            ("manga", "manga-1", "huge", "webp"),
+            ("manga", "manga-1", "cover-md", "gif"),
+            ("manga", "missing", "cover-md", "webp"),
+            ("page", "not-a-number", "page-md", "webp"),
+            ("comment", "1", "cover-md", "webp"),
+        ):
+            with self.assertRaises(Http404):
+                image_variant(*args)
+
+    def test_palette_and_broken_sources(self):
+        """
+        Test that a palette PNG cover is rendered and that a source Pillow cannot render returns 404.
+
+        Returns:
+            None
+        """
+        img_io = BytesIO()
+        Image.new("RGB", (600, 850), color="blue").convert("P").save(img_io, "PNG")
+        self.manga.avatar = SimpleUploadedFile("cover.png", img_io.getvalue(), content_type="image/png")
+        self.manga.save()
+        response = self.client.get("/commn/images/manga/manga-1/cover-sm.webp")
+        self.assertEqual(response.status_code, 200)
+
+        with patch("common.service.service_images.render_variant", side_effect=ValueError("image has wrong mode")):
+            response = self.client.get("/commn/images/manga/manga-1/cover-md.webp")
+        self.assertEqual(response.status_code, 404)
+
+
+class VariantCacheTest(TestCase):
+    """
+    Test suite for the disk-backed variant cache.
+    """
+
+    def setUp(self):
+        """
+        Set up a temporary cache directory.
+
+        Returns:
+            None
+        """
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Remove the temporary cache directory.
+
+        Returns:
+            None
+        """
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_least_recently_used_variants_are_evicted(self):
+        """
+        Test that the oldest variants are removed when the quota is exceeded.
+
+        Returns:
+            None
+        """
+        cache = VariantCache(self.root, max_bytes=250)
+        paths = []
+        for i in range(3):
+            paths.append(cache.get_or_render(f"{i:064x}", "bin", lambda target: target.write(b"x" * 100)))
+            os.utime(paths[-1], (time.time() - 1000 + i, time.time() - 1000 + i))
+        self.assertFalse(os.path.exists(paths[0]))
+        self.assertTrue(os.path.exists(paths[1]))
+        self.assertTrue(os.path.exists(paths[2]))
+
+    def test_concurrent_requests_render_once(self):
+        """
+        Test that concurrent requests for the same variant render it only once.
+
+        Returns:
+            None
+        """
+        cache = VariantCache(self.root, max_bytes=10**6)
+        renders = []
+
+        def render(target):
+            renders.append(1)
+            time.sleep(0.05)
+            target.write(b"data")
+
+        threads = [threading.Thread(target=cache.get_or_render, args=("a" * 64, "bin", render)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(renders), 1)
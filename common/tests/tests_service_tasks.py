@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from common.models import BackgroundTask
+from common.service.service_tasks import enqueue_task, requeue_stale_tasks, run_pending_tasks
+
+CALLS = []
+
+
+def record_call(value):
+    CALLS.append(value)
+
+
+def fail_call():
+    raise RuntimeError("boom")
+
+
+class BackgroundTaskServiceTest(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_enqueue_and_run(self):
+        enqueue_task("common.tests.tests_service_tasks.record_call", value=1)
+        enqueue_task("common.tests.tests_service_tasks.record_call", value=2)
+        self.assertEqual(run_pending_tasks(), 2)
+        self.assertEqual(CALLS, [1, 2])
+        self.assertFalse(BackgroundTask.objects.exists())
+
+    def test_enqueue_with_key_is_coalesced(self):
+        first = enqueue_task("common.tests.tests_service_tasks.record_call", key="a", value=1)
+        second = enqueue_task("common.tests.tests_service_tasks.record_call", key="a", value=1)
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(BackgroundTask.objects.count(), 1)
+
+    @override_settings(BACKGROUND_TASKS_MAX_ATTEMPTS=2)
+    def test_failed_task_is_retried_then_marked_failed(self):
+        enqueue_task("common.tests.tests_service_tasks.fail_call")
+        self.assertEqual(run_pending_tasks(), 1)
+        task = BackgroundTask.objects.get()
+        self.assertEqual(task.status, BackgroundTask.PENDING)
+        self.assertGreater(task.run_after, timezone.now())
+        self.assertIn("boom", task.error)
+
+        BackgroundTask.objects.update(run_after=timezone.now())
+        run_pending_tasks()
+        self.assertEqual(BackgroundTask.objects.get().status, BackgroundTask.FAILED)
+
+    def test_requeue_stale_tasks(self):
+        task = BackgroundTask.objects.create(name="common.tests.tests_service_tasks.record_call", kwargs={"value": 3})
+        BackgroundTask.objects.filter(pk=task.pk).update(
+            status=BackgroundTask.RUNNING, updated_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(requeue_stale_tasks(timedelta(minutes=15)), 1)
+        run_pending_tasks()
+        self.assertEqual(CALLS, [3])
+
+    @override_settings(BACKGROUND_TASKS_EAGER=True)
+    def test_eager_mode_runs_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNone(enqueue_task("common.tests.tests_service_tasks.record_call", value=4))
+        self.assertEqual(CALLS, [4])
+        self.assertFalse(BackgroundTask.objects.exists())
@@ -1,7 +1,13 @@
 from django.urls import include, path
 from rest_framework import routers
 
-from common.views import ChapterCommentsView, CommentViewSet, MangaCommentsView, MangaRatingViewSet
+from common.views import (
+    ChapterCommentsView,
+    CommentViewSet,
+    ImageVariantView,
+    MangaCommentsView,
+    MangaRatingViewSet,
+)
 
 router = routers.DefaultRouter()
 
@@ -13,4 +19,9 @@ urlpatterns = [
     path("", include(router.urls)),
     path("mangas/<slug:slug>/comments/", MangaCommentsView.as_view(), name="manga-comments"),
     path("chapters/<slug:chapter_slug>/comments/", ChapterCommentsView.as_view(), name="chapter-comments"),
+    path(
+        "images/<str:kind>/<str:lookup>/<str:preset>.<str:image_format>",
+        ImageVariantView.as_view(),
+        name="image-variant",
+    ),
 ]
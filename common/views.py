@@ -1,13 +1,25 @@
-from rest_framework import generics, status, viewsets
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
+from django.conf import settings
+from rest_framework import generics, viewsets
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.views import APIView
 
+from manga_back.media import media_file_response
 from manga_back.service import data_acquisition_and_serialization
+from manga_back.throttling import WRITE_THROTTLES
 
 from .models import Comment, MangaRating
 from .permissions import IsOwnerOrReadOnly
 from .serializers import CommentGetSerializer, CommentSerializer, MangaRatingSerializer
-from .service.service import comment_object_filter, mangarating_object_filter
+from .service.service import comment_object_filter
+from .service.service_images import image_variant
+
+
+class CommentPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
 
 
 class CommentViewSet(viewsets.ModelViewSet):
@@ -19,6 +31,8 @@ class CommentViewSet(viewsets.ModelViewSet):
 
     queryset, serializer_class = data_acquisition_and_serialization(Comment, CommentSerializer)
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
+    throttle_classes = WRITE_THROTTLES
+    throttle_scope = "comments"
 
     def perform_create(self, serializer):
         """
@@ -39,6 +53,9 @@ class MangaCommentsView(generics.ListCreateAPIView):
     """
 
     serializer_class = CommentGetSerializer
+    pagination_class = CommentPagination
+    throttle_classes = WRITE_THROTTLES
+    throttle_scope = "comments"
 
     def get_queryset(self):
         """
@@ -68,6 +85,7 @@ class ChapterCommentsView(generics.ListAPIView):
     """
 
     serializer_class = CommentGetSerializer
+    pagination_class = CommentPagination
 
     def get_queryset(self):
         """
@@ -83,44 +101,34 @@ class MangaRatingViewSet(viewsets.ModelViewSet):
     """
     ViewSet for interacting with manga ratings.
 
-    Allows users to create or update their rating for a manga. If a rating exists, it is updated;
-    otherwise, a new rating is created.
+    Allows users to create or update their rating for a manga. Creating upserts the rating of the request
+    user, so rating a manga again changes the existing rating.
     """
 
     queryset, serializer_class = data_acquisition_and_serialization(MangaRating, MangaRatingSerializer)
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    throttle_classes = WRITE_THROTTLES
+    throttle_scope = "ratings"
 
-    def create(self, request, *args, **kwargs):
-        """
-        Create or update a manga rating for the current user.
 
-        Args:
-            request: The HTTP request object.
-            *args: Additional positional arguments.
-            **kwargs: Additional keyword arguments.
-
-        Returns:
-            Response: The response containing the rating data.
-        """
-        existing_rating = mangarating_object_filter(request.data.get("manga"), request.data.get("user"))
-        if existing_rating:
-            serializer = self.get_serializer(existing_rating, data=request.data)
-            serializer.is_valid(raise_exception=True)
-            self.perform_update(serializer)
-            return Response(serializer.data)
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
-        headers = self.get_success_headers(serializer.data)
-        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+class ImageVariantView(APIView):
+    """
+    API view to return a resized variant of a manga avatar, page image or user avatar.
+    """
 
-    def perform_create(self, serializer):
+    def get(self, request, kind, lookup, preset, image_format):
         """
-        Save a new manga rating with the current user as the owner.
+        Render the variant on the first request and serve it from the disk cache.
 
         Args:
-            serializer (MangaRatingSerializer): The serializer instance.
+            request: The HTTP request object.
+            kind (str): "manga", "page" or "user".
+            lookup (str): Manga or user slug, or page ID.
+            preset (str): Size preset name from IMAGE_VARIANT_PRESETS.
+            image_format (str): "webp", "jpeg" or "png".
 
         Returns:
-            None
+            HttpResponse: The image file.
         """
-        serializer.save(user=self.request.user)
+        full_path, name = image_variant(kind, lookup, preset, image_format)
+        return media_file_response(request, full_path, name, cache_control=f"public, max-age={settings.MEDIA_MAX_AGE}")
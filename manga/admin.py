@@ -10,6 +10,7 @@ admin.site.register(models.Tag)
 admin.site.register(models.Manga)
 admin.site.register(models.Chapter)
 admin.site.register(models.Page)
+admin.site.register(models.MediaBlob)
 
 
 class MangaAdm(admin.TabularInline):
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+
+from manga.models import Page
+
+METADATA_FIELDS = ["width", "height", "file_size", "content_hash"]
+
+
+class Command(BaseCommand):
+    """
+    Management command that stores width, height, byte size and content hash for existing pages.
+    """
+
+    help = "Fill in image dimensions, byte size and content hash for pages saved without them."
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments.
+
+        Args:
+            parser: The argument parser.
+
+        Returns:
+            None
+        """
+        parser.add_argument("--batch-size", type=int, default=500, help="Number of pages written per UPDATE.")
+        parser.add_argument("--all", action="store_true", help="Recompute metadata for every page.")
+
+    def handle(self, *args, **options):
+        """
+        Read the metadata of each page image and write it back in batches.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Returns:
+            None
+        """
+        batch_size = options["batch_size"]
+        pages = Page.objects.exclude(image="").only("id", "image", *METADATA_FIELDS).order_by("id")
+        if not options["all"]:
+            pages = pages.filter(content_hash="")
+
+        batch = []
+        updated = missing = 0
+        for page in pages.iterator(chunk_size=batch_size):
+            try:
+                page.fill_image_metadata()
+            except FileNotFoundError:
+                missing += 1
+                continue
+            batch.append(page)
+            if len(batch) >= batch_size:
+                Page.objects.bulk_update(batch, METADATA_FIELDS)
+                updated += len(batch)
+                batch = []
+        if batch:
+            Page.objects.bulk_update(batch, METADATA_FIELDS)
+            updated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} pages, {missing} image files missing."))
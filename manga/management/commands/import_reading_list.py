@@ -0,0 +1,60 @@
+import csv
+import time
+from xml.etree.ElementTree import ParseError
+
+from django.core.management.base import BaseCommand, CommandError
+
+from manga.service.service_import import import_reading_list, iter_reading_list
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    """
+    Management command that imports a reading list exported from another tracker into a user's manga lists.
+    """
+
+    help = "Import a MyAnimeList XML export or a CSV file with title and status columns into a user's lists."
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments.
+
+        Args:
+            parser: The argument parser.
+
+        Returns:
+            None
+        """
+        parser.add_argument("username", help="User whose lists are filled.")
+        parser.add_argument("path", help="Path of the exported list, .xml files are read as MyAnimeList exports.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Number of entries written per INSERT.")
+
+    def handle(self, *args, **options):
+        """
+        Import the file and print the match report.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Returns:
+            None
+        """
+        user = CustomUser.objects.filter(username=options["username"]).first()
+        if user is None:
+            raise CommandError(f"User {options['username']} does not exist.")
+        started = time.perf_counter()
+        with open(options["path"], "rb") as file:
+            try:
+                report = import_reading_list(user, iter_reading_list(file, options["path"]), options["batch_size"])
+            except (ValueError, csv.Error, ParseError) as e:
+                raise CommandError(str(e)) from e
+        for title in report["unmatched"]:
+            self.stdout.write(f"Not found: {title}")
+        for title in report["unknown_status"]:
+            self.stdout.write(f"Unknown status: {title}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['imported']} of {report['total']} entries in {time.perf_counter() - started:.2f} s."
+            )
+        )
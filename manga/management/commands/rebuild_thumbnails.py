@@ -0,0 +1,168 @@
+import os
+import time
+from multiprocessing import Pool
+
+import django
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from manga.models import Manga
+
+
+def render_manga_thumbnail(row):
+    """
+    Render and store the thumbnail and cover placeholder of one manga in a worker process.
+
+    Workers only read the avatar and write the thumbnail file, the database is updated by the parent.
+
+    Args:
+        row (tuple): (manga ID, slug, avatar name)
+
+    Returns:
+        tuple: (manga ID, (thumbnail name, dominant color, blurhash) or None, error message or None)
+    """
+    pk, slug, avatar = row
+    manga = Manga(pk=pk, slug=slug, avatar=avatar)
+    try:
+        thumb_file = manga.render_thumbnail()
+    except ValueError as e:
+        return pk, None, str(e)
+    if thumb_file is None:
+        return pk, None, None
+    manga.thumbnail.save(thumb_file.name, thumb_file, save=False)
+    return pk, (manga.thumbnail.name, manga.dominant_color, manga.blurhash), None
+
+
+class Command(BaseCommand):
+    """
+    Management command that regenerates the thumbnails of all manga, for example after THUMBNAIL_SIZE changed.
+    """
+
+    help = "Regenerate manga thumbnails on a process pool and write them back in batches."
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments.
+
+        Args:
+            parser: The argument parser.
+
+        Returns:
+            None
+        """
+        parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes.")
+        parser.add_argument("--batch-size", type=int, default=200, help="Number of manga written per UPDATE.")
+        parser.add_argument("--missing", action="store_true", help="Only render manga without a thumbnail.")
+        parser.add_argument("--after-id", type=int, default=0, help="Skip manga with an ID up to this one.")
+        parser.add_argument(
+            "--checkpoint",
+            help="File storing the last written manga ID, the command resumes after it when run again.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Stream manga rows, render their thumbnails in parallel and store the new names.
+
+        Rows are processed in ID order and the last written ID is reported with every batch (and saved
+        to the checkpoint file), so an interrupted run can be resumed with --after-id or --checkpoint.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Returns:
+            None
+        """
+        checkpoint = options["checkpoint"]
+        after_id = options["after_id"]
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint) as checkpoint_file:
+                after_id = max(after_id, int(checkpoint_file.read().strip() or 0))
+
+        queryset = Manga.objects.filter(pk__gt=after_id).exclude(avatar="").order_by("pk")
+        if options["missing"]:
+            queryset = queryset.filter(Q(thumbnail__isnull=True) | Q(thumbnail=""))
+        total = queryset.count()
+        if after_id:
+            self.stdout.write(f"Resuming after manga {after_id}.")
+
+        batch_size = options["batch_size"]
+        rows = queryset.values_list("pk", "slug", "avatar").iterator(chunk_size=batch_size)
+        done = rebuilt = failed = 0
+        started = time.monotonic()
+        with Pool(options["workers"], initializer=django.setup) as pool:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    rebuilt, failed = self.process_batch(pool, batch, rebuilt, failed)
+                    done += len(batch)
+                    self.report(done, total, started, batch[-1][0], checkpoint)
+                    batch = []
+            if batch:
+                rebuilt, failed = self.process_batch(pool, batch, rebuilt, failed)
+                done += len(batch)
+                self.report(done, total, started, batch[-1][0], checkpoint)
+
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} thumbnails, {failed} failed."))
+
+    def process_batch(self, pool, batch, rebuilt, failed):
+        """
+        Render one batch on the pool and write the thumbnails and placeholders with a single bulk_update.
+
+        Thumbnail files that are no longer referenced by any manga are removed afterwards.
+
+        Args:
+            pool (Pool): The worker pool.
+            batch (list): (manga ID, slug, avatar name) rows.
+            rebuilt (int): Thumbnails rebuilt so far.
+            failed (int): Thumbnails failed so far.
+
+        Returns:
+            tuple: Updated (rebuilt, failed) counters.
+        """
+        results = pool.map(render_manga_thumbnail, batch)
+        rendered = {}
+        for pk, result, error in results:
+            if error:
+                failed += 1
+                self.stderr.write(f"Manga {pk}: {error}")
+            elif result:
+                rendered[pk] = result
+        if not rendered:
+            return rebuilt, failed
+
+        mangas = list(Manga.objects.filter(pk__in=rendered).only("pk", "thumbnail"))
+        new_names = {name for name, _, _ in rendered.values()}
+        old_names = {manga.thumbnail.name for manga in mangas if manga.thumbnail} - new_names
+        for manga in mangas:
+            manga.thumbnail, manga.dominant_color, manga.blurhash = rendered[manga.pk]
+        Manga.objects.bulk_update(mangas, ["thumbnail", "dominant_color", "blurhash"])
+
+        storage = Manga._meta.get_field("thumbnail").storage
+        still_used = set(Manga.objects.filter(thumbnail__in=old_names).values_list("thumbnail", flat=True))
+        for name in old_names - still_used:
+            storage.delete(name)
+        return rebuilt + len(mangas), failed
+
+    def report(self, done, total, started, last_id, checkpoint):
+        """
+        Print progress and throughput and save the checkpoint.
+
+        Args:
+            done (int): Rows processed so far.
+            total (int): Rows to process.
+            started (float): Monotonic start time.
+            last_id (int): ID of the last processed manga.
+            checkpoint (str or None): Checkpoint file path.
+
+        Returns:
+            None
+        """
+        if checkpoint:
+            with open(checkpoint, "w") as checkpoint_file:
+                checkpoint_file.write(str(last_id))
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(f"{done}/{total} manga, {done / elapsed:.1f}/s, last ID {last_id}.")
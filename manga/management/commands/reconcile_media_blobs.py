@@ -0,0 +1,58 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from manga.models import Manga, MediaBlob, Page
+from manga.storage import content_addressed_storage
+
+
+class Command(BaseCommand):
+    """
+    Management command that recounts references to content-addressed files and removes orphans.
+    """
+
+    help = "Recount MediaBlob references from Page.image and Manga.avatar and delete unreferenced files."
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments.
+
+        Args:
+            parser: The argument parser.
+
+        Returns:
+            None
+        """
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of blobs written per UPDATE.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would change.")
+
+    def handle(self, *args, **options):
+        """
+        Compare stored reference counts with the rows that use each file and fix the difference.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Returns:
+            None
+        """
+        references = Counter(Page.objects.values_list("image", flat=True).iterator())
+        references.update(Manga.objects.values_list("avatar", flat=True).iterator())
+
+        changed, orphans = [], []
+        for blob in MediaBlob.objects.only("id", "name", "ref_count").iterator(chunk_size=options["batch_size"]):
+            count = references.get(blob.name, 0)
+            if count == 0:
+                orphans.append(blob.name)
+            elif count != blob.ref_count:
+                blob.ref_count = count
+                changed.append(blob)
+
+        if not options["dry_run"]:
+            MediaBlob.objects.bulk_update(changed, ["ref_count"], batch_size=options["batch_size"])
+            for name in orphans:
+                MediaBlob.objects.filter(name=name).delete()
+                content_addressed_storage.delete_unreferenced(name)
+
+        self.stdout.write(self.style.SUCCESS(f"Fixed {len(changed)} reference counts, removed {len(orphans)} orphans."))
@@ -0,0 +1,208 @@
+import os
+import posixpath
+import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from manga.models import Manga, MediaBlob, Page
+from manga.storage import ContentAddressedStorage, file_hash, is_sharded_name, sharded_name
+
+MEDIA_FIELDS = [(Page, "image"), (Manga, "avatar"), (Manga, "thumbnail")]
+
+
+class Command(BaseCommand):
+    """
+    Management command that moves existing media files into the sharded ``ab/cd/<hash>.<ext>`` layout.
+    """
+
+    help = "Move page images, manga avatars and thumbnails into hash-prefixed subdirectories."
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments.
+
+        Args:
+            parser: The argument parser.
+
+        Returns:
+            None
+        """
+        parser.add_argument("--workers", type=int, default=8, help="Number of parallel file workers.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Number of rows updated per transaction.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the files that would be moved.")
+
+    def handle(self, *args, **options):
+        """
+        Shard every media field in turn.
+
+        The command can be interrupted and run again, names that are already sharded are skipped.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Returns:
+            None
+        """
+        for model, field_name in MEDIA_FIELDS:
+            self.shard_field(model, field_name, options["workers"], options["batch_size"], options["dry_run"])
+
+    def legacy_names(self, model, field_name):
+        """
+        Collect the distinct stored names of a field that are not sharded yet.
+
+        Args:
+            model (type): The model class.
+            field_name (str): The file field name.
+
+        Returns:
+            list: Sorted legacy names.
+        """
+        default = model._meta.get_field(field_name).get_default()
+        names = (
+            model.objects.exclude(**{f"{field_name}__isnull": True})
+            .exclude(**{field_name: ""})
+            .values_list(field_name, flat=True)
+            .distinct()
+        )
+        return sorted(name for name in names.iterator() if name != default and not is_sharded_name(name))
+
+    def link_sharded(self, field, source):
+        """
+        Hash a legacy file and link it under its sharded name.
+
+        A hard link is used when possible so that the data is not copied, otherwise the file is copied.
+
+        Args:
+            field (FileField): The model field the file belongs to.
+            source (str): The legacy stored name.
+
+        Returns:
+            tuple: (source, (target, content hash, size)) or (source, None) if the file is missing.
+        """
+        storage = field.storage
+        try:
+            with storage.open(source) as content:
+                content_hash = file_hash(content)
+                size = content.size
+        except FileNotFoundError:
+            return source, None
+        upload_to = field.upload_to if isinstance(field.upload_to, str) else posixpath.dirname(source)
+        target = sharded_name(posixpath.join(upload_to, posixpath.basename(source)), content_hash)
+        source_path, target_path = storage.path(source), storage.path(target)
+        if not os.path.exists(target_path):
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            try:
+                os.link(source_path, target_path)
+            except FileExistsError:
+                pass
+            except OSError:
+                shutil.copyfile(source_path, f"{target_path}.part")
+                os.replace(f"{target_path}.part", target_path)
+        return source, (target, content_hash, size)
+
+    def shard_field(self, model, field_name, workers, batch_size, dry_run):
+        """
+        Move the files of one field and point its rows at the new names.
+
+        Files are linked in parallel and rows are updated in batches. The legacy files of a batch are unlinked
+        right after it commits unless a later row still references them, so an interrupted run leaves no
+        legacy file that a re-run would no longer find.
+
+        Args:
+            model (type): The model class.
+            field_name (str): The file field name.
+            workers (int): Number of parallel file workers.
+            batch_size (int): Number of rows updated per transaction.
+            dry_run (bool): Only report the number of files.
+
+        Returns:
+            None
+        """
+        label = f"{model.__name__}.{field_name}"
+        field = model._meta.get_field(field_name)
+        sources = self.legacy_names(model, field_name)
+        if dry_run or not sources:
+            self.stdout.write(f"{label}: {len(sources)} files to move.")
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            linked = dict(executor.map(lambda source: self.link_sharded(field, source), sources))
+        targets = {source: result for source, result in linked.items() if result}
+
+        updated = 0
+        last_pk = 0
+        queryset = model.objects.exclude(**{f"{field_name}__isnull": True}).only("pk", field_name).order_by("pk")
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            rows = [row for row in batch if getattr(row, field_name).name in targets]
+            if not rows:
+                continue
+            references = Counter()
+            batch_sources = set()
+            for row in rows:
+                source = getattr(row, field_name).name
+                target = targets[source][0]
+                setattr(row, field_name, target)
+                references[target] += 1
+                batch_sources.add(source)
+            with transaction.atomic():
+                model.objects.bulk_update(rows, [field_name])
+                if isinstance(field.storage, ContentAddressedStorage):
+                    self.add_references(references, targets)
+            updated += len(rows)
+            self.remove_legacy(model, field, batch_sources)
+            self.stdout.write(f"{label}: {updated} rows updated.")
+
+        missing = len(sources) - len(targets)
+        self.stdout.write(
+            self.style.SUCCESS(f"{label}: moved {len(targets)} files, updated {updated} rows, {missing} missing.")
+        )
+
+    def remove_legacy(self, model, field, sources):
+        """
+        Unlink the legacy files of which no row references the legacy name any more.
+
+        Args:
+            model (type): The model class.
+            field (FileField): The model field the files belong to.
+            sources (set): Legacy stored names of the rows just updated.
+
+        Returns:
+            None
+        """
+        referenced = set(model.objects.filter(**{f"{field.name}__in": sources}).values_list(field.name, flat=True))
+        for source in sources - referenced:
+            try:
+                os.remove(field.storage.path(source))
+            except FileNotFoundError:
+                pass
+
+    def add_references(self, references, targets):
+        """
+        Count the moved rows in MediaBlob for content-addressed fields.
+
+        Args:
+            references (Counter): Number of rows per target name.
+            targets (dict): Legacy name to (target, content hash, size) mapping.
+
+        Returns:
+            None
+        """
+        details = {target: (content_hash, size) for target, content_hash, size in targets.values()}
+        existing = MediaBlob.objects.select_for_update().in_bulk(list(references), field_name="name")
+        blobs = []
+        for name, count in references.items():
+            blob = existing.get(name)
+            if blob is None:
+                content_hash, size = details[name]
+                blob = MediaBlob(name=name, content_hash=content_hash, size=size, ref_count=0)
+            blob.ref_count += count
+            blobs.append(blob)
+        MediaBlob.objects.bulk_create(blobs, update_conflicts=True, unique_fields=["name"], update_fields=["ref_count"])
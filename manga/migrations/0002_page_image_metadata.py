@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manga", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="page",
+            name="content_hash",
+            field=models.CharField(blank=True, max_length=64, verbose_name="content_hash"),
+        ),
+        migrations.AddField(
+            model_name="page",
+            name="file_size",
+            field=models.PositiveBigIntegerField(blank=True, null=True, verbose_name="file_size"),
+        ),
+        migrations.AddField(
+            model_name="page",
+            name="height",
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name="height"),
+        ),
+        migrations.AddField(
+            model_name="page",
+            name="width",
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name="width"),
+        ),
+    ]
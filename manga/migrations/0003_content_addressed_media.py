@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:48
+
+import manga.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manga", "0002_page_image_metadata"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaBlob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("content_hash", models.CharField(db_index=True, max_length=64)),
+                ("size", models.PositiveBigIntegerField(default=0)),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="manga",
+            name="avatar",
+            field=models.ImageField(
+                blank=True,
+                default="default/none_avatar.png/",
+                max_length=255,
+                storage=manga.storage.ContentAddressedStorage(),
+                upload_to="static/images/avatars/",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="page",
+            name="image",
+            field=models.ImageField(
+                max_length=255, storage=manga.storage.ContentAddressedStorage(), upload_to="media/manga/pages/"
+            ),
+        ),
+    ]
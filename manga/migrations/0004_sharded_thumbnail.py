@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:49
+
+import manga.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manga", "0003_content_addressed_media"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="manga",
+            name="thumbnail",
+            field=models.ImageField(
+                blank=True,
+                max_length=255,
+                null=True,
+                storage=manga.storage.ShardedStorage(),
+                upload_to="media/products/miniava",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manga", "0004_sharded_thumbnail"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="manga",
+            name="blurhash",
+            field=models.CharField(blank=True, max_length=32),
+        ),
+        migrations.AddField(
+            model_name="manga",
+            name="dominant_color",
+            field=models.CharField(blank=True, max_length=7),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manga", "0005_cover_placeholder"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chapter",
+            index=models.Index(fields=["manga", "created_at"], name="chapter_manga_created_idx"),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:24
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_comments(apps, schema_editor):
+    Comment = apps.get_model("common", "Comment")
+    for model_name, field in (("Manga", "manga"), ("Chapter", "chapter")):
+        counts = (
+            Comment.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(n=Count("id"))
+            .values("n")
+        )
+        apps.get_model("manga", model_name).objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("common", "0004_comment_created_indexes"),
+        ("manga", "0006_notification_watermark"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chapter",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="manga",
+            name="comment_count",
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(count_comments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:31
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def aggregate_ratings(apps, schema_editor):
+    MangaRating = apps.get_model("common", "MangaRating")
+    ratings = MangaRating.objects.filter(manga=OuterRef("pk")).order_by().values("manga")
+    apps.get_model("manga", "Manga").objects.update(
+        rating_count=Coalesce(Subquery(ratings.annotate(n=Count("id")).values("n")), 0),
+        rating_sum=Coalesce(Subquery(ratings.annotate(total=Sum("rating")).values("total")), 0),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("common", "0005_comment_user_created_index"),
+        ("manga", "0007_comment_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="manga",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="manga",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(aggregate_ratings, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,17 @@
+import hashlib
+from contextlib import nullcontext
 from io import BytesIO
 
-from django.core.files import File
-from django.db import models
-from django.db.models import Avg
+from django.core.files.base import ContentFile
+from django.db import models, transaction
+from django.db.models import DEFERRED
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 from PIL import Image
 
+from manga.storage import content_addressed_storage, sharded_storage
+from manga_back.images import downscale, image_placeholder
+
 
 class Author(models.Model):
     """
@@ -163,6 +168,11 @@ class Manga(models.Model):
         review (str): Review text.
         avatar (Image): Avatar image.
         thumbnail (Image): Thumbnail image.
+        dominant_color (str): Most common avatar color, shown while the cover loads.
+        blurhash (str): Blurhash placeholder of the avatar.
+        comment_count (int): Number of comments, kept up to date by Comment.
+        rating_count (int): Number of ratings, kept up to date by MangaRating writes.
+        rating_sum (int): Sum of the ratings, kept up to date by MangaRating writes.
         slug (str): Unique slug.
     """
 
@@ -180,12 +190,24 @@ class Manga(models.Model):
     review = models.TextField(max_length=1000, blank=False)
     avatar = models.ImageField(
         upload_to="static/images/avatars/",
+        storage=content_addressed_storage,
+        max_length=255,
         default="default/none_avatar.png/",
         blank=True,
     )
-    thumbnail = models.ImageField(upload_to="media/products/miniava", blank=True, null=True)
+    thumbnail = models.ImageField(
+        upload_to="media/products/miniava", storage=sharded_storage, max_length=255, blank=True, null=True
+    )
+    dominant_color = models.CharField(max_length=7, blank=True)
+    blurhash = models.CharField(max_length=32, blank=True)
+    comment_count = models.PositiveIntegerField(default=0, db_index=True)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
     slug = models.SlugField(null=False, unique=True)
 
+    THUMBNAIL_SIZE = (120, 170)
+    THUMBNAIL_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
     class Meta:
         indexes = [
             models.Index(fields=["slug"]),
@@ -205,7 +227,7 @@ class Manga(models.Model):
 
     def save(self, *args, **kwargs):
         """
-        Save the manga instance, generate slug if new, and update thumbnail if avatar changed.
+        Save the manga instance, generate slug if new, and queue a thumbnail update if avatar changed.
 
         Args:
             *args: Variable length argument list.
@@ -219,39 +241,118 @@ class Manga(models.Model):
         """
         if not self.slug:
             self.slug = slugify(self.english_only_field)
-        avatar_changed = False
-        if self.pk:
-            orig = Manga.objects.get(pk=self.pk)
-            avatar_changed = orig.avatar != self.avatar
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        avatar_changed = (update_fields is None or "avatar" in update_fields) and self.avatar_changed()
+        old_avatar = getattr(self, "_loaded_avatar", DEFERRED)
+        # The storage counts a new avatar inside this transaction, so a failed write rolls the count back.
+        with transaction.atomic() if avatar_changed else nullcontext():
+            super().save(*args, **kwargs)
+            # Re-uploading the same file counted its blob twice, releasing the old name drops the extra reference.
+            if avatar_changed and old_avatar not in (DEFERRED, None):
+                content_addressed_storage.release(old_avatar)
+        self._loaded_avatar = self.avatar.name
         if (not self.thumbnail and self.avatar) or avatar_changed:
-            self.generate_thumbnail()
+            self.schedule_thumbnail()
 
-    def generate_thumbnail(self):
+    @classmethod
+    def from_db(cls, db, field_names, values):
         """
-        Generate and save a thumbnail image for the manga avatar.
+        Create an instance loaded from the database and remember its stored avatar name.
 
-        Raises:
-            ValueError: If thumbnail generation fails.
+        Args:
+            db (str): Database alias.
+            field_names (list): Names of the loaded fields.
+            values (list): Loaded values.
+
+        Returns:
+            Manga: The loaded instance.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_avatar = instance.__dict__.get("avatar", DEFERRED)
+        return instance
+
+    def avatar_changed(self):
+        """
+        Check whether the avatar differs from the one stored in the database without querying it.
+
+        Returns:
+            bool: True if a new avatar was assigned.
+
+        Example:
+            manga.avatar_changed()
+        """
+        if self.avatar and not self.avatar._committed:
+            return True
+        loaded = getattr(self, "_loaded_avatar", DEFERRED)
+        return loaded is not DEFERRED and loaded != self.avatar.name
+
+    def schedule_thumbnail(self):
+        """
+        Queue thumbnail generation for the background worker.
 
         Returns:
             None
 
         Example:
-            manga.generate_thumbnail()
+            manga.schedule_thumbnail()
         """
+        from common.service.service_tasks import enqueue_task
+
+        if not self.avatar.name.lower().endswith(self.THUMBNAIL_EXTENSIONS):
+            return
+        enqueue_task("manga.tasks.generate_manga_thumbnail", key=str(self.pk), manga_id=self.pk)
+
+    def render_thumbnail(self):
+        """
+        Render the thumbnail of the manga avatar as PNG and fill in the cover placeholder.
+
+        JPEG avatars are decoded at a reduced scale with draft() and large images are shrunk
+        with reduce() before the final resize, so the full-size image is never resampled.
+        The dominant color and blurhash are computed from the thumbnail.
+
+        Returns:
+            ContentFile or None: The PNG thumbnail or None if the avatar is not a supported image.
+
+        Raises:
+            ValueError: If thumbnail rendering fails.
+
+        Example:
+            manga.render_thumbnail()
+        """
+        if not self.avatar or not self.avatar.name.lower().endswith(self.THUMBNAIL_EXTENSIONS):
+            return None
+        width, height = self.THUMBNAIL_SIZE
         try:
-            if not self.avatar or not self.avatar.name.lower().endswith((".png", ".jpg", ".jpeg")):
-                return
-            with Image.open(self.avatar) as img:
-                img = img.resize((120, 170))
+            with self.avatar.open("rb"), Image.open(self.avatar) as img:
+                img = downscale(img, (width, height))
+                if img.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+                    img = img.convert("RGBA")
+                img = img.resize((width, height))
+                self.dominant_color, self.blurhash = image_placeholder(img)
                 thumb_io = BytesIO()
-                img.save(thumb_io, format="PNG", quality=85)
-                thumb_file = File(thumb_io, name=f"thumb_{self.avatar.name}")
-                self.thumbnail.save(thumb_file.name, thumb_file, save=False)
-                super().save(update_fields=["thumbnail"])
+                img.save(thumb_io, format="PNG", optimize=True)
         except Exception as e:
             raise ValueError(f"Error generating thumbnail: {e}") from e
+        return ContentFile(thumb_io.getvalue(), name=f"{self.slug}.png")
+
+    def generate_thumbnail(self):
+        """
+        Generate and save a thumbnail image and the cover placeholder for the manga avatar.
+
+        Raises:
+            ValueError: If thumbnail generation fails.
+
+        Returns:
+            None
+
+        Example:
+            manga.generate_thumbnail()
+        """
+        thumb_file = self.render_thumbnail()
+        if thumb_file is None:
+            return
+        self.thumbnail.save(thumb_file.name, thumb_file, save=False)
+        super().save(update_fields=["thumbnail", "dominant_color", "blurhash"])
 
     def get_thumbnail_url(self):
         """
@@ -267,7 +368,7 @@ class Manga(models.Model):
 
     def average_rating(self):
         """
-        Calculate the average rating for the manga.
+        Calculate the average rating for the manga from the stored rating count and sum.
 
         Returns:
             float or None: Average rating or None if no ratings exist.
@@ -275,7 +376,7 @@ class Manga(models.Model):
         Example:
             manga.average_rating()
         """
-        return self.ratings.aggregate(Avg("rating"))["rating__avg"]
+        return self.rating_sum / self.rating_count if self.rating_count else None
 
     def get_avatar_url(self):
         """
@@ -315,6 +416,7 @@ class Chapter(models.Model):
         volume (int): Volume number.
         created_at (datetime): Creation timestamp.
         updated_at (datetime): Update timestamp.
+        comment_count (int): Number of comments, kept up to date by Comment.
         slug (str): Unique slug.
     """
 
@@ -324,6 +426,7 @@ class Chapter(models.Model):
     volume = models.IntegerField(_("volume"), blank=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    comment_count = models.PositiveIntegerField(default=0)
     slug = models.SlugField(null=False, unique=True)
 
     class Meta:
@@ -333,6 +436,10 @@ class Chapter(models.Model):
                 name="unique_chapter_per_manga",
             )
         ]
+        indexes = [
+            # New chapters of followed manga are looked up by (manga, created_at) in the "read" notification mode.
+            models.Index(fields=["manga", "created_at"], name="chapter_manga_created_idx"),
+        ]
 
     def __str__(self):
         """
@@ -384,11 +491,19 @@ class Page(models.Model):
         chapter (Chapter): Related chapter.
         image (Image): Page image.
         page_number (int): Page number in chapter.
+        width (int): Image width in pixels.
+        height (int): Image height in pixels.
+        file_size (int): Image size in bytes.
+        content_hash (str): SHA-256 hex digest of the image bytes.
     """
 
     chapter = models.ForeignKey(Chapter, on_delete=models.CASCADE, related_name="pages")  # r
-    image = models.ImageField(upload_to="media/manga/pages/")
+    image = models.ImageField(upload_to="media/manga/pages/", storage=content_addressed_storage, max_length=255)
     page_number = models.PositiveIntegerField(_("page_number"))
+    width = models.PositiveIntegerField(_("width"), blank=True, null=True)
+    height = models.PositiveIntegerField(_("height"), blank=True, null=True)
+    file_size = models.PositiveBigIntegerField(_("file_size"), blank=True, null=True)
+    content_hash = models.CharField(_("content_hash"), max_length=64, blank=True)
 
     class Meta:
         constraints = [models.UniqueConstraint(fields=["chapter", "page_number"], name="unique_page_per_chapter")]
@@ -405,7 +520,7 @@ class Page(models.Model):
 
     def save(self, *args, **kwargs):
         """
-        Save the page instance and auto-assign page number if not set.
+        Save the page instance, auto-assign page number if not set and store image metadata.
 
         Args:
             *args: Variable length argument list.
@@ -423,7 +538,85 @@ class Page(models.Model):
                 self.page_number = last_page.page_number + 1
             else:
                 self.page_number = 1
-        super().save(*args, **kwargs)
+        if self.image and (not self.image._committed or not self.content_hash):
+            try:
+                self.fill_image_metadata()
+            except FileNotFoundError:
+                # A missing stored file must not block edits, backfill_page_metadata reports it.
+                pass
+        update_fields = kwargs.get("update_fields")
+        image_changed = (update_fields is None or "image" in update_fields) and self.image_changed()
+        old_image = getattr(self, "_loaded_image", DEFERRED)
+        # The storage counts a new image inside this transaction, so a failed insert rolls the count back.
+        with transaction.atomic() if image_changed else nullcontext():
+            super().save(*args, **kwargs)
+            if image_changed and old_image not in (DEFERRED, None):
+                content_addressed_storage.release(old_image)
+        self._loaded_image = self.image.name
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Create an instance loaded from the database and remember its stored image name.
+
+        Args:
+            db (str): Database alias.
+            field_names (list): Names of the loaded fields.
+            values (list): Loaded values.
+
+        Returns:
+            Page: The loaded instance.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_image = instance.__dict__.get("image", DEFERRED)
+        return instance
+
+    def image_changed(self):
+        """
+        Check whether the image differs from the one stored in the database without querying it.
+
+        Returns:
+            bool: True if a new image was assigned.
+
+        Example:
+            page.image_changed()
+        """
+        if self.image and not self.image._committed:
+            return True
+        loaded = getattr(self, "_loaded_image", DEFERRED)
+        return loaded is not DEFERRED and loaded != self.image.name
+
+    def fill_image_metadata(self):
+        """
+        Read width, height, byte size and SHA-256 hash of the page image.
+
+        Only the image header is parsed for the dimensions, the pixels are not decoded.
+        Dimensions are left empty if the file is not a readable image.
+
+        Returns:
+            None
+
+        Example:
+            page.fill_image_metadata()
+        """
+        close_after = self.image._committed and self.image.closed
+        self.image.open("rb")
+        try:
+            digest = hashlib.sha256()
+            for chunk in self.image.chunks():
+                digest.update(chunk)
+            self.content_hash = digest.hexdigest()
+            self.file_size = self.image.size
+            self.image.seek(0)
+            try:
+                with Image.open(self.image) as img:
+                    self.width, self.height = img.size
+            except OSError:
+                self.width = self.height = None
+            self.image.seek(0)
+        finally:
+            if close_after:
+                self.image.close()
 
     def get_image(self):
         """
@@ -440,4 +633,32 @@ class Page(models.Model):
         return ""
 
 
+class MediaBlob(models.Model):
+    """
+    Represents a content-addressed file shared by manga avatars and pages.
 
+    Attributes:
+        name (str): Storage name of the file.
+        content_hash (str): SHA-256 hex digest of the file content.
+        size (int): File size in bytes.
+        ref_count (int): Number of rows referencing the file.
+        created_at (datetime): Creation timestamp.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    content_hash = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        """
+        Return a string representation of the blob.
+
+        Returns:
+            str: Storage name and reference count.
+
+        Example:
+            str(blob)
+        """
+        return f"{self.name} ({self.ref_count} refs)"
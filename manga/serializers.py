@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from manga.models import Author, Category, Chapter, Country, Genre, Manga, Page, Tag
+from manga_back.constants import NAME_LIST_MANGA
 from users.models import MangaList
 
 
@@ -83,10 +84,14 @@ class MangaLastSerializer(serializers.ModelSerializer):
             "name_manga",
             "average_rating",
             "thumbnail",
+            "dominant_color",
+            "blurhash",
+            "comment_count",
             "url",
         ]
+        read_only_fields = ("comment_count",)
 
-    def get_thumbnail_url(self, obj):
+    def get_thumbnail(self, obj):
         """
         Get the thumbnail URL for the manga object.
 
@@ -235,7 +240,10 @@ class MangaSerializer(serializers.ModelSerializer):
             "comments",
             "review",
             "get_avatar_url",
+            "dominant_color",
+            "blurhash",
             "average_rating",
+            "comment_count",
             "category_title",
             "get_url",
         )
@@ -250,7 +258,7 @@ class MangaSerializer(serializers.ModelSerializer):
         Returns:
             float or None: Average rating or None if no ratings exist.
         """
-        return obj.average_rating
+        return obj.average_rating()
 
     def get_category_title(self, obj):
         """
@@ -278,6 +286,7 @@ class MangaAllSerializer(serializers.ModelSerializer):
     genre = GenreSerializer(many=True, read_only=True)
     chapters = ChapterViewsMangaSerializer(many=True, read_only=True)
     category_title = serializers.SerializerMethodField()
+    list_name = serializers.CharField(default=None, read_only=True)
 
     class Meta:
         model = Manga
@@ -291,9 +300,13 @@ class MangaAllSerializer(serializers.ModelSerializer):
             "genre",
             "tags",
             "get_avatar_url",
+            "dominant_color",
+            "blurhash",
             "average_rating",
+            "comment_count",
             "category_title",
             "get_url",
+            "list_name",
         )
 
     def get_average_rating(self, obj):
@@ -306,7 +319,7 @@ class MangaAllSerializer(serializers.ModelSerializer):
         Returns:
             float or None: Average rating or None if no ratings exist.
         """
-        return obj.average_rating
+        return obj.average_rating()
 
     def get_category_title(self, obj):
         """
@@ -339,6 +352,55 @@ class MangaListSerializer(serializers.ModelSerializer):
         )
 
 
+class MangaSlugsSerializer(serializers.Serializer):
+    """
+    Serializer validating a batch of manga slugs.
+
+    Serializes slugs field, at most 500 of them.
+    """
+
+    slugs = serializers.ListField(child=serializers.SlugField(), allow_empty=False, max_length=500)
+
+
+class MangaListOperationSerializer(serializers.Serializer):
+    """
+    Serializer for one operation of a bulk manga list update.
+
+    Serializes op, slug and name fields, name is required to add or move a manga.
+    """
+
+    op = serializers.ChoiceField(choices=["add", "move", "remove"])
+    slug = serializers.SlugField()
+    name = serializers.ChoiceField(choices=NAME_LIST_MANGA, required=False)
+
+    def validate(self, attrs):
+        """
+        Check that added and moved manga have a list name.
+
+        Args:
+            attrs (dict): The validated fields.
+
+        Returns:
+            dict: The validated fields.
+
+        Raises:
+            serializers.ValidationError: If name is missing for an add or move operation.
+        """
+        if attrs["op"] != "remove" and "name" not in attrs:
+            raise serializers.ValidationError({"name": "This field is required to add or move a manga."})
+        return attrs
+
+
+class MangaListBulkSerializer(serializers.Serializer):
+    """
+    Serializer validating a bulk manga list update.
+
+    Serializes operations field, at most 500 of them.
+    """
+
+    operations = MangaListOperationSerializer(many=True, allow_empty=False, max_length=500)
+
+
 class PageSerializer(serializers.ModelSerializer):
     """
     Serializer for Page model.
@@ -351,6 +413,32 @@ class PageSerializer(serializers.ModelSerializer):
         fields = ("image", "get_image", "page_number")
 
 
+class PageManifestSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the reader layout manifest of a chapter.
+
+    Serializes page_number, url, width, height, file_size and content_hash fields.
+    """
+
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Page
+        fields = ("page_number", "url", "width", "height", "file_size", "content_hash")
+
+    def get_url(self, obj):
+        """
+        Get the URL of the page image.
+
+        Args:
+            obj (Page): Page instance.
+
+        Returns:
+            str: Image URL.
+        """
+        return obj.get_image()
+
+
 class ChapterSerializer(serializers.ModelSerializer):
     """
     Serializer for Chapter model with nested pages.
@@ -362,7 +450,8 @@ class ChapterSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Chapter
-        fields = ("manga", "title", "volume", "chapter_number", "pages", "slug")
+        fields = ("manga", "title", "volume", "chapter_number", "pages", "comment_count", "slug")
+        read_only_fields = ("comment_count",)
 
 
 class LastChapterSerializer(serializers.ModelSerializer):
@@ -2,7 +2,9 @@ import json
 import random
 from datetime import timedelta
 
-from django.db.models import Avg, Count
+from django.db import transaction
+from django.db.models import Count, ExpressionWrapper, F, FloatField, OuterRef, Subquery
+from django.db.models.functions import NullIf
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import status
@@ -19,10 +21,28 @@ from manga.serializers import (
     LastChapterSerializer,
     MangaLastSerializer,
     MangaRandomSerializer,
+    PageManifestSerializer,
     TagsSerializer,
 )
+from manga_back.constants import NAME_LIST_MANGA
 from users.models import MangaList
 
+# Columns rendered by MangaLastSerializer, the only ones loaded when manga are listed as cards.
+MANGA_CARD_FIELDS = (
+    "id",
+    "name_manga",
+    "thumbnail",
+    "dominant_color",
+    "blurhash",
+    "comment_count",
+    "rating_count",
+    "rating_sum",
+    "slug",
+)
+
+# Average rating computed from the stored rating aggregates, NULL for manga without ratings.
+RATING_AVERAGE = ExpressionWrapper(F("rating_sum") * 1.0 / NullIf(F("rating_count"), 0), output_field=FloatField())
+
 
 def filtering_and_exclusion(self) -> Manga:
     """
@@ -73,7 +93,7 @@ def filtering_and_exclusion(self) -> Manga:
     if min_rating is not None:
         min_rating = int(min_rating)
         # Filter manga with an average rating greater than or equal to min_rating
-        queryset = queryset.annotate(avg_rating=Avg("ratings__rating")).filter(avg_rating__gte=min_rating)
+        queryset = queryset.annotate(rating_average=RATING_AVERAGE).filter(rating_average__gte=min_rating)
 
     return queryset
 
@@ -250,6 +270,33 @@ def create_page_chapter(chapter_instance, image, page_number):
     Page.objects.create(chapter=chapter_instance, image=image, page_number=page_number)
 
 
+def chapter_manifest(manga_slug, chapter_slug):
+    """
+    Build the reader layout manifest of a chapter.
+
+    Args:
+        manga_slug (str): The slug of the manga.
+        chapter_slug (str): The slug of the chapter.
+
+    Returns:
+        dict: Chapter slug, page count and per-page image size data.
+
+    Raises:
+        Http404: If the chapter does not exist.
+
+    Example:
+        chapter_manifest('naruto', 'naruto-1-1')
+    """
+    chapter_id = get_object_or_404(
+        Chapter.objects.values_list("id", flat=True), manga__slug=manga_slug, slug=chapter_slug
+    )
+    pages = Page.objects.filter(chapter_id=chapter_id).only(
+        "image", "page_number", "width", "height", "file_size", "content_hash"
+    )
+    serialized_pages = PageManifestSerializer(pages, many=True).data
+    return {"chapter": chapter_slug, "count": len(serialized_pages), "pages": serialized_pages}
+
+
 def update_field_chapter(self, request, field_name, success_message):
     """
     Update a specific field in the Chapter model object.
@@ -348,6 +395,87 @@ def mangalist_filter(request, manga_slug):
     return MangaList.objects.filter(user=request.user, manga__slug=manga_slug).first()
 
 
+def mangalist_bulk_update(request_user, operations):
+    """
+    Apply add, move and remove operations to the user's manga lists in one transaction.
+
+    Add and move both put the manga in the given list. When a slug appears more than once the last
+    operation wins. The slugs are resolved with one query, the added and moved entries are written with
+    one upsert and the removed ones with one DELETE.
+
+    Args:
+        request_user: The user whose lists to update.
+        operations (list): Dicts with op ("add", "move" or "remove"), slug and, unless removing, name.
+
+    Returns:
+        dict: Number of saved and removed entries, and the slugs that match no manga.
+
+    Example:
+        mangalist_bulk_update(user, [{"op": "add", "slug": "naruto", "name": "Reading"}])
+    """
+    placements = {}
+    for operation in operations:
+        placements[operation["slug"]] = None if operation["op"] == "remove" else operation["name"]
+    manga_ids = dict(Manga.objects.filter(slug__in=placements).values_list("slug", "id"))
+    entries = [
+        MangaList(user=request_user, manga_id=manga_ids[slug], name=name)
+        for slug, name in placements.items()
+        if name is not None and slug in manga_ids
+    ]
+    removed_ids = [manga_ids[slug] for slug, name in placements.items() if name is None and slug in manga_ids]
+    with transaction.atomic():
+        MangaList.objects.bulk_create(
+            entries, update_conflicts=True, unique_fields=["user", "manga"], update_fields=["name"]
+        )
+        removed = MangaList.objects.filter(user=request_user, manga_id__in=removed_ids).delete()[0]
+    return {
+        "saved": len(entries),
+        "removed": removed,
+        "not_found": [slug for slug in placements if slug not in manga_ids],
+    }
+
+
+def mangalist_statuses(request_user, slugs):
+    """
+    Return the list status of many manga for the current user with one IN query.
+
+    Args:
+        request_user: The user whose lists to look up.
+        slugs (list): Slugs of the manga.
+
+    Returns:
+        dict: For each slug, {"in_list": True, "list_name": str} or {"in_list": False}.
+
+    Example:
+        mangalist_statuses(user, ["naruto", "bleach"])
+    """
+    names = dict(
+        MangaList.objects.filter(user=request_user, manga__slug__in=set(slugs)).values_list("manga__slug", "name")
+    )
+    return {
+        slug: {"in_list": True, "list_name": names[slug]} if slug in names else {"in_list": False} for slug in slugs
+    }
+
+
+def annotate_list_name(queryset, request_user):
+    """
+    Annotate manga with the name of the user's list they are in.
+
+    Args:
+        queryset (QuerySet): Manga queryset.
+        request_user: The user whose lists to look up.
+
+    Returns:
+        QuerySet: The queryset annotated with list_name, None for manga not in a list.
+
+    Example:
+        annotate_list_name(Manga.objects.all(), request.user)
+    """
+    return queryset.annotate(
+        list_name=Subquery(MangaList.objects.filter(user=request_user, manga=OuterRef("pk")).values("name")[:1])
+    )
+
+
 def mangalist_filter_by_user(request_user):
     """
     Retrieve all MangaList objects associated with a specific user.
@@ -364,6 +492,66 @@ def mangalist_filter_by_user(request_user):
     return MangaList.objects.filter(user=request_user)
 
 
+def manga_card_fields(lookup):
+    """
+    List the fields of the manga rendered by MangaLastSerializer, to load with select_related() and only().
+
+    The stored rating aggregates are among them, so the serializer computes the average rating without a
+    query per manga and the manga are joined in the listing query.
+
+    Args:
+        lookup (str): Path to the manga from the listed model, for example "manga" or "chapter__manga".
+
+    Returns:
+        tuple: Field paths for only().
+
+    Example:
+        MangaList.objects.select_related("manga").only("id", "name", *manga_card_fields("manga"))
+    """
+    return (lookup, *(f"{lookup}__{field}" for field in MANGA_CARD_FIELDS))
+
+
+def mangalist_status_counts(request_user):
+    """
+    Count the entries of each of the user's manga lists with one GROUP BY query.
+
+    Args:
+        request_user: The user whose lists to count.
+
+    Returns:
+        dict: Number of entries per list name, every name of NAME_LIST_MANGA included.
+
+    Example:
+        mangalist_status_counts(user)
+    """
+    counts = dict.fromkeys((name for name, _ in NAME_LIST_MANGA), 0)
+    rows = MangaList.objects.filter(user=request_user).values("name").annotate(count=Count("id")).order_by()
+    counts.update((row["name"], row["count"]) for row in rows)
+    return counts
+
+
+def mangalist_entries(request_user, name=None):
+    """
+    Retrieve the entries of one or all of the user's manga lists with their manga, newest first.
+
+    Served by the (user, name) index. The manga are joined with the fields of their cards.
+
+    Args:
+        request_user: The user whose list to retrieve.
+        name (str, optional): The list name, one of NAME_LIST_MANGA, entries of every list when omitted.
+
+    Returns:
+        QuerySet: QuerySet of MangaList objects.
+
+    Example:
+        mangalist_entries(user, "Reading")
+    """
+    entries = MangaList.objects.filter(user=request_user)
+    if name is not None:
+        entries = entries.filter(name=name)
+    return entries.select_related("manga").only("id", "user", "name", *manga_card_fields("manga")).order_by("-id")
+
+
 def top_manga_objects_annotate_serializer():
     """
     Retrieve top manga objects by average rating and serialize them.
@@ -375,7 +563,7 @@ def top_manga_objects_annotate_serializer():
         top_manga_objects_annotate_serializer()
     """
     return MangaLastSerializer(
-        Manga.objects.annotate(avg_rating=Avg("ratings__rating")).order_by("-avg_rating")[:100],
+        Manga.objects.annotate(rating_average=RATING_AVERAGE).order_by(F("rating_average").desc(nulls_last=True))[:100],
         many=True,
     )
 
@@ -393,8 +581,8 @@ def top_manga_last_year_filter_serializer():
     last_year = timezone.now() - timedelta(days=365)
     top_manga_last_year = (
         Manga.objects.filter(created_at__gte=last_year)
-        .annotate(avg_rating=Avg("ratings__rating"))
-        .order_by("-avg_rating")[:100]
+        .annotate(rating_average=RATING_AVERAGE)
+        .order_by(F("rating_average").desc(nulls_last=True))[:100]
     )
     return MangaLastSerializer(top_manga_last_year, many=True)
 
@@ -403,13 +591,15 @@ def top_manga_comments_annotate_serializer():
     """
     Retrieve top manga objects by number of comments and serialize them.
 
+    Reads the indexed comment_count column instead of counting the comments.
+
     Returns:
         list: Serialized data for top manga objects by comments.
 
     Example:
         top_manga_comments_annotate_serializer()
     """
-    top_manga_comments = Manga.objects.annotate(num_comments=Count("comment")).order_by("-num_comments")[:100]
+    top_manga_comments = Manga.objects.order_by("-comment_count")[:100]
     return MangaLastSerializer(top_manga_comments, many=True)
 
 
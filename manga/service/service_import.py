@@ -0,0 +1,185 @@
+import csv
+import io
+import re
+import unicodedata
+from xml.etree.ElementTree import iterparse
+
+from django.db import transaction
+
+from manga.models import Manga
+from manga_back.constants import NAME_LIST_MANGA
+from users.models import MangaList
+
+# Statuses of other trackers mapped to our list names. MyAnimeList exports use the names or the numeric
+# codes, our own names are accepted as well.
+STATUS_ALIASES = {
+    "reading": "Reading",
+    "1": "Reading",
+    "completed": "Read",
+    "2": "Read",
+    "on-hold": "Postponed",
+    "on hold": "Postponed",
+    "3": "Postponed",
+    "dropped": "Abandoned",
+    "4": "Abandoned",
+    "plan to read": "I will read",
+    "6": "I will read",
+    **{name.casefold(): name for name, _ in NAME_LIST_MANGA},
+}
+# Element names of the title and the status of a <manga> entry in MyAnimeList exports.
+MAL_TITLE_TAGS = ("manga_title", "series_title")
+MAL_STATUS_TAG = "my_status"
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def normalize_title(title):
+    """
+    Normalize a title for matching, ignoring case, accents, punctuation and spacing.
+
+    Args:
+        title (str): The title.
+
+    Returns:
+        str: The normalized title.
+
+    Example:
+        normalize_title("Shingeki no Kyojin: Final") == normalize_title("shingeki no kyojin final")
+    """
+    decomposed = unicodedata.normalize("NFKD", title)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub("", stripped.casefold())
+
+
+def build_title_map():
+    """
+    Map the normalized titles of every manga to its ID.
+
+    Each manga is listed under name_manga, name_original and english_only_field. Titles are read with
+    one streamed query, so an import costs one query to match any number of entries.
+
+    Returns:
+        dict: Manga ID per normalized title.
+    """
+    titles = {}
+    fields = ("name_manga", "name_original", "english_only_field")
+    for manga_id, *names in Manga.objects.values_list("id", *fields).order_by("id").iterator(chunk_size=2000):
+        for name in names:
+            if name:
+                titles.setdefault(normalize_title(name), manga_id)
+    titles.pop("", None)
+    return titles
+
+
+def iter_mal_entries(file):
+    """
+    Read (title, status) pairs from a MyAnimeList XML export without loading the whole document.
+
+    Args:
+        file: Binary file object.
+
+    Yields:
+        tuple: Title and status of each <manga> entry.
+    """
+    for _, element in iterparse(file, events=("end",)):
+        if element.tag != "manga":
+            continue
+        title = next((element.findtext(tag) for tag in MAL_TITLE_TAGS if element.findtext(tag)), "")
+        yield title.strip(), (element.findtext(MAL_STATUS_TAG) or "").strip()
+        element.clear()
+
+
+def iter_csv_entries(file):
+    """
+    Read (title, status) pairs from a CSV file with title and status columns, row by row.
+
+    Args:
+        file: Binary file object.
+
+    Yields:
+        tuple: Title and status of each row.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    columns = {name.strip().casefold(): name for name in reader.fieldnames or ()}
+    title_column, status_column = columns.get("title"), columns.get("status")
+    if title_column is None:
+        raise ValueError("The CSV file needs a title column.")
+    for row in reader:
+        yield (row[title_column] or "").strip(), (row[status_column] or "").strip() if status_column else ""
+
+
+def iter_reading_list(file, file_name):
+    """
+    Choose the parser of an uploaded reading list by its file name.
+
+    Args:
+        file: Binary file object.
+        file_name (str): Name of the file, .xml files are read as MyAnimeList exports, others as CSV.
+
+    Returns:
+        Iterator: (title, status) pairs.
+    """
+    if file_name.lower().endswith(".xml"):
+        return iter_mal_entries(file)
+    return iter_csv_entries(file)
+
+
+def import_reading_list(request_user, entries, batch_size=500):
+    """
+    Add the entries of an external reading list to the user's manga lists.
+
+    Titles are matched against an in-memory map of normalized manga titles, matched entries are upserted
+    with one INSERT ... ON CONFLICT per batch, so an existing entry is moved to the imported list.
+
+    Args:
+        request_user: The user importing the list.
+        entries (Iterable): (title, status) pairs.
+        batch_size (int, optional): Entries written per INSERT.
+
+    Returns:
+        dict: Number of entries read and imported, and the titles that could not be matched or whose
+            status is unknown.
+
+    Example:
+        import_reading_list(user, iter_reading_list(file, "animelist.xml"))
+    """
+    titles = build_title_map()
+    report = {"total": 0, "imported": 0, "unmatched": [], "unknown_status": []}
+    batch = {}
+    for title, status in entries:
+        report["total"] += 1
+        name = STATUS_ALIASES.get(status.casefold())
+        manga_id = titles.get(normalize_title(title))
+        if manga_id is None:
+            report["unmatched"].append(title)
+        elif name is None:
+            report["unknown_status"].append(title)
+        else:
+            batch[manga_id] = name
+            if len(batch) >= batch_size:
+                report["imported"] += _save_entries(request_user, batch)
+                batch = {}
+    if batch:
+        report["imported"] += _save_entries(request_user, batch)
+    return report
+
+
+def _save_entries(request_user, batch):
+    """
+    Upsert one batch of imported entries.
+
+    Args:
+        request_user: The user importing the list.
+        batch (dict): List name per manga ID.
+
+    Returns:
+        int: Number of entries written.
+    """
+    with transaction.atomic():
+        MangaList.objects.bulk_create(
+            [MangaList(user=request_user, manga_id=manga_id, name=name) for manga_id, name in batch.items()],
+            update_conflicts=True,
+            unique_fields=["user", "manga"],
+            update_fields=["name"],
+        )
+    return len(batch)
@@ -1,14 +1,19 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from manga.models import Chapter
-from users.models import MangaList, Notification
+from common.service.service_tasks import enqueue_task
+from manga.models import Chapter, Manga, Page
+from manga.storage import content_addressed_storage
+from users.service.service_notifications import notifications_read_mode
 
 
 @receiver(post_save, sender=Chapter)
 def create_notification(sender, instance, created, **kwargs):
     """
-    Signal receiver that creates notifications for users when a new chapter is created.
+    Signal receiver that queues notifications for the manga's followers when a new chapter is created.
+
+    The notifications are inserted in batches by the background worker, so saving a chapter of a
+    popular manga does not wait for the fan-out. Nothing is written in the "read" notification mode.
 
     Args:
         sender (type): The model class sending the signal (Chapter).
@@ -22,7 +27,42 @@ def create_notification(sender, instance, created, **kwargs):
     Example:
         # Automatically called by Django when a Chapter is created
     """
-    if created:
-        users_with_manga = MangaList.objects.filter(manga=instance.manga).values_list("user", flat=True)
-        for user_id in users_with_manga:
-            Notification.objects.create(user_id=user_id, chapter=instance)
+    if created and not notifications_read_mode():
+        enqueue_task(
+            "users.tasks.fan_out_chapter_notifications",
+            key=str(instance.pk),
+            chapter_id=instance.pk,
+            manga_id=instance.manga_id,
+        )
+
+
+@receiver(post_delete, sender=Page)
+def release_page_image(sender, instance, **kwargs):
+    """
+    Signal receiver that drops the reference of a deleted page to its stored image.
+
+    Args:
+        sender (type): The model class sending the signal (Page).
+        instance (Page): The deleted Page instance.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        None
+    """
+    content_addressed_storage.release(instance.image.name)
+
+
+@receiver(post_delete, sender=Manga)
+def release_manga_avatar(sender, instance, **kwargs):
+    """
+    Signal receiver that drops the reference of a deleted manga to its stored avatar.
+
+    Args:
+        sender (type): The model class sending the signal (Manga).
+        instance (Manga): The deleted Manga instance.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        None
+    """
+    content_addressed_storage.release(instance.avatar.name)
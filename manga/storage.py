@@ -0,0 +1,220 @@
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+SHARDED_NAME_RE = re.compile(r"(^|/)[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.[^/]*)?$")
+
+
+def sharded_name(name, content_hash):
+    """
+    Build a hash-prefixed name below the directory of the given name.
+
+    Args:
+        name (str): The original name, its directory and extension are kept.
+        content_hash (str): SHA-256 hex digest of the content.
+
+    Returns:
+        str: Name in the form ``<directory>/ab/cd/<hash>.<ext>``.
+
+    Example:
+        sharded_name("media/manga/pages/01.PNG", "abcd...")
+    """
+    directory = posixpath.dirname(name.replace("\\", "/"))
+    extension = os.path.splitext(name)[1].lower()
+    return posixpath.join(directory, content_hash[:2], content_hash[2:4], f"{content_hash}{extension}")
+
+
+def is_sharded_name(name):
+    """
+    Check whether a stored name already follows the sharded layout.
+
+    Args:
+        name (str): The stored name.
+
+    Returns:
+        bool: True if the name ends with ``ab/cd/<hash>.<ext>``.
+    """
+    return bool(SHARDED_NAME_RE.search(name or ""))
+
+
+def file_hash(content):
+    """
+    Compute the SHA-256 hex digest of a file.
+
+    Args:
+        content (File): The file to hash.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ShardedStorage(FileSystemStorage):
+    """
+    File system storage that spreads files over hash-prefixed subdirectories.
+
+    Files are named after the SHA-256 hash of their content below the field's upload_to directory,
+    for example ``media/products/miniava/ab/cd/<hash>.png``, so no directory grows past 65,536 subdirectories
+    and an upload whose content is already stored is not written again.
+    """
+
+    def hashed_name(self, name, content):
+        """
+        Build the content-addressed name for an upload.
+
+        Args:
+            name (str): The name generated by the field (upload_to + original file name).
+            content (File): The uploaded file.
+
+        Returns:
+            tuple: (hashed name, SHA-256 hex digest)
+
+        Example:
+            storage.hashed_name("media/manga/pages/01.png", content)
+        """
+        content_hash = file_hash(content)
+        return sharded_name(name, content_hash), content_hash
+
+    def save(self, name, content, max_length=None):
+        """
+        Store the content under its hashed name unless it is already stored.
+
+        Args:
+            name (str): The name generated by the field.
+            content (File): The uploaded file.
+            max_length (int, optional): Maximum length of the stored name.
+
+        Returns:
+            str: The hashed name of the stored file.
+
+        Example:
+            storage.save("media/products/miniava/thumb.png", content)
+        """
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name, content_hash = self.hashed_name(name, content)
+        self.store(name, content_hash, content)
+        return name
+
+    def store(self, name, content_hash, content):
+        """
+        Write the content under the hashed name if no file with that name exists.
+
+        Args:
+            name (str): The hashed name.
+            content_hash (str): SHA-256 hex digest of the content.
+            content (File): The uploaded file.
+
+        Returns:
+            None
+        """
+        if not self.exists(name):
+            content.seek(0)
+            self._save(name, content)
+
+
+@deconstructible
+class ContentAddressedStorage(ShardedStorage):
+    """
+    Sharded storage that also counts the rows referencing each file.
+
+    Each distinct blob is written once and counted in MediaBlob. Identical uploads only increase the counter
+    and the file is removed when the last reference is released.
+    """
+
+    def store(self, name, content_hash, content):
+        """
+        Add a reference to the blob and write the file if it is not stored yet.
+
+        Args:
+            name (str): The hashed name.
+            content_hash (str): SHA-256 hex digest of the content.
+            content (File): The uploaded file.
+
+        Returns:
+            None
+        """
+        from manga.models import MediaBlob
+
+        with transaction.atomic():
+            blob, created = MediaBlob.objects.select_for_update().get_or_create(
+                name=name, defaults={"content_hash": content_hash, "size": content.size, "ref_count": 1}
+            )
+            if not created:
+                MediaBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+            super().store(name, content_hash, content)
+
+    def release(self, name):
+        """
+        Drop one reference to a blob and remove the file when no references remain.
+
+        Files that were not stored through this backend (defaults, legacy uploads) are never removed.
+
+        Args:
+            name (str): The stored name.
+
+        Returns:
+            bool: True if the file was removed.
+
+        Example:
+            storage.release(page.image.name)
+        """
+        from manga.models import MediaBlob
+
+        if not name:
+            return False
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None:
+                return False
+            if blob.ref_count > 1:
+                MediaBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") - 1)
+                return False
+            blob.delete()
+            transaction.on_commit(lambda: self.delete_unreferenced(name))
+        return True
+
+    def delete_unreferenced(self, name):
+        """
+        Remove a blob file unless it was referenced again in the meantime.
+
+        Args:
+            name (str): The stored name.
+
+        Returns:
+            None
+        """
+        from manga.models import MediaBlob
+
+        if not MediaBlob.objects.filter(name=name).exists():
+            super().delete(name)
+
+    def delete(self, name):
+        """
+        Release a reference instead of deleting the shared file outright.
+
+        Args:
+            name (str): The stored name.
+
+        Returns:
+            None
+        """
+        self.release(name)
+
+
+sharded_storage = ShardedStorage()
+content_addressed_storage = ContentAddressedStorage()
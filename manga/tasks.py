@@ -0,0 +1,19 @@
+from manga.models import Manga
+
+
+def generate_manga_thumbnail(manga_id):
+    """
+    Background task that renders and stores the thumbnail of a manga avatar.
+
+    Args:
+        manga_id (int): The ID of the manga.
+
+    Returns:
+        None
+
+    Example:
+        generate_manga_thumbnail(42)
+    """
+    manga = Manga.objects.filter(pk=manga_id).only("id", "slug", "avatar", "thumbnail").first()
+    if manga is not None:
+        manga.generate_thumbnail()
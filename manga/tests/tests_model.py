@@ -1,3 +1,4 @@
+import hashlib
 from io import BytesIO
 
 from django.core.files import File
@@ -7,7 +8,9 @@ from django.utils import timezone
 from django.utils.text import slugify
 from PIL import Image
 
-from manga.models import Author, Category, Chapter, Country, Genre, Manga, Tag
+from common.models import BackgroundTask
+from common.service.service_tasks import run_pending_tasks
+from manga.models import Author, Category, Chapter, Country, Genre, Manga, Page, Tag
 
 
 class MangaModelTest(TestCase):
@@ -134,6 +137,59 @@ class MangaModelTest(TestCase):
         thumbnail = File(thumb_io, name=avatar.name)
         return thumbnail
 
+    def test_save_without_avatar_change_skips_extra_queries(self):
+        """
+        Test that saving an unrelated field neither reads the row again nor queues a thumbnail.
+
+        Returns:
+            None
+        """
+        manga = Manga.objects.get(pk=self.create_manga().pk)
+        BackgroundTask.objects.all().delete()
+        manga.review = "Updated Review"
+        with self.assertNumQueries(1):
+            manga.save()
+        self.assertFalse(BackgroundTask.objects.exists())
+
+    def test_avatar_change_queues_thumbnail(self):
+        """
+        Test that a new avatar queues one thumbnail task which renders a downscaled thumbnail.
+
+        Returns:
+            None
+        """
+        manga = Manga.objects.get(pk=self.create_manga().pk)
+        BackgroundTask.objects.all().delete()
+        img_io = BytesIO()
+        Image.new("RGB", (1200, 1700), color="green").save(img_io, "JPEG")
+        manga.avatar = SimpleUploadedFile("cover.jpg", img_io.getvalue(), content_type="image/jpeg")
+        manga.save()
+        manga.save()
+        self.assertEqual(BackgroundTask.objects.count(), 1)
+        self.assertEqual(run_pending_tasks(), 1)
+        manga.refresh_from_db()
+        with Image.open(manga.thumbnail) as thumbnail:
+            self.assertEqual(thumbnail.size, Manga.THUMBNAIL_SIZE)
+            self.assertEqual(thumbnail.format, "PNG")
+
+    def test_palette_avatar_gets_thumbnail(self):
+        """
+        Test that a large palette PNG avatar is downscaled into a thumbnail with a placeholder.
+
+        Returns:
+            None
+        """
+        manga = Manga.objects.get(pk=self.create_manga().pk)
+        img_io = BytesIO()
+        Image.new("RGB", (600, 850), color="blue").convert("P").save(img_io, "PNG")
+        manga.avatar = SimpleUploadedFile("cover.png", img_io.getvalue(), content_type="image/png")
+        manga.generate_thumbnail()
+        manga.refresh_from_db()
+        with Image.open(manga.thumbnail) as thumbnail:
+            self.assertEqual(thumbnail.size, Manga.THUMBNAIL_SIZE)
+        self.assertEqual(manga.dominant_color, "#0000ff")
+        self.assertTrue(manga.blurhash)
+
     def test_save_method(self):
         """
         Test save method and slug generation for Manga model.
@@ -372,3 +428,81 @@ class ChapterModelTest(TestCase):
         )
         expected_slug = f"{self.manga.english_only_field.lower()}-1-1"
         self.assertEqual(chapter.slug, expected_slug)
+
+
+class PageModelTest(TestCase):
+    """
+    Test suite for the Page model.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for Page model tests.
+
+        Returns:
+            None
+        """
+        self.category = Category.objects.create(category_name="Manga")
+        self.manga = Manga.objects.create(
+            category=self.category,
+            name_manga="Test Manga",
+            english_only_field="Test_English",
+            review="Test Review",
+            slug="test-manga",
+        )
+        self.chapter = Chapter.objects.create(manga=self.manga, chapter_number=1, volume=1)
+
+    def make_image(self, size=(40, 60)):
+        """
+        Helper method to create an uploaded PNG image.
+
+        Args:
+            size (tuple): Width and height of the image.
+
+        Returns:
+            SimpleUploadedFile: The uploaded image file.
+        """
+        img_io = BytesIO()
+        Image.new("RGB", size, color="blue").save(img_io, "PNG")
+        return SimpleUploadedFile("page.png", img_io.getvalue(), content_type="image/png")
+
+    def test_save_stores_image_metadata(self):
+        """
+        Test that saving a page stores its dimensions, byte size and content hash.
+
+        Returns:
+            None
+        """
+        image = self.make_image()
+        expected_hash = hashlib.sha256(image.read()).hexdigest()
+        page = Page.objects.create(chapter=self.chapter, image=image, page_number=1)
+        page.refresh_from_db()
+        self.assertEqual((page.width, page.height), (40, 60))
+        self.assertEqual(page.file_size, image.size)
+        self.assertEqual(page.content_hash, expected_hash)
+
+    def test_save_with_missing_image_file(self):
+        """
+        Test that a page whose stored image file is missing can still be edited, its metadata left empty.
+
+        Returns:
+            None
+        """
+        page = Page.objects.create(chapter=self.chapter, image=self.make_image(), page_number=1)
+        Page.objects.filter(pk=page.pk).update(image="media/manga/pages/missing.png", content_hash="")
+        page = Page.objects.get(pk=page.pk)
+        page.page_number = 2
+        page.save()
+        page.refresh_from_db()
+        self.assertEqual((page.page_number, page.content_hash), (2, ""))
+
+    def test_save_auto_assigns_page_number(self):
+        """
+        Test that pages without a number are appended to the chapter.
+
+        Returns:
+            None
+        """
+        Page.objects.create(chapter=self.chapter, image=self.make_image(), page_number=1)
+        page = Page.objects.create(chapter=self.chapter, image=self.make_image(), page_number=0)
+        self.assertEqual(page.page_number, 2)
@@ -1,18 +1,26 @@
 from datetime import timedelta
+from io import BytesIO
 
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.test import RequestFactory, TestCase
 from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
 
 from common.models import Comment, MangaRating
-from manga.models import Author, Category, Chapter, Country, Genre, Manga, Tag
+from manga.models import Author, Category, Chapter, Country, Genre, Manga, Page, Tag
 from manga.service.service import (
+    chapter_manifest,
     create_comment,
     get_manga_objects,
+    mangalist_bulk_update,
     mangalist_filter,
     mangalist_filter_by_user,
     mangalist_remove,
+    mangalist_status_counts,
+    mangalist_statuses,
     one_hundred_last_added_chapters,
     random_manga,
     top_manga_comments_annotate_serializer,
@@ -393,3 +401,256 @@ class MangaListFunctionTestCase(TestCase):
         self.assertEqual(comment.user, self.user)
         self.assertEqual(comment.manga, self.manga)
         self.assertEqual(comment.content, content)
+
+
+class ChapterManifestTestCase(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(category_name="Manga")
+        self.manga = Manga.objects.create(
+            category=self.category,
+            name_manga="manga-1",
+            english_only_field="manga-1",
+            review="Test Review 1",
+            slug="manga-1",
+        )
+        self.chapter = Chapter.objects.create(manga=self.manga, chapter_number=1, volume=1)
+        for page_number, size in enumerate([(30, 90), (30, 120)], start=1):
+            img_io = BytesIO()
+            Image.new("RGB", size).save(img_io, "PNG")
+            image = SimpleUploadedFile(f"page_{page_number}.png", img_io.getvalue(), content_type="image/png")
+            Page.objects.create(chapter=self.chapter, image=image, page_number=page_number)
+
+    def test_chapter_manifest(self):
+        with self.assertNumQueries(2):
+            manifest = chapter_manifest("manga-1", self.chapter.slug)
+        self.assertEqual(manifest["count"], 2)
+        self.assertEqual([(p["width"], p["height"]) for p in manifest["pages"]], [(30, 90), (30, 120)])
+        self.assertTrue(all(len(p["content_hash"]) == 64 and p["file_size"] for p in manifest["pages"]))
+
+    def test_chapter_manifest_unknown_chapter(self):
+        with self.assertRaises(Http404):
+            chapter_manifest("manga-1", "missing-chapter")
+
+
+class UserMangaListViewTest(TestCase):
+    """
+    Test suite for the grouped, paginated user manga lists.
+    """
+
+    def setUp(self):
+        """
+        Set up a user with 25 manga in "Reading" and 2 in "Read".
+
+        Returns:
+            None
+        """
+        category = Category.objects.create(category_name="Manga")
+        self.user = CustomUser.objects.create_user(username="reader", password="test_password")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for index in range(27):
+            manga = Manga.objects.create(
+                category=category,
+                name_manga=f"Manga {index}",
+                english_only_field=f"manga-{index}",
+                review="Review",
+                slug=f"manga-{index}",
+            )
+            MangaList.objects.create(user=self.user, manga=manga, name="Reading" if index < 25 else "Read")
+            MangaRating.objects.create(user=self.user, manga=manga, rating=5)
+
+    def test_status_counts(self):
+        """
+        Test that every list name is counted, empty ones included.
+
+        Returns:
+            None
+        """
+        counts = mangalist_status_counts(self.user)
+        self.assertEqual(counts["Reading"], 25)
+        self.assertEqual(counts["Read"], 2)
+        self.assertEqual(counts["Abandoned"], 0)
+
+    def test_grouped_lists_cost_constant_queries(self):
+        """
+        Test that the grouped response has the first page of each non-empty list in a constant number of queries.
+
+        Returns:
+            None
+        """
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/v1/user-manga-list/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data["lists"]), {"Reading", "Read"})
+        reading = response.data["lists"]["Reading"]
+        self.assertEqual(len(reading["results"]), 20)
+        self.assertEqual(reading["results"][0]["manga"]["name_manga"], "Manga 24")
+        self.assertEqual(reading["results"][0]["manga"]["average_rating"], 5)
+        self.assertIsNone(response.data["lists"]["Read"]["next"])
+
+        next_page = self.client.get(reading["next"])
+        self.assertEqual(len(next_page.data["results"]), 5)
+
+    def test_unknown_list_name(self):
+        """
+        Test that an unknown list name is rejected.
+
+        Returns:
+            None
+        """
+        response = self.client.get("/api/v1/user-manga-list/", {"name": "Favourites"})
+        self.assertEqual(response.status_code, 400)
+
+
+class MangaInUserListBatchTest(TestCase):
+    """
+    Test suite for looking up the list status of many manga at once.
+    """
+
+    def setUp(self):
+        """
+        Set up a user with two of three manga in their lists.
+
+        Returns:
+            None
+        """
+        category = Category.objects.create(category_name="Manga")
+        self.user = CustomUser.objects.create_user(username="reader", password="test_password")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for index, name in enumerate(["Reading", "Read", None]):
+            manga = Manga.objects.create(
+                category=category,
+                name_manga=f"Manga {index}",
+                english_only_field=f"manga-{index}",
+                review="Review",
+                slug=f"manga-{index}",
+            )
+            if name:
+                MangaList.objects.create(user=self.user, manga=manga, name=name)
+
+    def test_statuses_in_one_query(self):
+        """
+        Test that the statuses of all requested slugs are looked up with one query.
+
+        Returns:
+            None
+        """
+        with self.assertNumQueries(1):
+            statuses = mangalist_statuses(self.user, ["manga-0", "manga-2", "missing"])
+
+        self.assertEqual(
+            statuses,
+            {
+                "manga-0": {"in_list": True, "list_name": "Reading"},
+                "manga-2": {"in_list": False},
+                "missing": {"in_list": False},
+            },
+        )
+
+    def test_batch_endpoint(self):
+        """
+        Test that the endpoint returns the statuses and rejects oversized batches.
+
+        Returns:
+            None
+        """
+        response = self.client.post("/api/v1/manga_in_user_list/", {"slugs": ["manga-1"]}, format="json")
+        self.assertEqual(response.data, {"manga-1": {"in_list": True, "list_name": "Read"}})
+
+        slugs = [f"manga-{index}" for index in range(501)]
+        response = self.client.post("/api/v1/manga_in_user_list/", {"slugs": slugs}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_catalog_includes_list_name(self):
+        """
+        Test that the catalog has the list name for authenticated users only.
+
+        Returns:
+            None
+        """
+        results = self.client.get("/api/v1/allManga/").data["results"]
+        self.assertEqual(
+            {manga["name_manga"]: manga["list_name"] for manga in results},
+            {"Manga 0": "Reading", "Manga 1": "Read", "Manga 2": None},
+        )
+
+        anonymous = APIClient().get("/api/v1/allManga/").data["results"]
+        self.assertTrue(all(manga["list_name"] is None for manga in anonymous))
+
+
+class MangaListBulkUpdateTest(TestCase):
+    """
+    Test suite for bulk manga list operations.
+    """
+
+    def setUp(self):
+        """
+        Set up a user with one of four manga in a list.
+
+        Returns:
+            None
+        """
+        category = Category.objects.create(category_name="Manga")
+        self.user = CustomUser.objects.create_user(username="reader", password="test_password")
+        self.manga = [
+            Manga.objects.create(
+                category=category,
+                name_manga=f"Manga {index}",
+                english_only_field=f"manga-{index}",
+                review="Review",
+                slug=f"manga-{index}",
+            )
+            for index in range(4)
+        ]
+        MangaList.objects.create(user=self.user, manga=self.manga[0], name="Reading")
+        MangaList.objects.create(user=self.user, manga=self.manga[1], name="Reading")
+
+    def test_operations_are_applied_in_constant_queries(self):
+        """
+        Test that adds, moves and removes are applied with one lookup, one upsert and one delete.
+
+        Returns:
+            None
+        """
+        operations = [
+            {"op": "move", "slug": "manga-0", "name": "Read"},
+            {"op": "remove", "slug": "manga-1"},
+            {"op": "add", "slug": "manga-2", "name": "Reading"},
+            {"op": "add", "slug": "manga-3", "name": "Reading"},
+            {"op": "remove", "slug": "manga-3"},
+            {"op": "add", "slug": "missing", "name": "Reading"},
+        ]
+        # Slug lookup, savepoint, upsert, delete and savepoint release.
+        with self.assertNumQueries(5):
+            result = mangalist_bulk_update(self.user, operations)
+
+        self.assertEqual(result, {"saved": 2, "removed": 1, "not_found": ["missing"]})
+        self.assertEqual(
+            dict(MangaList.objects.filter(user=self.user).values_list("manga__slug", "name")),
+            {"manga-0": "Read", "manga-2": "Reading"},
+        )
+
+    def test_endpoint_validates_operations(self):
+        """
+        Test that the endpoint requires a list name to add a manga and applies valid operations.
+
+        Returns:
+            None
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post(
+            "/api/v1/bulk-manga-list/", {"operations": [{"op": "add", "slug": "manga-2"}]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = client.post(
+            "/api/v1/bulk-manga-list/",
+            {"operations": [{"op": "add", "slug": "manga-2", "name": "Postponed"}]},
+            format="json",
+        )
+        self.assertEqual(response.data, {"saved": 1, "removed": 0, "not_found": []})
+        self.assertTrue(MangaList.objects.filter(user=self.user, manga=self.manga[2], name="Postponed").exists())
@@ -0,0 +1,141 @@
+from io import BytesIO, StringIO
+from tempfile import NamedTemporaryFile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from manga.models import Category, Manga
+from manga.service.service_import import import_reading_list, iter_csv_entries, normalize_title
+from users.models import CustomUser, MangaList
+
+MAL_EXPORT = b"""<?xml version="1.0" encoding="UTF-8" ?>
+<myanimelist>
+    <myinfo><user_name>reader</user_name></myinfo>
+    <manga>
+        <manga_title><![CDATA[Shingeki no Kyojin]]></manga_title>
+        <my_status>Completed</my_status>
+    </manga>
+    <manga>
+        <manga_title><![CDATA[Berserk]]></manga_title>
+        <my_status>Plan to Read</my_status>
+    </manga>
+    <manga>
+        <manga_title><![CDATA[Unknown Title]]></manga_title>
+        <my_status>Reading</my_status>
+    </manga>
+</myanimelist>
+"""
+
+
+class ReadingListImportTest(TestCase):
+    """
+    Test suite for importing reading lists from other trackers.
+    """
+
+    def setUp(self):
+        """
+        Set up two manga and a user.
+
+        Returns:
+            None
+        """
+        category = Category.objects.create(category_name="Manga")
+        self.titan = Manga.objects.create(
+            category=category,
+            name_manga="Атака титанів",
+            name_original="Shingeki no Kyojin",
+            english_only_field="Attack on Titan",
+            review="Review",
+            slug="attack-on-titan",
+        )
+        self.berserk = Manga.objects.create(
+            category=category, name_manga="Берсерк", english_only_field="Berserk", review="Review", slug="berserk"
+        )
+        self.user = CustomUser.objects.create_user(username="reader", password="test_password")
+
+    def test_normalize_title(self):
+        """
+        Test that case, accents, punctuation and spacing are ignored.
+
+        Returns:
+            None
+        """
+        self.assertEqual(normalize_title("Pokémon: Adventures!"), normalize_title("pokemon adventures"))
+
+    def test_csv_import_in_batches(self):
+        """
+        Test that CSV rows are matched by any title and upserted, moving entries already in a list.
+
+        Returns:
+            None
+        """
+        MangaList.objects.create(user=self.user, manga=self.berserk, name="Reading")
+        csv_file = BytesIO(b"Title,Status\nattack on titan,Reading\nBERSERK,dropped\nBerserk,Weird\n")
+
+        report = import_reading_list(self.user, iter_csv_entries(csv_file), batch_size=1)
+
+        self.assertEqual(report, {"total": 3, "imported": 2, "unmatched": [], "unknown_status": ["Berserk"]})
+        self.assertEqual(
+            dict(MangaList.objects.filter(user=self.user).values_list("manga__slug", "name")),
+            {"attack-on-titan": "Reading", "berserk": "Abandoned"},
+        )
+
+    def test_mal_import_endpoint(self):
+        """
+        Test that a MyAnimeList export is imported through the endpoint with a match report.
+
+        Returns:
+            None
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post(
+            "/api/v1/import-manga-list/",
+            {"file": SimpleUploadedFile("mangalist.xml", MAL_EXPORT, content_type="text/xml")},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["imported"], 2)
+        self.assertEqual(response.data["unmatched"], ["Unknown Title"])
+        self.assertEqual(
+            dict(MangaList.objects.filter(user=self.user).values_list("manga__slug", "name")),
+            {"attack-on-titan": "Read", "berserk": "I will read"},
+        )
+
+    def test_invalid_file_is_rejected(self):
+        """
+        Test that a file that cannot be parsed is answered with status 400.
+
+        Returns:
+            None
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post(
+            "/api/v1/import-manga-list/",
+            {"file": SimpleUploadedFile("mangalist.xml", b"<myanimelist><manga>", content_type="text/xml")},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_import_command(self):
+        """
+        Test that the management command imports a file and prints the report.
+
+        Returns:
+            None
+        """
+        with NamedTemporaryFile(suffix=".xml") as export:
+            export.write(MAL_EXPORT)
+            export.flush()
+            out = StringIO()
+            call_command("import_reading_list", "reader", export.name, stdout=out)
+
+        self.assertIn("Not found: Unknown Title", out.getvalue())
+        self.assertIn("Imported 2 of 3 entries", out.getvalue())
@@ -0,0 +1,272 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from common.models import BackgroundTask
+from common.service.service_tasks import run_pending_tasks
+from manga.models import Category, Chapter, Manga, MediaBlob, Page
+from manga.serializers import MangaAllSerializer
+from manga.storage import content_addressed_storage, is_sharded_name
+
+
+class ContentAddressedStorageTest(TestCase):
+    """
+    Test suite for the content-addressed page and avatar storage.
+    """
+
+    def setUp(self):
+        """
+        Set up a temporary media root and a chapter to attach pages to.
+
+        Returns:
+            None
+        """
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.category = Category.objects.create(category_name="Manga")
+        self.manga = Manga.objects.create(
+            category=self.category,
+            name_manga="Test Manga",
+            english_only_field="Test_English",
+            review="Test Review",
+            slug="test-manga",
+        )
+        self.chapter = Chapter.objects.create(manga=self.manga, chapter_number=1, volume=1)
+
+    def tearDown(self):
+        """
+        Remove the temporary media root.
+
+        Returns:
+            None
+        """
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def make_image(self, name="page.PNG", color="red"):
+        """
+        Helper method to create an uploaded PNG image.
+
+        Args:
+            name (str): Upload file name.
+            color (str): Fill color.
+
+        Returns:
+            SimpleUploadedFile: The uploaded image file.
+        """
+        img_io = BytesIO()
+        Image.new("RGB", (10, 10), color=color).save(img_io, "PNG")
+        return SimpleUploadedFile(name, img_io.getvalue(), content_type="image/png")
+
+    def test_identical_uploads_share_one_blob(self):
+        """
+        Test that identical files are stored once under a sharded hashed name.
+
+        Returns:
+            None
+        """
+        page1 = Page.objects.create(chapter=self.chapter, image=self.make_image("a.PNG"), page_number=1)
+        page2 = Page.objects.create(chapter=self.chapter, image=self.make_image("b.png"), page_number=2)
+        self.assertEqual(page1.image.name, page2.image.name)
+        digest = page1.content_hash
+        self.assertEqual(page1.image.name, f"media/manga/pages/{digest[:2]}/{digest[2:4]}/{digest}.png")
+        self.assertEqual(MediaBlob.objects.get(name=page1.image.name).ref_count, 2)
+        self.assertTrue(content_addressed_storage.exists(page1.image.name))
+
+    def test_different_uploads_get_different_blobs(self):
+        """
+        Test that different content is stored under different names.
+
+        Returns:
+            None
+        """
+        page1 = Page.objects.create(chapter=self.chapter, image=self.make_image(color="red"), page_number=1)
+        page2 = Page.objects.create(chapter=self.chapter, image=self.make_image(color="blue"), page_number=2)
+        self.assertNotEqual(page1.image.name, page2.image.name)
+        self.assertEqual(MediaBlob.objects.count(), 2)
+
+    def test_file_removed_with_last_reference(self):
+        """
+        Test that the blob file is kept while referenced and removed with the last row.
+
+        Returns:
+            None
+        """
+        page1 = Page.objects.create(chapter=self.chapter, image=self.make_image(), page_number=1)
+        page2 = Page.objects.create(chapter=self.chapter, image=self.make_image(), page_number=2)
+        name = page1.image.name
+        with self.captureOnCommitCallbacks(execute=True):
+            page1.delete()
+        self.assertEqual(MediaBlob.objects.get(name=name).ref_count, 1)
+        self.assertTrue(content_addressed_storage.exists(name))
+        with self.captureOnCommitCallbacks(execute=True):
+            page2.delete()
+        self.assertFalse(MediaBlob.objects.filter(name=name).exists())
+        self.assertFalse(content_addressed_storage.exists(name))
+
+    def test_edits_keep_reference_counts(self):
+        """
+        Test that replacing or re-uploading a file and a failed insert leave one reference per row.
+
+        Returns:
+            None
+        """
+        page = Page.objects.create(chapter=self.chapter, image=self.make_image(color="red"), page_number=1)
+        old_name = page.image.name
+        page = Page.objects.get(pk=page.pk)
+        page.image = self.make_image(color="blue")
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save()
+        self.assertFalse(MediaBlob.objects.filter(name=old_name).exists())
+        self.assertFalse(content_addressed_storage.exists(old_name))
+        self.assertEqual(MediaBlob.objects.get(name=page.image.name).ref_count, 1)
+
+        for _ in range(2):
+            self.manga.avatar = self.make_image("cover.png", color="green")
+            self.manga.save()
+        self.assertEqual(MediaBlob.objects.get(name=self.manga.avatar.name).ref_count, 1)
+
+        with self.assertRaises(IntegrityError):
+            Page.objects.create(chapter=self.chapter, image=self.make_image(color="white"), page_number=1)
+        self.assertEqual(MediaBlob.objects.count(), 2)
+
+    def test_release_ignores_untracked_files(self):
+        """
+        Test that releasing a name that was not stored by the backend does nothing.
+
+        Returns:
+            None
+        """
+        self.assertFalse(content_addressed_storage.release("default/none_avatar.png/"))
+
+    def test_thumbnail_is_sharded(self):
+        """
+        Test that generated thumbnails are stored in hash-prefixed subdirectories.
+
+        Returns:
+            None
+        """
+        self.manga.avatar = self.make_image("cover.png")
+        self.manga.save()
+        run_pending_tasks()
+        self.manga.refresh_from_db()
+        self.assertTrue(is_sharded_name(self.manga.thumbnail.name))
+        self.assertTrue(self.manga.thumbnail.name.startswith("media/products/miniava/"))
+
+    def test_thumbnail_fills_cover_placeholder(self):
+        """
+        Test that thumbnail generation stores the dominant color and blurhash shown by the catalog.
+
+        Returns:
+            None
+        """
+        self.manga.avatar = self.make_image("cover.png", color="red")
+        self.manga.save()
+        run_pending_tasks()
+        self.manga.refresh_from_db()
+        self.assertEqual(self.manga.dominant_color, "#ff0000")
+        self.assertEqual(len(self.manga.blurhash), 22)
+        data = MangaAllSerializer(self.manga).data
+        self.assertEqual(data["dominant_color"], "#ff0000")
+        self.assertEqual(data["blurhash"], self.manga.blurhash)
+
+    def test_shard_media_files_moves_legacy_files(self):
+        """
+        Test that the migration command moves legacy files and updates their rows.
+
+        Returns:
+            None
+        """
+        legacy_name = "media/manga/pages/legacy_01.png"
+        legacy_path = os.path.join(self.media_root, legacy_name)
+        os.makedirs(os.path.dirname(legacy_path))
+        with open(legacy_path, "wb") as legacy_file:
+            legacy_file.write(self.make_image().read())
+        page = Page.objects.create(chapter=self.chapter, image=self.make_image(color="blue"), page_number=1)
+        Page.objects.filter(pk=page.pk).update(image=legacy_name)
+        Page.objects.create(chapter=self.chapter, image=self.make_image(color="green"), page_number=2)
+
+        call_command("shard_media_files", workers=2, batch_size=1, stdout=StringIO())
+
+        page.refresh_from_db()
+        self.assertTrue(is_sharded_name(page.image.name))
+        self.assertTrue(content_addressed_storage.exists(page.image.name))
+        self.assertFalse(os.path.exists(legacy_path))
+        self.assertEqual(MediaBlob.objects.get(name=page.image.name).ref_count, 1)
+
+    def test_interrupted_shard_media_files_removes_moved_legacy_files(self):
+        """
+        Test that the legacy files of batches committed before an interruption are already unlinked.
+
+        Returns:
+            None
+        """
+        legacy_paths = []
+        for number, color in ((1, "red"), (2, "blue")):
+            legacy_name = f"media/manga/pages/legacy_{number:02}.png"
+            legacy_paths.append(os.path.join(self.media_root, legacy_name))
+            os.makedirs(os.path.dirname(legacy_paths[-1]), exist_ok=True)
+            with open(legacy_paths[-1], "wb") as legacy_file:
+                legacy_file.write(self.make_image(color=color).read())
+            page = Page.objects.create(chapter=self.chapter, image=self.make_image(color="white"), page_number=number)
+            Page.objects.filter(pk=page.pk).update(image=legacy_name)
+
+        bulk_update = Page.objects.bulk_update
+        calls = []
+
+        def interrupt_second_batch(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            return bulk_update(*args, **kwargs)
+
+        with patch.object(Page.objects, "bulk_update", side_effect=interrupt_second_batch):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command("shard_media_files", workers=2, batch_size=1, stdout=StringIO())
+        self.assertEqual([os.path.exists(path) for path in legacy_paths], [False, True])
+
+        call_command("shard_media_files", workers=2, batch_size=1, stdout=StringIO())
+        self.assertFalse(os.path.exists(legacy_paths[1]))
+        self.assertTrue(all(is_sharded_name(name) for name in Page.objects.values_list("image", flat=True)))
+
+    def test_rebuild_thumbnails_resumes_after_checkpoint(self):
+        """
+        Test that the rebuild command renders thumbnails after the checkpointed manga and removes the checkpoint.
+
+        Returns:
+            None
+        """
+        second = Manga.objects.create(
+            category=self.category,
+            name_manga="Second Manga",
+            english_only_field="Second_English",
+            review="Test Review",
+            slug="second-manga",
+        )
+        for manga, color in ((self.manga, "red"), (second, "blue")):
+            manga.avatar = self.make_image("cover.png", color=color)
+            manga.save()
+        BackgroundTask.objects.all().delete()
+        checkpoint = os.path.join(self.media_root, "rebuild.checkpoint")
+        with open(checkpoint, "w") as checkpoint_file:
+            checkpoint_file.write(str(self.manga.pk))
+
+        call_command("rebuild_thumbnails", workers=2, batch_size=1, checkpoint=checkpoint, stdout=StringIO())
+
+        self.manga.refresh_from_db()
+        second.refresh_from_db()
+        self.assertFalse(self.manga.thumbnail)
+        self.assertTrue(is_sharded_name(second.thumbnail.name))
+        self.assertEqual(second.dominant_color, "#0000ff")
+        with Image.open(second.thumbnail.path) as img:
+            self.assertEqual(img.size, Manga.THUMBNAIL_SIZE)
+        self.assertFalse(os.path.exists(checkpoint))
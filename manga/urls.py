@@ -21,9 +21,17 @@ urlpatterns = [
     path("", include(router.urls)),
     path("add-manga-list/", views.add_manga_to_list, name="add-manga"),
     path("remove-manga-list/", views.remove_manga_from_list, name="remove-manga"),
+    path("bulk-manga-list/", views.bulk_update_manga_list, name="bulk-manga-list"),
+    path("import-manga-list/", views.ImportMangaListView.as_view(), name="import-manga-list"),
     path("user-manga-list/", views.user_manga_list, name="user-manga-list"),
+    path("manga_in_user_list/", views.manga_in_user_list_batch, name="manga-in-user-list-batch"),
     path("manga_in_user_list/<str:manga_slug>/", views.manga_in_user_list),
     path("last-chapters/", views.last_hundred_chapters, name="get_last_chapters"),
     path("allManga/", views.AllManga.as_view(), name="all_manga"),
     path("<slug:manga_slug>/<slug:chapter_slug>/", views.ShowChapter.as_view()),
+    path(
+        "<slug:manga_slug>/<slug:chapter_slug>/manifest/",
+        views.ChapterManifestView.as_view(),
+        name="chapter-manifest",
+    ),
 ]
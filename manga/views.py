@@ -1,15 +1,20 @@
-from django.db.models import Avg
+import csv
+from xml.etree.ElementTree import ParseError
+
 from rest_framework import filters, generics, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.generics import get_object_or_404
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
 from manga.models import Author, Chapter, Manga, Page
+from manga_back.constants import NAME_LIST_MANGA
 from manga_back.service import data_acquisition_and_serialization
+from manga_back.throttling import WRITE_THROTTLES
 
 from .serializers import (
     AuthorSerializer,
@@ -17,11 +22,13 @@ from .serializers import (
     MangaAllSerializer,
     MangaCreateUpdateSerializer,
     MangaLastSerializer,
+    MangaListBulkSerializer,
     MangaListSerializer,
     MangaSerializer,
+    MangaSlugsSerializer,
     PageSerializer,
 )
-from .service import service
+from .service import service, service_import
 from .service.service import filtering_and_exclusion
 
 
@@ -31,6 +38,13 @@ class MangaPagination(PageNumberPagination):
     max_page_size = 50
 
 
+class MangaListPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
+
+
 class AllManga(generics.ListAPIView):
     """
     API view to list all manga with filtering and ordering.
@@ -45,15 +59,19 @@ class AllManga(generics.ListAPIView):
         """
         Get the queryset of manga filtered by query parameters.
 
+        For authenticated users every manga carries the name of the user's list it is in.
+
         Returns:
             QuerySet: Filtered manga queryset.
         """
-        queryset = filtering_and_exclusion(self)
-        return (
-            queryset.select_related("category")
+        queryset = (
+            filtering_and_exclusion(self)
+            .select_related("category")
             .prefetch_related("author", "country", "genre", "tags", "chapters")
-            .annotate(average_rating=Avg("ratings__rating"))
         )
+        if self.request.user.is_authenticated:
+            queryset = service.annotate_list_name(queryset, self.request.user)
+        return queryset
 
 
 class Search(viewsets.ModelViewSet):
@@ -149,6 +167,8 @@ class ChapterViewSet(viewsets.ModelViewSet):
     queryset, serializer_class = data_acquisition_and_serialization(Chapter, ChapterSerializer)
     lookup_field = "slug"
     permission_classes = [IsAuthenticatedOrReadOnly]
+    # Scope of the throttles of add_comment_to_chapter, the other actions are not throttled.
+    throttle_scope = "comments"
 
     def create(self, request, *args, **kwargs):
         """
@@ -221,7 +241,7 @@ class ChapterViewSet(viewsets.ModelViewSet):
         """
         return service.update_field_chapter(self, request, "chapter_number", "Chapter number updated successfully.")
 
-    @action(detail=True, methods=["POST"])
+    @action(detail=True, methods=["POST"], throttle_classes=WRITE_THROTTLES)
     def add_comment_to_chapter(self, request, slug=None):
         """
         Create a comment for a chapter.
@@ -268,6 +288,27 @@ class ShowChapter(APIView):
         return Response(serializer.data)
 
 
+class ChapterManifestView(APIView):
+    """
+    API view to return the reader layout manifest of a chapter.
+    """
+
+    def get(self, request, manga_slug, chapter_slug, format=None):
+        """
+        Retrieve page dimensions, sizes and hashes for a chapter in one response.
+
+        Args:
+            request: The HTTP request object.
+            manga_slug (str): Slug of the manga.
+            chapter_slug (str): Slug of the chapter.
+            format: Optional format.
+
+        Returns:
+            Response: Chapter manifest data.
+        """
+        return Response(service.chapter_manifest(manga_slug, chapter_slug))
+
+
 class PageViewSet(viewsets.ModelViewSet):
     """
     ViewSet for handling create, read, update, and delete operations in the Page model.
@@ -316,6 +357,59 @@ def remove_manga_from_list(request):
         return Response({"message": "Manga was not found in the list."})
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def bulk_update_manga_list(request):
+    """
+    Add, move and remove many manga of the reader's manga lists in one transaction.
+
+    Body: {"operations": [{"op": "add", "slug": "naruto", "name": "Reading"}, {"op": "remove", "slug": "bleach"}]},
+    at most 500 operations.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        Response: Number of saved and removed entries and the slugs that match no manga.
+    """
+    serializer = MangaListBulkSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    return Response(service.mangalist_bulk_update(request.user, serializer.validated_data["operations"]))
+
+
+class ImportMangaListView(APIView):
+    """
+    API view to import a reading list exported from another tracker into the reader's manga lists.
+    """
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = (MultiPartParser,)
+
+    def post(self, request, format=None):
+        """
+        Import the uploaded file, a MyAnimeList XML export or a CSV file with title and status columns.
+
+        The file is parsed entry by entry and matched entries are written in batches.
+
+        Args:
+            request: The HTTP request object.
+            format: Optional format.
+
+        Returns:
+            Response: Import report with the total, imported, unmatched and unknown_status entries.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "file field is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            report = service_import.import_reading_list(
+                request.user, service_import.iter_reading_list(upload.file, upload.name)
+            )
+        except (ValueError, csv.Error, ParseError) as e:
+            return Response({"error": f"The file could not be read: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report)
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def manga_in_user_list(request, manga_slug):
@@ -336,20 +430,66 @@ def manga_in_user_list(request, manga_slug):
         return Response({"in_list": False})
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def manga_in_user_list_batch(request):
+    """
+    Return the status of many manga in the reader's manga lists.
+
+    Body: {"slugs": ["naruto", "bleach"]}, at most 500 slugs.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        Response: Status of each manga keyed by slug, in the shape of manga_in_user_list.
+    """
+    serializer = MangaSlugsSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    return Response(service.mangalist_statuses(request.user, serializer.validated_data["slugs"]))
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def user_manga_list(request):
     """
-    Return the reader's manga lists.
+    Return the reader's manga lists grouped by list name.
+
+    Without parameters the response has the number of entries of every list and the first page of each
+    non-empty one. With `?name=<list name>` it is the cursor-paginated page of that list, which the `next`
+    links of the grouped response point to.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        Response: Counts and pages of the user's manga lists.
+    """
+    name = request.query_params.get("name")
+    if name is not None:
+        if name not in dict(NAME_LIST_MANGA):
+            return Response({"error": "Unknown list name."}, status=status.HTTP_400_BAD_REQUEST)
+        return manga_list_page(request, name)
+    counts = service.mangalist_status_counts(request.user)
+    lists = {name: manga_list_page(request, name).data for name, count in counts.items() if count}
+    return Response({"counts": counts, "lists": lists})
+
+
+def manga_list_page(request, name):
+    """
+    Paginate one of the reader's manga lists.
 
     Args:
         request: The HTTP request object.
+        name (str): The list name.
 
     Returns:
-        Response: Serialized manga list data.
+        Response: Paginated list entries.
     """
-    serialized_data = MangaListSerializer(service.mangalist_filter_by_user(request.user), many=True)
-    return Response(serialized_data.data)
+    paginator = MangaListPagination()
+    page = paginator.paginate_queryset(service.mangalist_entries(request.user, name), request)
+    paginator.base_url = replace_query_param(paginator.base_url, "name", name)
+    return paginator.get_paginated_response(MangaListSerializer(page, many=True).data)
 
 
 class TopMangaView(APIView):
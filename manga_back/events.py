@@ -0,0 +1,303 @@
+import asyncio
+import json
+import threading
+from abc import ABC, abstractmethod
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """
+    Queue of messages for one listener, bound to the event loop it was created in.
+
+    When the listener falls behind by more than EVENT_QUEUE_SIZE messages the oldest ones are dropped.
+    """
+
+    def __init__(self, broker, channel):
+        """
+        Initialize the subscription.
+
+        Args:
+            broker (InProcessBroker): The broker delivering messages.
+            channel (str): The subscribed channel.
+
+        Returns:
+            None
+        """
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=settings.EVENT_QUEUE_SIZE)
+
+    def put(self, message):
+        """
+        Queue a message, called in the subscription's event loop.
+
+        Args:
+            message (dict): The message.
+
+        Returns:
+            None
+        """
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout):
+        """
+        Wait for the next message.
+
+        Args:
+            timeout (float): Seconds to wait.
+
+        Returns:
+            dict or None: The message, None if the timeout expired.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+    def close(self):
+        """
+        Stop receiving messages.
+
+        Returns:
+            None
+        """
+        self.broker.unsubscribe(self)
+
+
+class Broker(ABC):
+    """
+    Publish/subscribe interface used to push events to connected clients.
+
+    publish() is called from synchronous code such as the notification fan-out, subscribe() from async
+    views. Multi-process deployments need a backend shared between processes, selected with
+    settings.EVENT_BROKER.
+    """
+
+    @abstractmethod
+    def publish(self, channel, message):
+        """
+        Send a message to every subscriber of a channel.
+
+        Args:
+            channel (str): The channel.
+            message (dict): JSON-serializable message.
+
+        Returns:
+            None
+        """
+
+    @abstractmethod
+    def subscribe(self, channel):
+        """
+        Subscribe the running event loop to a channel.
+
+        Args:
+            channel (str): The channel.
+
+        Returns:
+            Subscription: The subscription, close it when the client disconnects.
+        """
+
+    @abstractmethod
+    def unsubscribe(self, subscription):
+        """
+        Remove a subscription.
+
+        Args:
+            subscription (Subscription): The subscription.
+
+        Returns:
+            None
+        """
+
+
+class InProcessBroker(Broker):
+    """
+    Broker delivering messages to subscribers in the current process only.
+
+    Suitable when the publisher runs in the same process as the ASGI server, for example with
+    BACKGROUND_TASKS_EAGER, or as the local half of a shared broker.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty subscriber registry.
+
+        Returns:
+            None
+        """
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        """
+        Subscribe the running event loop to a channel.
+
+        Args:
+            channel (str): The channel.
+
+        Returns:
+            Subscription: The subscription.
+        """
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Remove a subscription.
+
+        Args:
+            subscription (Subscription): The subscription.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def publish(self, channel, message):
+        """
+        Send a message to the local subscribers of a channel, safe to call from any thread.
+
+        Args:
+            channel (str): The channel.
+            message (dict): The message.
+
+        Returns:
+            None
+        """
+        self.deliver(channel, message)
+
+    def deliver(self, channel, message):
+        """
+        Hand a message to the event loops of the local subscribers.
+
+        Args:
+            channel (str): The channel.
+            message (dict): The message.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, message)
+            except RuntimeError:
+                # The subscriber's event loop is closed.
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self):
+        """
+        Count the local subscriptions.
+
+        Returns:
+            int: Number of open subscriptions.
+        """
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Broker sharing messages between processes through Redis pub/sub.
+
+    Messages are published to Redis. Each process keeps one pattern subscription per event loop and hands
+    the messages to its local subscribers, so open connections do not each hold a Redis connection.
+    Requires settings.REDIS_URL.
+    """
+
+    def __init__(self):
+        """
+        Initialize the broker and its Redis client.
+
+        Returns:
+            None
+        """
+        super().__init__()
+        self.prefix = settings.EVENT_CHANNEL_PREFIX
+        self._client = redis.Redis.from_url(settings.REDIS_URL)
+        self._listeners = {}
+
+    def publish(self, channel, message):
+        """
+        Publish a message to Redis.
+
+        Args:
+            channel (str): The channel.
+            message (dict): JSON-serializable message.
+
+        Returns:
+            None
+        """
+        self._client.publish(self.prefix + channel, json.dumps(message))
+
+    def subscribe(self, channel):
+        """
+        Subscribe the running event loop to a channel, starting its Redis listener if needed.
+
+        Args:
+            channel (str): The channel.
+
+        Returns:
+            Subscription: The subscription.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._listeners or self._listeners[loop].done():
+                self._listeners[loop] = loop.create_task(self.listen())
+        return super().subscribe(channel)
+
+    async def listen(self):
+        """
+        Forward messages from Redis to the local subscribers.
+
+        Returns:
+            None
+        """
+        client = redis.asyncio.Redis.from_url(settings.REDIS_URL)
+        pubsub = client.pubsub()
+        await pubsub.psubscribe(f"{self.prefix}*")
+        try:
+            async for item in pubsub.listen():
+                if item["type"] == "pmessage":
+                    channel = item["channel"].decode().removeprefix(self.prefix)
+                    self.deliver(channel, json.loads(item["data"]))
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    Return the process-wide broker configured in settings.EVENT_BROKER.
+
+    Returns:
+        Broker: The broker.
+
+    Example:
+        get_broker().publish("notifications:42", {"id": 7})
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.EVENT_BROKER)()
+        return _broker
@@ -0,0 +1,209 @@
+import math
+
+from PIL import Image, ImageOps
+
+# URL format name -> Pillow format name
+IMAGE_FORMATS = {
+    "webp": "WEBP",
+    "jpeg": "JPEG",
+    "png": "PNG",
+}
+BLURHASH_CHARACTERS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+# Images are shrunk to this size before the placeholder is computed.
+PLACEHOLDER_SAMPLE_SIZE = (32, 32)
+# Modes reduce() works on, other images (palette, 1-bit, 16-bit) are converted to RGBA first.
+REDUCE_MODES = ("RGB", "RGBA", "L", "LA", "CMYK")
+
+
+def downscale(img, size):
+    """
+    Cheaply shrink an image close to the target size before the final resample.
+
+    JPEG images are decoded at a reduced scale with draft(), other formats are shrunk by an integer
+    factor with reduce(), which is much faster than resampling the full-size image. Images in a mode
+    reduce() does not support are converted to RGBA before they are shrunk.
+
+    Args:
+        img (Image.Image): The opened image.
+        size (tuple): Target width and height.
+
+    Returns:
+        Image.Image: An image at least as large as the target size.
+
+    Example:
+        downscale(Image.open(path), (120, 170))
+    """
+    width, height = size
+    img.draft("RGB", (width, height))
+    factor = min(img.width // width, img.height // height)
+    if factor >= 2:
+        if img.mode not in REDUCE_MODES:
+            img = img.convert("RGBA")
+        img = img.reduce(factor)
+    return img
+
+
+def render_variant(source, size, crop, image_format):
+    """
+    Render a resized copy of an image.
+
+    Args:
+        source (File): The source image file.
+        size (tuple): Target width and height.
+        crop (bool): Crop to fill the size exactly, otherwise fit inside it keeping the aspect ratio.
+        image_format (str): Key of IMAGE_FORMATS.
+
+    Returns:
+        Image.Image: The rendered image, converted to a mode the format can store.
+
+    Example:
+        render_variant(manga.avatar, (240, 340), True, "webp")
+    """
+    with Image.open(source) as img:
+        img = downscale(img, size)
+        if crop:
+            img = ImageOps.fit(img, size)
+        else:
+            img = img.copy()
+            img.thumbnail(size)
+    pillow_format = IMAGE_FORMATS[image_format]
+    if pillow_format == "JPEG" and img.mode != "RGB":
+        img = img.convert("RGB")
+    elif img.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+        img = img.convert("RGBA")
+    return img
+
+
+def srgb_to_linear(value):
+    """
+    Convert an sRGB channel value to linear light.
+
+    Args:
+        value (int): Channel value from 0 to 255.
+
+    Returns:
+        float: Linear value from 0 to 1.
+    """
+    value = value / 255
+    if value <= 0.04045:
+        return value / 12.92
+    return ((value + 0.055) / 1.055) ** 2.4
+
+
+def linear_to_srgb(value):
+    """
+    Convert a linear light value to an sRGB channel value.
+
+    Args:
+        value (float): Linear value, clamped to 0..1.
+
+    Returns:
+        int: Channel value from 0 to 255.
+    """
+    value = max(0.0, min(1.0, value))
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def encode_base83(value, length):
+    """
+    Encode an integer with the blurhash base 83 alphabet.
+
+    Args:
+        value (int): The value to encode.
+        length (int): Number of characters.
+
+    Returns:
+        str: The encoded value.
+    """
+    return "".join(BLURHASH_CHARACTERS[value // 83 ** (length - i) % 83] for i in range(1, length + 1))
+
+
+def blurhash(img, x_components=3, y_components=3):
+    """
+    Encode an image as a blurhash string.
+
+    With the default 3x3 components the hash is 22 characters long.
+
+    Args:
+        img (Image.Image): The image, ideally already small.
+        x_components (int): Horizontal components, 1 to 9.
+        y_components (int): Vertical components, 1 to 9.
+
+    Returns:
+        str: The blurhash.
+
+    Example:
+        blurhash(Image.open(path).resize((32, 32)))
+    """
+    img = img.convert("RGB")
+    width, height = img.size
+    pixels = [tuple(srgb_to_linear(channel) for channel in pixel) for pixel in img.getdata()]
+    factors = []
+    for j in range(y_components):
+        cos_y = [math.cos(math.pi * j * y / height) for y in range(height)]
+        for i in range(x_components):
+            cos_x = [math.cos(math.pi * i * x / width) for x in range(width)]
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                for x in range(width):
+                    basis = cos_x[x] * cos_y[y]
+                    pixel = pixels[row + x]
+                    r += basis * pixel[0]
+                    g += basis * pixel[1]
+                    b += basis * pixel[2]
+            scale = (1 if i == 0 and j == 0 else 2) / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = encode_base83(x_components - 1 + (y_components - 1) * 9, 1)
+    if ac:
+        quantised_max = max(0, min(82, int(max(abs(c) for factor in ac for c in factor) * 166 - 0.5)))
+        maximum = (quantised_max + 1) / 166
+    else:
+        quantised_max, maximum = 0, 1
+    result += encode_base83(quantised_max, 1)
+    result += encode_base83((linear_to_srgb(dc[0]) << 16) + (linear_to_srgb(dc[1]) << 8) + linear_to_srgb(dc[2]), 4)
+    for factor in ac:
+        quantised = [max(0, min(18, int(math.copysign(abs(c / maximum) ** 0.5, c) * 9 + 9.5))) for c in factor]
+        result += encode_base83(quantised[0] * 19 * 19 + quantised[1] * 19 + quantised[2], 2)
+    return result
+
+
+def dominant_color(img):
+    """
+    Find the most common color of an image.
+
+    Args:
+        img (Image.Image): The image, ideally already small.
+
+    Returns:
+        str: Hex color such as ``#a1b2c3``.
+
+    Example:
+        dominant_color(Image.open(path).resize((32, 32)))
+    """
+    quantized = img.convert("RGB").quantize(colors=5)
+    _, index = max(quantized.getcolors())
+    r, g, b = quantized.getpalette()[index * 3 : index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def image_placeholder(img):
+    """
+    Compute the low-quality placeholder of an image.
+
+    Args:
+        img (Image.Image): The image.
+
+    Returns:
+        tuple: (dominant color, blurhash)
+
+    Example:
+        image_placeholder(Image.open(path))
+    """
+    sample = img.convert("RGB")
+    sample.thumbnail(PLACEHOLDER_SAMPLE_SIZE)
+    return dominant_color(sample), blurhash(sample)
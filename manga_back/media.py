@@ -0,0 +1,200 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.decorators.http import require_http_methods
+
+from manga.storage import is_sharded_name
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+def media_etag(path, name, stat):
+    """
+    Build the entity tag of a media file.
+
+    Hashed names already identify their content, other files are tagged by modification time and size.
+
+    Args:
+        path (str): Absolute file path.
+        name (str): Name relative to MEDIA_ROOT.
+        stat (os.stat_result): File status.
+
+    Returns:
+        str: Quoted entity tag.
+
+    Example:
+        media_etag("/srv/media/a.png", "a.png", os.stat("/srv/media/a.png"))
+    """
+    if is_sharded_name(name):
+        return f'"{os.path.splitext(os.path.basename(path))[0]}"'
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def media_cache_control(name):
+    """
+    Return the Cache-Control value for a media file.
+
+    Args:
+        name (str): Name relative to MEDIA_ROOT.
+
+    Returns:
+        str: Cache-Control header value.
+    """
+    if is_sharded_name(name):
+        return f"public, max-age={settings.MEDIA_IMMUTABLE_MAX_AGE}, immutable"
+    return f"public, max-age={settings.MEDIA_MAX_AGE}"
+
+
+def parse_range(header, size):
+    """
+    Parse a single byte range of a Range header.
+
+    Args:
+        header (str): Range header value.
+        size (int): File size in bytes.
+
+    Returns:
+        tuple or None: (start, end) inclusive, None if the header is not a single byte range.
+
+    Raises:
+        ValueError: If the range cannot be satisfied.
+
+    Example:
+        parse_range("bytes=0-99", 1000)
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        length = int(end)
+        if length == 0:
+            raise ValueError("Empty suffix range.")
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable.")
+    return start, end
+
+
+def file_range_iterator(path, start, length):
+    """
+    Yield a byte range of a file in chunks.
+
+    Args:
+        path (str): Absolute file path.
+        start (int): Offset of the first byte.
+        length (int): Number of bytes to read.
+
+    Yields:
+        bytes: File chunks.
+    """
+    with open(path, "rb") as media_file:
+        media_file.seek(start)
+        while length > 0:
+            chunk = media_file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+@require_http_methods(["GET", "HEAD"])
+def serve_media(request, path):
+    """
+    Serve a file from MEDIA_ROOT or hand it off to the front proxy.
+
+    With MEDIA_SERVE_MODE set to "x-accel-redirect" or "x-sendfile" the response only carries the header
+    telling nginx or Apache which file to send. In "direct" mode the file is streamed by Django with
+    support for If-None-Match and single byte Range requests. Hashed names are cached as immutable.
+
+    Args:
+        request: The HTTP request object.
+        path (str): Name relative to MEDIA_ROOT.
+
+    Returns:
+        HttpResponse: The file, a partial file, 304, 416 or a proxy hand-off response.
+
+    Raises:
+        Http404: If the file does not exist or the path leaves MEDIA_ROOT.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation as e:
+        raise Http404("File not found.") from e
+    return media_file_response(request, full_path, path)
+
+
+def media_file_response(request, full_path, path, cache_control=None):
+    """
+    Build the response for a file stored below MEDIA_ROOT.
+
+    Args:
+        request: The HTTP request object.
+        full_path (str): Absolute file path.
+        path (str): Name relative to MEDIA_ROOT.
+        cache_control (str, optional): Cache-Control value overriding the one derived from the name.
+
+    Returns:
+        HttpResponse: The file, a partial file, 304, 416 or a proxy hand-off response.
+
+    Raises:
+        Http404: If the file does not exist.
+    """
+    try:
+        stat = os.stat(full_path)
+    except OSError as e:
+        raise Http404("File not found.") from e
+    if not os.path.isfile(full_path):
+        raise Http404("File not found.")
+
+    etag = media_etag(full_path, path, stat)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control or media_cache_control(path),
+        "Last-Modified": http_date(stat.st_mtime),
+        "Accept-Ranges": "bytes",
+    }
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and (
+        if_none_match.strip() == "*" or etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    ):
+        return HttpResponseNotModified(headers=headers)
+
+    content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    mode = settings.MEDIA_SERVE_MODE
+    if mode == "x-accel-redirect":
+        headers["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path)
+        return HttpResponse(content_type=content_type, headers=headers)
+    if mode == "x-sendfile":
+        headers["X-Sendfile"] = full_path
+        return HttpResponse(content_type=content_type, headers=headers)
+
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{stat.st_size}"
+            return HttpResponse(status=416, headers=headers)
+        if byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            headers["Content-Length"] = str(length)
+            body = file_range_iterator(full_path, start, length) if request.method == "GET" else []
+            return StreamingHttpResponse(body, status=206, content_type=content_type, headers=headers)
+
+    return FileResponse(open(full_path, "rb"), content_type=content_type, headers=headers)
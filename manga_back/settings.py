@@ -143,6 +143,78 @@ STATIC_URL = "static/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 MEDIA_URL = "/media/"
 
+# How media files are served: "direct" streams them from Django, "x-accel-redirect" (nginx)
+# and "x-sendfile" (Apache, lighttpd) hand the transfer off to the front proxy.
+MEDIA_SERVE_MODE = os.environ.get("MEDIA_SERVE_MODE", "direct")
+# nginx `internal` location that maps to MEDIA_ROOT, used with X-Accel-Redirect.
+MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+# Cache lifetime of media files, hashed file names never change and are cached as immutable.
+MEDIA_MAX_AGE = 60 * 60
+MEDIA_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+# On-demand image variants (`commn/images/<kind>/<lookup>/<preset>.<format>`).
+# Rendered files are kept below MEDIA_ROOT/IMAGE_VARIANT_CACHE_DIR, least recently used ones are
+# evicted when the cache grows past IMAGE_VARIANT_CACHE_MAX_BYTES.
+IMAGE_VARIANT_PRESETS = {
+    "cover-xs": {"size": (60, 85), "crop": True},
+    "cover-sm": {"size": (120, 170), "crop": True},
+    "cover-md": {"size": (240, 340), "crop": True},
+    "cover-lg": {"size": (480, 680), "crop": True},
+    "page-md": {"size": (720, 10000), "crop": False},
+    "avatar-sm": {"size": (64, 64), "crop": True},
+}
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_VARIANT_CACHE_DIR = "variants"
+IMAGE_VARIANT_CACHE_MAX_BYTES = 1024**3
+
+# Background tasks are queued in the database and run by `manage.py run_tasks`.
+# With BACKGROUND_TASKS_EAGER they run in the web process right after the transaction commits.
+BACKGROUND_TASKS_EAGER = False
+BACKGROUND_TASKS_MAX_ATTEMPTS = 5
+
+# "write" stores one Notification row per follower when a chapter is added (fan-out on write).
+# "read" stores only a per-user watermark and lists new chapters of followed manga at read time.
+NOTIFICATION_MODE = "write"
+# Rows per INSERT when new chapter notifications are fanned out to followers.
+NOTIFICATION_BATCH_SIZE = 1000
+# `manage.py prune_notifications` deletes read notifications after NOTIFICATION_RETENTION_DAYS and
+# collapses unread ones of the same manga older than NOTIFICATION_DIGEST_AFTER_DAYS into one digest row.
+NOTIFICATION_RETENTION_DAYS = 90
+NOTIFICATION_DIGEST_AFTER_DAYS = 1
+# Lifetime of the cached per-user unread counters. In "write" mode the fan-out and mark-as-read keep them
+# up to date, in "read" mode new chapters only show up in the badge once the counter expires.
+NOTIFICATION_UNREAD_COUNT_TIMEOUT = {"write": 60 * 60 * 24, "read": 60}
+
+# Reading positions are buffered in each process and written with one upsert at most this many seconds after
+# a page turn. With 0 every position is written right away.
+READING_PROGRESS_FLUSH_SECONDS = 5
+
+# The background worker updates cached counters and publishes events, so production needs a cache and
+# an event broker shared between processes.
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Live notifications (`auth/notifications/stream/`, served under ASGI) are published through this broker.
+# InProcessBroker only reaches clients connected to the publishing process, RedisBroker shares them.
+EVENT_BROKER = "manga_back.events.RedisBroker" if REDIS_URL else "manga_back.events.InProcessBroker"
+EVENT_CHANNEL_PREFIX = "manga:"
+# Messages kept per connection for slow clients, older ones are dropped.
+EVENT_QUEUE_SIZE = 100
+# Idle event streams send a comment this often so proxies do not close them.
+SSE_HEARTBEAT_SECONDS = 25
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -194,6 +266,14 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": ("dj_rest_auth.jwt_auth.JWTCookieAuthentication",),
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
     "DEFAULT_SCHEMA_CLASS": "rest_framework.schemas.coreapi.AutoSchema",
+    # Token bucket rates of the write endpoints (manga_back.throttling), "<scope>.user" per account and
+    # "<scope>.ip" per client address. Buckets live in the default cache, so processes share them with Redis.
+    "DEFAULT_THROTTLE_RATES": {
+        "comments.user": "10/min",
+        "comments.ip": "60/min",
+        "ratings.user": "30/min",
+        "ratings.ip": "120/min",
+    },
 }
 
 SIMPLE_JWT = {
@@ -0,0 +1,220 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory
+
+from manga.models import Category, Chapter, Manga
+from manga_back.throttling import TokenBucketThrottle, UserTokenBucketThrottle
+from users.models import CustomUser
+
+HASH = "ab" * 32
+THROTTLE_RATES = {"comments.user": "2/min", "comments.ip": "4/min"}
+
+
+class ServeMediaTest(TestCase):
+    """
+    Test suite for the media serving view.
+    """
+
+    def setUp(self):
+        """
+        Set up a temporary media root with a hashed and a legacy file.
+
+        Returns:
+            None
+        """
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_SERVE_MODE="direct")
+        self.settings_override.enable()
+        self.hashed_name = f"media/manga/pages/ab/ab/{HASH}.png"
+        self.content = bytes(range(256)) * 4
+        for name in (self.hashed_name, "legacy.png"):
+            path = os.path.join(self.media_root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as media_file:
+                media_file.write(self.content)
+
+    def tearDown(self):
+        """
+        Remove the temporary media root.
+
+        Returns:
+            None
+        """
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_hashed_file_is_immutable(self):
+        """
+        Test that hashed names are served with an immutable Cache-Control header and their hash as ETag.
+
+        Returns:
+            None
+        """
+        response = self.client.get(f"/media/{self.hashed_name}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(response["ETag"], f'"{HASH}"')
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_legacy_file_is_not_immutable(self):
+        """
+        Test that legacy names get a short Cache-Control lifetime.
+
+        Returns:
+            None
+        """
+        response = self.client.get("/media/legacy.png")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("immutable", response["Cache-Control"])
+
+    def test_if_none_match(self):
+        """
+        Test that a matching If-None-Match header returns 304.
+
+        Returns:
+            None
+        """
+        response = self.client.get(f"/media/{self.hashed_name}", headers={"If-None-Match": f'W/"{HASH}"'})
+        self.assertEqual(response.status_code, 304)
+
+    def test_range_request(self):
+        """
+        Test that single byte ranges are served as partial content.
+
+        Returns:
+            None
+        """
+        response = self.client.get("/media/legacy.png", headers={"Range": "bytes=10-19"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), self.content[10:20])
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(self.content)}")
+
+        response = self.client.get("/media/legacy.png", headers={"Range": "bytes=-5"})
+        self.assertEqual(b"".join(response.streaming_content), self.content[-5:])
+
+    def test_unsatisfiable_range(self):
+        """
+        Test that a range past the end of the file returns 416.
+
+        Returns:
+            None
+        """
+        response = self.client.get("/media/legacy.png", headers={"Range": "bytes=5000-"})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.content)}")
+
+    @override_settings(MEDIA_SERVE_MODE="x-accel-redirect")
+    def test_x_accel_redirect(self):
+        """
+        Test that nginx mode only returns the X-Accel-Redirect header.
+
+        Returns:
+            None
+        """
+        response = self.client.get(f"/media/{self.hashed_name}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.hashed_name}")
+        self.assertEqual(response.content, b"")
+
+    @override_settings(MEDIA_SERVE_MODE="x-sendfile")
+    def test_x_sendfile(self):
+        """
+        Test that Apache mode returns the absolute path in X-Sendfile.
+
+        Returns:
+            None
+        """
+        response = self.client.get("/media/legacy.png")
+        self.assertEqual(response["X-Sendfile"], os.path.join(self.media_root, "legacy.png"))
+
+    def test_missing_and_outside_files(self):
+        """
+        Test that missing files and paths outside MEDIA_ROOT return 404.
+
+        Returns:
+            None
+        """
+        self.assertEqual(self.client.get("/media/missing.png").status_code, 404)
+        self.assertEqual(self.client.get("/media/../manage.py").status_code, 404)
+        self.assertEqual(self.client.get("/media/media/").status_code, 404)
+
+
+@override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": THROTTLE_RATES})
+class TokenBucketThrottleTest(TestCase):
+    """
+    Test suite for the token bucket throttles of the write endpoints.
+    """
+
+    def setUp(self):
+        """
+        Set up a chapter, two users and empty buckets.
+
+        Returns:
+            None
+        """
+        cache.clear()
+        category = Category.objects.create(category_name="Manga")
+        manga = Manga.objects.create(
+            category=category, name_manga="Manga", english_only_field="manga", review="Review", slug="manga"
+        )
+        self.chapter = Chapter.objects.create(manga=manga, chapter_number=1, volume=1)
+        self.users = [CustomUser.objects.create(username=name, slug=name) for name in ("first", "second")]
+
+    def test_bucket_refills_over_the_period(self):
+        """
+        Test that an empty bucket gets a token back after a period divided by the capacity.
+
+        Returns:
+            None
+        """
+        clock = [1000.0]
+        throttle_class = type("ClockThrottle", (UserTokenBucketThrottle,), {"timer": lambda self: clock[0]})
+        request = APIRequestFactory().post("/")
+        request.user = self.users[0]
+        view = type("View", (), {"throttle_scope": "comments"})()
+
+        self.assertEqual([throttle_class().allow_request(request, view) for _ in range(3)], [True, True, False])
+        throttle = throttle_class()
+        clock[0] += 20
+        self.assertFalse(throttle.allow_request(request, view))
+        self.assertAlmostEqual(throttle.wait(), 10)
+        clock[0] += 10
+        self.assertTrue(throttle_class().allow_request(request, view))
+
+    def test_throttle_without_client_ident_cannot_be_created(self):
+        """
+        Test that a token bucket throttle that does not identify the client fails when it is created.
+
+        Returns:
+            None
+        """
+        with self.assertRaises(TypeError):
+            TokenBucketThrottle()
+
+    def test_comments_are_throttled_per_user_and_ip(self):
+        """
+        Test that comment writes get status 429 once the user's or the address's bucket is empty.
+
+        Returns:
+            None
+        """
+        client = APIClient()
+        url = f"/api/v1/chapters/{self.chapter.slug}/add_comment_to_chapter/"
+        client.force_authenticate(self.users[0])
+        statuses = [client.post(url, {"content": "Comment"}, format="json").status_code for _ in range(3)]
+        self.assertEqual(statuses, [201, 201, 429])
+        self.assertEqual(client.get("/commn/comments/").status_code, 200)
+
+        # The rejected request took a token from the address's bucket as well.
+        client.force_authenticate(self.users[1])
+        data = {"chapter": self.chapter.pk, "content": "Comment"}
+        self.assertEqual(client.post("/commn/comments/", data, format="json").status_code, 201)
+        response = client.post("/commn/comments/", data, format="json")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
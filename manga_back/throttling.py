@@ -0,0 +1,140 @@
+import math
+import time
+from abc import ABC, abstractmethod
+
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 60 * 60 * 24}
+
+
+def parse_rate(rate):
+    """
+    Parse a rate in the DRF notation.
+
+    Args:
+        rate (str): Requests per period, e.g. "10/min" or "100/day".
+
+    Returns:
+        tuple: Bucket capacity and the period in seconds it takes to refill.
+
+    Example:
+        parse_rate("10/min") == (10, 60)
+    """
+    requests, period = rate.split("/")
+    return int(requests), PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle, ABC):
+    """
+    Token bucket throttle of unsafe requests, backed by the default cache.
+
+    Every client has a bucket of `capacity` tokens that refills evenly over the period of the rate, each
+    request takes one token. The bucket is stored as one (tokens, updated) entry, so a check costs one
+    cache get and, when allowed, one cache set whatever the rate, unlike the request history kept by DRF's
+    SimpleRateThrottle. Entries expire once the bucket would be full again.
+
+    The rate is looked up in DEFAULT_THROTTLE_RATES under "<view.throttle_scope>.<kind>"; views without
+    a scope or scopes without a rate are not throttled. Concurrent requests of one client may read the
+    same bucket, so a burst can exceed the capacity by the number of parallel workers.
+    """
+
+    kind = None
+    cache = cache
+    timer = time.time
+
+    @abstractmethod
+    def get_cache_ident(self, request):
+        """
+        Identify the client whose bucket is used.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            str or None: The client identifier, None to skip the throttle.
+        """
+
+    def allow_request(self, request, view):
+        """
+        Take a token from the client's bucket.
+
+        Args:
+            request: The HTTP request object.
+            view: The view handling the request.
+
+        Returns:
+            bool: False if the bucket is empty.
+        """
+        if request.method in SAFE_METHODS:
+            return True
+        scope = getattr(view, "throttle_scope", None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f"{scope}.{self.kind}")
+        ident = self.get_cache_ident(request)
+        if rate is None or ident is None:
+            return True
+        capacity, period = parse_rate(rate)
+        refill = capacity / period
+        key = f"throttle:{scope}:{self.kind}:{ident}"
+        now = self.timer()
+        tokens, updated = self.cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill)
+        if tokens < 1:
+            self.wait_seconds = (1 - tokens) / refill
+            return False
+        self.cache.set(key, (tokens - 1, now), math.ceil(period))
+        return True
+
+    def wait(self):
+        """
+        Seconds until the next token, sent in the Retry-After header.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        return self.wait_seconds
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Token bucket per authenticated user, anonymous requests are left to IPTokenBucketThrottle.
+    """
+
+    kind = "user"
+
+    def get_cache_ident(self, request):
+        """
+        Identify the client by the user ID.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            str or None: The user ID, None for anonymous requests.
+        """
+        return str(request.user.pk) if request.user and request.user.is_authenticated else None
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Token bucket per client IP address, shared by every account using it.
+    """
+
+    kind = "ip"
+
+    def get_cache_ident(self, request):
+        """
+        Identify the client by its IP address, honouring NUM_PROXIES like DRF's throttles.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            str: The IP address.
+        """
+        return self.get_ident(request)
+
+
+WRITE_THROTTLES = [UserTokenBucketThrottle, IPTokenBucketThrottle]
@@ -16,23 +16,22 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+import re
+
 from debug_toolbar.toolbar import debug_toolbar_urls
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 
 import common.urls
 import manga.urls
 import users.urls
+from manga_back.media import serve_media
 
-urlpatterns = (
-    [
-        path("admin/", admin.site.urls),
-        path("api/v1/", include(manga.urls)),
-        path("auth/", include(users.urls)),
-        path("commn/", include(common.urls)),
-    ]
-    + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    + debug_toolbar_urls()
-)
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path("api/v1/", include(manga.urls)),
+    path("auth/", include(users.urls)),
+    path("commn/", include(common.urls)),
+    re_path(rf"^{re.escape(settings.MEDIA_URL.lstrip('/'))}(?P<path>.*)$", serve_media, name="media"),
+] + debug_toolbar_urls()
@@ -1,7 +1,9 @@
 from django.contrib import admin
 
-from .models import CustomUser, MangaList, Notification
+from .models import CustomUser, MangaList, Notification, NotificationWatermark, ReadingProgress
 
 admin.site.register(CustomUser)
 admin.site.register(MangaList)
 admin.site.register(Notification)
+admin.site.register(NotificationWatermark)
+admin.site.register(ReadingProgress)
@@ -0,0 +1,113 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from manga.models import Category, Chapter, Manga
+from users.models import CustomUser, MangaList, Notification
+from users.service.service_notifications import followed_chapters, notify_chapter_followers
+
+
+class Command(BaseCommand):
+    """
+    Management command that measures the new chapter notification fan-out for synthetic followers.
+
+    It also compares reading one follower's unread list from Notification rows ("write" mode) with
+    computing it from the watermark ("read" mode).
+
+    All data is created inside a transaction that is rolled back, so the command can be run against
+    a development database without leaving rows behind.
+    """
+
+    help = "Benchmark new chapter notification fan-out at the given follower counts."
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments.
+
+        Args:
+            parser: The argument parser.
+
+        Returns:
+            None
+        """
+        parser.add_argument(
+            "--followers", type=int, nargs="+", default=[10_000, 100_000], help="Follower counts to measure."
+        )
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows per INSERT.")
+        parser.add_argument(
+            "--legacy", action="store_true", help="Also time one Notification.objects.create per follower."
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the benchmark for every follower count.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Returns:
+            None
+        """
+        for followers in options["followers"]:
+            with transaction.atomic():
+                self.benchmark(followers, options["batch_size"], options["legacy"])
+                transaction.set_rollback(True)
+
+    def benchmark(self, followers, batch_size, legacy):
+        """
+        Create a manga with the given number of followers and time the fan-out of one chapter.
+
+        Args:
+            followers (int): Number of followers.
+            batch_size (int or None): Rows per INSERT.
+            legacy (bool): Also time the per-row fan-out.
+
+        Returns:
+            None
+        """
+        category, _ = Category.objects.get_or_create(category_name="benchmark")
+        manga = Manga.objects.create(
+            category=category, name_manga="benchmark", english_only_field="benchmark-notifications", review="-"
+        )
+        users = CustomUser.objects.bulk_create(
+            [CustomUser(username=f"bench-{i}", slug=f"bench-{i}", password="!") for i in range(followers)],
+            batch_size=5000,
+        )
+        MangaList.objects.bulk_create(
+            [MangaList(user=user, manga=manga, name="Reading") for user in users], batch_size=5000
+        )
+
+        started = time.perf_counter()
+        chapter = Chapter.objects.create(manga=manga, chapter_number=1, volume=1)
+        saved = time.perf_counter() - started
+        started = time.perf_counter()
+        created = notify_chapter_followers(chapter.pk, manga.pk, batch_size)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{followers} followers: chapter saved in {saved * 1000:.1f} ms, "
+            f"bulk fan-out of {created} rows in {elapsed:.2f} s ({created / elapsed:.0f} rows/s)."
+        )
+
+        reader = users[0]
+        started = time.perf_counter()
+        list(Notification.objects.filter(user=reader, is_read=False).select_related("chapter"))
+        write_read = time.perf_counter() - started
+        started = time.perf_counter()
+        list(followed_chapters(reader, unread_only=True))
+        read_read = time.perf_counter() - started
+        self.stdout.write(
+            f"{followers} followers: unread list read in {write_read * 1000:.1f} ms from {created} notification rows "
+            f"(write mode), {read_read * 1000:.1f} ms from the watermark with no rows (read mode)."
+        )
+
+        if legacy:
+            chapter = Chapter.objects.create(manga=manga, chapter_number=2, volume=1)
+            started = time.perf_counter()
+            for user_id in MangaList.objects.filter(manga=manga).values_list("user", flat=True):
+                Notification.objects.create(user_id=user_id, chapter=chapter)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{followers} followers: per-row fan-out in {elapsed:.2f} s ({followers / elapsed:.0f} rows/s)."
+            )
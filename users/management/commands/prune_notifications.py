@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.service.service_notifications import compact_unread_notifications, delete_old_read_notifications
+
+
+class Command(BaseCommand):
+    """
+    Management command that deletes old read notifications and collapses old unread ones into digests.
+
+    Meant to run periodically, for example daily from cron.
+    """
+
+    help = "Delete old read notifications and collapse old unread notifications of the same manga."
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments.
+
+        Args:
+            parser: The argument parser.
+
+        Returns:
+            None
+        """
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=settings.NOTIFICATION_RETENTION_DAYS,
+            help="Delete read notifications older than this.",
+        )
+        parser.add_argument(
+            "--digest-after-days",
+            type=int,
+            default=settings.NOTIFICATION_DIGEST_AFTER_DAYS,
+            help="Collapse unread notifications older than this.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Rows or groups per transaction.")
+        parser.add_argument("--sleep", type=float, default=0.05, help="Seconds to pause between batches.")
+
+    def handle(self, *args, **options):
+        """
+        Run the retention and compaction passes.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Returns:
+            None
+        """
+        deleted = delete_old_read_notifications(options["retention_days"], options["batch_size"], options["sleep"])
+        collapsed = compact_unread_notifications(options["digest_after_days"], options["batch_size"], options["sleep"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} read notifications, collapsed {collapsed} unread notifications.")
+        )
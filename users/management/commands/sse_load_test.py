@@ -0,0 +1,148 @@
+import asyncio
+import resource
+import time
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from manga_back.events import get_broker
+from users.models import CustomUser
+from users.service.service_notifications import notification_channel
+
+STREAM_PATH = "/auth/notifications/stream/"
+
+
+class Command(BaseCommand):
+    """
+    Management command that holds many idle notification streams open against the ASGI application.
+
+    The connections are driven in-process through the ASGI interface, so the command measures the cost of
+    an open stream in Django and the broker (memory, connect time, delivery latency) without a network
+    server. Point a socket-level tool at uvicorn or daphne to include the server itself.
+    """
+
+    help = "Hold idle server-sent event connections open and measure memory and delivery latency."
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments.
+
+        Args:
+            parser: The argument parser.
+
+        Returns:
+            None
+        """
+        parser.add_argument("--connections", type=int, default=10_000, help="Number of idle connections.")
+        parser.add_argument("--hold", type=float, default=5.0, help="Seconds to keep the connections idle.")
+        parser.add_argument("--username", help="Existing user to connect as, a temporary user by default.")
+
+    def handle(self, *args, **options):
+        """
+        Open the connections, keep them idle, publish one notification and close them.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Returns:
+            None
+        """
+        temporary = options["username"] is None
+        if temporary:
+            user = CustomUser.objects.create(username="sse-load-test", slug="sse-load-test", password="!")
+        else:
+            user = CustomUser.objects.filter(username=options["username"]).first()
+            if user is None:
+                raise CommandError(f"User {options['username']} does not exist.")
+        try:
+            asyncio.run(self.run(user, options["connections"], options["hold"]))
+        finally:
+            if temporary:
+                user.delete()
+
+    async def run(self, user, connections, hold):
+        """
+        Drive the load test.
+
+        Args:
+            user (CustomUser): The user the streams belong to.
+            connections (int): Number of connections.
+            hold (float): Seconds to keep the connections idle.
+
+        Returns:
+            None
+        """
+        application = get_asgi_application()
+        headers = [(b"authorization", f"Bearer {AccessToken.for_user(user)}".encode())]
+        disconnect = asyncio.Event()
+        connected = asyncio.Semaphore(0)
+        delivered = asyncio.Semaphore(0)
+        statuses = []
+
+        async def connection(index):
+            received = [False]
+
+            async def receive():
+                if not received[0]:
+                    received[0] = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await disconnect.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+                    connected.release()
+                elif b"event: notification" in message.get("body", b""):
+                    delivered.release()
+
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": STREAM_PATH,
+                "raw_path": STREAM_PATH.encode(),
+                "root_path": "",
+                "query_string": b"",
+                "headers": headers,
+                # Not in INTERNAL_IPS, so the debug toolbar stays out of the measurement.
+                "client": ("10.0.0.2", 10_000 + index % 50_000),
+                "server": ("127.0.0.1", 8000),
+            }
+            await application(scope, receive, send)
+
+        memory_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(connection(index)) for index in range(connections)]
+        for _ in range(connections):
+            await connected.acquire()
+        connect_time = time.perf_counter() - started
+        failed = sum(status != 200 for status in statuses)
+        # Wait for the streams to subscribe before the first heartbeat.
+        broker = get_broker()
+        while getattr(broker, "subscriber_count", lambda: connections)() < connections - failed:
+            await asyncio.sleep(0.01)
+        memory_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.stdout.write(
+            f"{connections - failed} connections open in {connect_time:.2f} s, {failed} failed, "
+            f"~{(memory_after - memory_before) / max(connections, 1):.1f} KiB max RSS per connection."
+        )
+
+        await asyncio.sleep(hold)
+        started = time.perf_counter()
+        broker.publish(notification_channel(user.pk), {"id": 0, "chapter": None, "is_read": False})
+        for _ in range(connections - failed):
+            await delivered.acquire()
+        self.stdout.write(
+            f"Notification delivered to all streams in {(time.perf_counter() - started) * 1000:.1f} ms "
+            f"after {hold:.1f} s idle."
+        )
+
+        disconnect.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        remaining = getattr(broker, "subscriber_count", lambda: 0)()
+        self.stdout.write(self.style.SUCCESS(f"Closed all connections, {remaining} subscriptions left."))
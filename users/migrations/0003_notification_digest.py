@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manga", "0006_notification_watermark"),
+        ("users", "0002_notification_watermark"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="grouped_count",
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(fields=["is_read", "created_at"], name="notification_read_created_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manga", "0006_notification_watermark"),
+        ("users", "0003_notification_digest"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="mangalist",
+            index=models.Index(fields=["user", "name"], name="mangalist_user_name_idx"),
+        ),
+    ]
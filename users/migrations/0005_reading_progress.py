@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:21
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manga", "0006_notification_watermark"),
+        ("users", "0004_mangalist_user_name_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReadingProgress",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("page", models.PositiveIntegerField(default=1)),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("chapter", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="manga.chapter")),
+                ("manga", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="manga.manga")),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reading_progress",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["user", "-updated_at"], name="progress_user_updated_idx")],
+                "constraints": [models.UniqueConstraint(fields=("user", "manga"), name="unique_reading_progress")],
+            },
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import IntegrityError, models, transaction
+from django.utils import timezone
 from django.utils.text import slugify
 from rest_framework.exceptions import ValidationError
 
@@ -109,6 +110,10 @@ class MangaList(models.Model):
         """
 
         unique_together = ["user", "manga"]
+        indexes = [
+            # Lists are counted and paginated per (user, name).
+            models.Index(fields=["user", "name"], name="mangalist_user_name_idx"),
+        ]
 
     def __str__(self):
         """
@@ -128,12 +133,15 @@ class Notification(models.Model):
         chapter (Chapter): The chapter related to the notification.
         created_at (datetime): The date and time the notification was created.
         is_read (bool): Whether the notification has been read.
+        grouped_count (int): Number of new chapters of the manga this notification stands for,
+            more than one once older unread notifications were collapsed into it.
     """
 
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     chapter = models.ForeignKey("manga.Chapter", on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
+    grouped_count = models.PositiveIntegerField(default=1)
 
     class Meta:
         """
@@ -141,6 +149,9 @@ class Notification(models.Model):
         """
 
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["is_read", "created_at"], name="notification_read_created_idx"),
+        ]
 
     def __str__(self):
         """
@@ -153,3 +164,73 @@ class Notification(models.Model):
         return (f"Notification for {self.user.username}: {self.chapter.manga.name_manga} "
                 f"Chapter {self.chapter.chapter_number} ({status})")
 
+
+
+class NotificationWatermark(models.Model):
+    """
+    Model storing when a user last looked at their notifications, used when NOTIFICATION_MODE is "read".
+
+    In that mode no Notification rows are written. Chapters of followed manga created after the
+    watermark are the user's unread notifications.
+
+    Attributes:
+        user (CustomUser): The user.
+        seen_at (datetime): Chapters created up to this time count as read.
+    """
+
+    user = models.OneToOneField(
+        CustomUser, on_delete=models.CASCADE, primary_key=True, related_name="notification_watermark"
+    )
+    seen_at = models.DateTimeField()
+
+    def __str__(self):
+        """
+        String representation of the NotificationWatermark instance.
+
+        Returns:
+            str: A string containing the username and the watermark.
+        """
+        return f"{self.user.username} has seen notifications up to {self.seen_at}"
+
+
+class ReadingProgress(models.Model):
+    """
+    Model storing the last chapter and page a user read of a manga.
+
+    Written in batches from the in-process buffer in users.service.service_progress, not per page turn.
+
+    Attributes:
+        user (CustomUser): The reader.
+        manga (Manga): The manga being read.
+        chapter (Chapter): The last chapter read.
+        page (int): The last page read in the chapter.
+        updated_at (datetime): When the position was recorded.
+    """
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="reading_progress")
+    manga = models.ForeignKey(Manga, on_delete=models.CASCADE)
+    chapter = models.ForeignKey("manga.Chapter", on_delete=models.CASCADE)
+    page = models.PositiveIntegerField(default=1)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        """
+        Meta options for ReadingProgress model.
+        """
+
+        constraints = [
+            models.UniqueConstraint(fields=["user", "manga"], name="unique_reading_progress"),
+        ]
+        indexes = [
+            # "Continue reading" lists a user's positions, most recent first.
+            models.Index(fields=["user", "-updated_at"], name="progress_user_updated_idx"),
+        ]
+
+    def __str__(self):
+        """
+        String representation of the ReadingProgress instance.
+
+        Returns:
+            str: A string containing the username, manga, chapter and page.
+        """
+        return f"{self.user.username} read {self.manga.name_manga} up to {self.chapter} page {self.page}"
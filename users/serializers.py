@@ -1,12 +1,12 @@
 from dj_rest_auth.registration.serializers import RegisterSerializer
 from rest_framework import serializers
 
-from common.models import Comment
 from common.serializers import CommentUserPageSerializer
+from manga.models import Chapter
 from manga.serializers import ChapterNotificationSerializer, MangaListSerializer
 from users.models import GENDER_SELECTION, CustomUser
 
-from .models import Notification
+from .models import Notification, ReadingProgress
 
 
 class CustomRegisterSerializer(RegisterSerializer):
@@ -42,13 +42,16 @@ class CustomRegisterSerializer(RegisterSerializer):
 
 class CustomUserDetailsSerializer(serializers.ModelSerializer):
     """
-    Serializer for detailed user info including manga list and comments.
+    Serializer for detailed user info including a preview of the manga list and comments.
 
-    Serializes user fields, manga list, and comments via methods.
+    Serializes user fields, the latest manga list entries and comments with their totals. Expects users
+    from users.service.service.profile_queryset, the full lists are served by paginated endpoints.
     """
 
-    list_manga = MangaListSerializer(many=True, read_only=True)
-    comments = serializers.SerializerMethodField()
+    list_manga = MangaListSerializer(source="list_manga_preview", many=True, read_only=True)
+    list_manga_count = serializers.IntegerField(read_only=True)
+    comments = CommentUserPageSerializer(source="comments_preview", many=True, read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = CustomUser
@@ -60,22 +63,11 @@ class CustomUserDetailsSerializer(serializers.ModelSerializer):
             "gender",
             "get_avatar_url",
             "list_manga",
+            "list_manga_count",
             "comments",
+            "comments_count",
         )
 
-    def get_comments(self, obj):
-        """
-        Get comments for the user.
-
-        Args:
-            obj (CustomUser): User instance.
-
-        Returns:
-            list: List of serialized comments.
-        """
-        comments = Comment.objects.filter(user=obj)
-        return CommentUserPageSerializer(comments, many=True).data
-
 
 class CustomUserLastDetailsSerializer(serializers.ModelSerializer):
     """
@@ -144,4 +136,106 @@ class NotificationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Notification
-        fields = ("id", "chapter", "created_at", "is_read")
+        fields = ("id", "chapter", "created_at", "is_read", "grouped_count")
+
+
+class ChapterFeedNotificationSerializer(serializers.ModelSerializer):
+    """
+    Serializer rendering a chapter of a followed manga in the shape of NotificationSerializer.
+
+    Used when NOTIFICATION_MODE is "read" and notifications have no rows of their own, so id is null.
+    """
+
+    id = serializers.SerializerMethodField()
+    chapter = ChapterNotificationSerializer(source="*", read_only=True)
+    is_read = serializers.BooleanField(read_only=True)
+    grouped_count = serializers.IntegerField(default=1, read_only=True)
+
+    class Meta:
+        model = Chapter
+        fields = ("id", "chapter", "created_at", "is_read", "grouped_count")
+
+    def get_id(self, obj):
+        """
+        Return the notification ID, which does not exist in "read" mode.
+
+        Args:
+            obj (Chapter): Chapter instance.
+
+        Returns:
+            None
+        """
+        return None
+
+
+class NotificationBulkReadSerializer(serializers.Serializer):
+    """
+    Serializer validating a bulk mark-as-read request.
+
+    Exactly one of all, up_to_id and ids must be given.
+    """
+
+    all = serializers.BooleanField(required=False)
+    up_to_id = serializers.IntegerField(required=False, min_value=1)
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, max_length=1000)
+
+    def validate(self, attrs):
+        """
+        Check that exactly one selection was given.
+
+        Args:
+            attrs (dict): The validated fields.
+
+        Returns:
+            dict: The validated fields.
+
+        Raises:
+            serializers.ValidationError: If no selection or more than one was given.
+        """
+        selected = [name for name in ("all", "up_to_id", "ids") if attrs.get(name)]
+        if len(selected) != 1:
+            raise serializers.ValidationError("Provide exactly one of all, up_to_id or ids.")
+        return attrs
+
+
+class ReadingProgressUpdateSerializer(serializers.Serializer):
+    """
+    Serializer validating a reading position sent by the reader.
+
+    Serializes chapter (slug) and page fields.
+    """
+
+    chapter = serializers.SlugField()
+    page = serializers.IntegerField(min_value=1)
+
+
+class ReadingProgressSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the "continue reading" list.
+
+    Serializes the manga, the chapter and the page to continue from.
+    """
+
+    manga_name = serializers.CharField(source="manga.name_manga", read_only=True)
+    manga_url = serializers.CharField(source="manga.get_url", read_only=True)
+    thumbnail = serializers.CharField(source="manga.get_thumbnail_url", read_only=True)
+    dominant_color = serializers.CharField(source="manga.dominant_color", read_only=True)
+    blurhash = serializers.CharField(source="manga.blurhash", read_only=True)
+    chapter_slug = serializers.CharField(source="chapter.slug", read_only=True)
+    volume = serializers.IntegerField(source="chapter.volume", read_only=True)
+    chapter_number = serializers.IntegerField(source="chapter.chapter_number", read_only=True)
+
+    class Meta:
+        model = ReadingProgress
+        fields = (
+            "manga_name",
+            "manga_url",
+            "thumbnail",
+            "dominant_color",
+            "blurhash",
+            "chapter_slug",
+            "volume",
+            "chapter_number",
+            "page",
+            "updated_at",
+        )
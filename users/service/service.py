@@ -1,5 +1,14 @@
-from users.models import CustomUser, Notification
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+
+from common.models import Comment
+from manga.service.service import manga_card_fields
+from users.models import CustomUser, MangaList
 from users.serializers import CustomUserLastDetailsSerializer
+from users.service.service_notifications import followed_chapters, notification_list, notifications_read_mode
+
+# Entries of the manga list and comments embedded in a profile, the full lists have paginated endpoints.
+PROFILE_PREVIEW_SIZE = 10
 
 
 def extract_and_serialize_data_on_recent_users():
@@ -21,17 +30,96 @@ def get_notifications(user, unread_only: bool = False):
     """
     Return notifications for the specified user.
 
+    With NOTIFICATION_MODE set to "read" the notifications are the chapters of the user's followed
+    manga, annotated with is_read.
+
     Args:
         user (CustomUser): The user for whom to retrieve notifications.
         unread_only (bool, optional): If True, return only unread notifications. Defaults to False.
 
     Returns:
-        QuerySet: Notifications for the user.
+        QuerySet: Notifications (or chapters in "read" mode) for the user.
 
     Example:
         get_notifications(user, unread_only=True)
     """
-    if unread_only:
-        return Notification.objects.filter(user=user, is_read=False)
-    else:
-        return Notification.objects.filter(user=user)
+    if notifications_read_mode():
+        return followed_chapters(user, unread_only)
+    return notification_list(user, unread_only)
+
+
+def user_comments(user=None):
+    """
+    Retrieve the user's comments with the manga and chapter they belong to, newest first.
+
+    The manga and the chapter are joined, so a page of comments is one query over the (user, created_at)
+    index.
+
+    Args:
+        user (CustomUser, optional): The author, comments of every user when omitted (for prefetches).
+
+    Returns:
+        QuerySet: QuerySet of Comment objects.
+
+    Example:
+        user_comments(request.user)
+    """
+    comments = (
+        Comment.objects.select_related("manga", "chapter")
+        .only(
+            "id",
+            "content",
+            "created_at",
+            "user",
+            "manga",
+            "chapter",
+            "manga__name_manga",
+            "manga__slug",
+            "chapter__chapter_number",
+            "chapter__slug",
+        )
+        .order_by("-created_at", "-id")
+    )
+    return comments if user is None else comments.filter(user=user)
+
+
+def _related_count(queryset):
+    """
+    Build a subquery counting the rows of a queryset filtered by OuterRef("pk").
+
+    Args:
+        queryset (QuerySet): Rows of one user.
+
+    Returns:
+        Coalesce: The count, 0 when there are no rows.
+    """
+    counts = queryset.order_by().values("user").annotate(count=Count("pk")).values("count")
+    return Coalesce(Subquery(counts), 0)
+
+
+def profile_queryset():
+    """
+    Build the queryset of users rendered by CustomUserDetailsSerializer.
+
+    The users are annotated with the number of comments and manga list entries, and the latest
+    PROFILE_PREVIEW_SIZE of each are prefetched with their manga and chapters joined, so a profile costs
+    three queries however long the user's lists are.
+
+    Returns:
+        QuerySet: QuerySet of CustomUser objects.
+
+    Example:
+        profile_queryset().get(slug="reader")
+    """
+    list_manga = (
+        MangaList.objects.select_related("manga")
+        .only("id", "user", "name", *manga_card_fields("manga"))
+        .order_by("-id")
+    )
+    return CustomUser.objects.annotate(
+        comments_count=_related_count(Comment.objects.filter(user=OuterRef("pk"))),
+        list_manga_count=_related_count(MangaList.objects.filter(user=OuterRef("pk"))),
+    ).prefetch_related(
+        Prefetch("list_manga", queryset=list_manga[:PROFILE_PREVIEW_SIZE], to_attr="list_manga_preview"),
+        Prefetch("comment_set", queryset=user_comments()[:PROFILE_PREVIEW_SIZE], to_attr="comments_preview"),
+    )
@@ -0,0 +1,431 @@
+import json
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, Max, Q, Sum
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+
+from manga.models import Chapter
+from manga.serializers import ChapterNotificationSerializer
+from manga.service.service import manga_card_fields
+from manga_back.events import get_broker
+from users.models import MangaList, Notification, NotificationWatermark
+
+# Columns rendered by ChapterNotificationSerializer, the only ones loaded for notification lists.
+NOTIFICATION_CHAPTER_FIELDS = ("id", "manga", "volume", "chapter_number", "created_at", "slug")
+
+
+def notifications_read_mode():
+    """
+    Check whether notifications are computed at read time from per-user watermarks.
+
+    Returns:
+        bool: True if settings.NOTIFICATION_MODE is "read".
+    """
+    return settings.NOTIFICATION_MODE == "read"
+
+
+def notify_chapter_followers(chapter_id, manga_id, batch_size=None):
+    """
+    Create a notification about a new chapter for every user who has the manga in a list.
+
+    Followers are streamed in user ID order and inserted with one bulk_create per batch, each batch in
+    its own short transaction. Users who already have a notification for the chapter are skipped, so a
+    retried task continues where it stopped instead of notifying anyone twice. Each committed batch is
+    published to the followers' live notification streams.
+
+    Args:
+        chapter_id (int): The ID of the new chapter.
+        manga_id (int): The ID of the chapter's manga.
+        batch_size (int, optional): Rows per INSERT, defaults to settings.NOTIFICATION_BATCH_SIZE.
+
+    Returns:
+        int: Number of notifications created.
+
+    Example:
+        notify_chapter_followers(chapter.id, chapter.manga_id)
+    """
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    followers = MangaList.objects.filter(manga_id=manga_id).order_by("user_id").values_list("user_id", flat=True)
+    chapter = Chapter.objects.select_related("manga").filter(pk=chapter_id).first()
+    if chapter is None:
+        return 0
+    chapter_data = json.loads(json.dumps(ChapterNotificationSerializer(chapter).data, cls=JSONEncoder))
+    created = 0
+    batch = []
+    for user_id in followers.iterator(chunk_size=batch_size):
+        batch.append(user_id)
+        if len(batch) >= batch_size:
+            created += _create_notifications(chapter_data, chapter_id, batch)
+            batch = []
+    if batch:
+        created += _create_notifications(chapter_data, chapter_id, batch)
+    return created
+
+
+def _create_notifications(chapter_data, chapter_id, user_ids):
+    """
+    Insert the notifications of one batch of followers and publish them once committed.
+
+    Args:
+        chapter_data (dict): The serialized chapter sent with live notifications.
+        chapter_id (int): The ID of the chapter.
+        user_ids (list): Follower user IDs.
+
+    Returns:
+        int: Number of notifications created.
+    """
+    with transaction.atomic():
+        notified = set(
+            Notification.objects.filter(chapter_id=chapter_id, user_id__in=user_ids).values_list("user_id", flat=True)
+        )
+        notifications = [
+            Notification(user_id=user_id, chapter_id=chapter_id) for user_id in user_ids if user_id not in notified
+        ]
+        Notification.objects.bulk_create(notifications, batch_size=len(user_ids))
+        notified_ids = [notification.user_id for notification in notifications]
+        transaction.on_commit(lambda: adjust_unread_counts(notified_ids, 1))
+        transaction.on_commit(lambda: publish_notifications(notifications, chapter_data))
+    return len(notifications)
+
+
+def notification_list(user, unread_only=False):
+    """
+    List the user's notifications with everything NotificationSerializer renders.
+
+    The chapter and its manga are joined in the same query, so a page of notifications costs one query
+    whatever its size.
+
+    Args:
+        user (CustomUser): The user.
+        unread_only (bool, optional): Only return unread notifications.
+
+    Returns:
+        QuerySet: The notifications.
+
+    Example:
+        notification_list(request.user, unread_only=True)
+    """
+    notifications = Notification.objects.filter(user=user)
+    if unread_only:
+        notifications = notifications.filter(is_read=False)
+    return notifications.select_related("chapter__manga").only(
+        "id",
+        "created_at",
+        "is_read",
+        "grouped_count",
+        "chapter",
+        *(f"chapter__{field}" for field in NOTIFICATION_CHAPTER_FIELDS),
+        *manga_card_fields("chapter__manga"),
+    )
+
+
+def notification_channel(user_id):
+    """
+    Build the event channel name of a user's live notifications.
+
+    Args:
+        user_id (int): The user ID.
+
+    Returns:
+        str: The channel name.
+    """
+    return f"notifications:{user_id}"
+
+
+def publish_notifications(notifications, chapter_data):
+    """
+    Push new notifications to the users' open event streams.
+
+    The message has the shape of NotificationSerializer.
+
+    Args:
+        notifications (list): Created Notification instances.
+        chapter_data (dict): The serialized chapter.
+
+    Returns:
+        None
+    """
+    broker = get_broker()
+    for notification in notifications:
+        broker.publish(
+            notification_channel(notification.user_id),
+            {
+                "id": notification.pk,
+                "chapter": chapter_data,
+                "created_at": notification.created_at.isoformat(),
+                "is_read": False,
+            },
+        )
+
+
+def get_watermark(user):
+    """
+    Return the time up to which the user has seen new chapters.
+
+    Users who never opened their notifications have seen everything up to their registration.
+
+    Args:
+        user (CustomUser): The user.
+
+    Returns:
+        datetime: The watermark.
+    """
+    seen_at = NotificationWatermark.objects.filter(user=user).values_list("seen_at", flat=True).first()
+    return seen_at or user.date_joined
+
+
+def followed_chapters(user, unread_only=False):
+    """
+    List the chapters of the user's followed manga as notifications, newest first.
+
+    Used in the "read" notification mode. Each chapter is annotated with is_read, which is True if it
+    was created before the user's watermark. Like notification_list, only the rendered columns are loaded.
+
+    Args:
+        user (CustomUser): The user.
+        unread_only (bool, optional): Only return chapters created after the watermark.
+
+    Returns:
+        QuerySet: Chapters annotated with is_read.
+
+    Example:
+        followed_chapters(request.user, unread_only=True)
+    """
+    watermark = get_watermark(user)
+    chapters = Chapter.objects.filter(
+        manga__in=MangaList.objects.filter(user=user).values("manga_id"), created_at__gt=user.date_joined
+    )
+    if unread_only:
+        chapters = chapters.filter(created_at__gt=watermark)
+    return (
+        chapters.select_related("manga")
+        .only(*NOTIFICATION_CHAPTER_FIELDS, *manga_card_fields("manga"))
+        .annotate(is_read=ExpressionWrapper(Q(created_at__lte=watermark), output_field=BooleanField()))
+        .order_by("-created_at")
+    )
+
+
+def mark_notifications_seen(user, seen_at=None):
+    """
+    Mark every notification of the user up to the given time as read.
+
+    In the "read" mode the watermark is moved forward, it never moves back. In the "write" mode the
+    unread Notification rows created up to that time are updated.
+
+    Args:
+        user (CustomUser): The user.
+        seen_at (datetime, optional): Defaults to now.
+
+    Returns:
+        None
+
+    Example:
+        mark_notifications_seen(request.user)
+    """
+    seen_at = seen_at or timezone.now()
+    if not notifications_read_mode():
+        mark_notifications_read(user, Q(created_at__lte=seen_at))
+        return
+    updated = NotificationWatermark.objects.filter(user=user, seen_at__lt=seen_at).update(seen_at=seen_at)
+    if not updated:
+        NotificationWatermark.objects.get_or_create(user=user, defaults={"seen_at": seen_at})
+    cache.delete(unread_count_key(user.pk))
+
+
+def mark_notifications_read(user, condition=None):
+    """
+    Mark the user's unread notifications matching a condition as read with a single UPDATE.
+
+    Args:
+        user (CustomUser): The user.
+        condition (Q, optional): Further filter on the notifications, all unread ones by default.
+
+    Returns:
+        int: Number of notifications marked as read.
+
+    Example:
+        mark_notifications_read(request.user, Q(id__lte=120))
+    """
+    notifications = Notification.objects.filter(user=user, is_read=False)
+    if condition is not None:
+        notifications = notifications.filter(condition)
+    read = notifications.update(is_read=True)
+    adjust_unread_counts([user.pk], -read)
+    return read
+
+
+def unread_count_key(user_id):
+    """
+    Build the cache key of a user's unread notification counter.
+
+    Args:
+        user_id (int): The user ID.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"notifications:unread:{user_id}"
+
+
+def unread_notification_count(user):
+    """
+    Return the number of unread notifications of the user from the cached counter.
+
+    The counter is computed with one COUNT query when it is not cached and then kept up to date by the
+    fan-out and mark-as-read, so polling it only reads the cache.
+
+    Args:
+        user (CustomUser): The user.
+
+    Returns:
+        int: Number of unread notifications.
+
+    Example:
+        unread_notification_count(request.user)
+    """
+    key = unread_count_key(user.pk)
+    count = cache.get(key)
+    if count is None:
+        if notifications_read_mode():
+            count = followed_chapters(user, unread_only=True).count()
+        else:
+            count = Notification.objects.filter(user=user, is_read=False).count()
+        cache.add(key, count, settings.NOTIFICATION_UNREAD_COUNT_TIMEOUT[settings.NOTIFICATION_MODE])
+    return max(count, 0)
+
+
+def adjust_unread_counts(user_ids, delta):
+    """
+    Add to the cached unread counters of the given users.
+
+    Counters that are not cached are left alone, they are computed on the next read.
+
+    Args:
+        user_ids (list): User IDs.
+        delta (int): Amount to add, negative when notifications are read.
+
+    Returns:
+        None
+
+    Example:
+        adjust_unread_counts([user.pk], -1)
+    """
+    if not delta:
+        return
+    for user_id in user_ids:
+        try:
+            cache.incr(unread_count_key(user_id), delta)
+        except ValueError:
+            pass
+
+
+async def notification_events(user_id, heartbeat):
+    """
+    Yield a user's live notifications as server-sent events.
+
+    A comment is sent when no notification arrived within the heartbeat interval. The subscription is
+    closed when the client disconnects.
+
+    Args:
+        user_id (int): The user ID.
+        heartbeat (float): Seconds between keep-alive comments.
+
+    Yields:
+        str: Server-sent event frames.
+    """
+    subscription = get_broker().subscribe(notification_channel(user_id))
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            message = await subscription.get(heartbeat)
+            if message is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"id: {message['id']}\nevent: notification\ndata: {json.dumps(message)}\n\n"
+    finally:
+        subscription.close()
+
+
+def delete_old_read_notifications(days, batch_size, pause=0):
+    """
+    Delete read notifications older than the given age in bounded batches.
+
+    Each batch is a short DELETE by primary key in its own transaction, so SQLite's write lock is
+    released between batches and other writers can proceed.
+
+    Args:
+        days (int): Age in days after which read notifications are deleted.
+        batch_size (int): Rows deleted per transaction.
+        pause (float, optional): Seconds to sleep between batches.
+
+    Returns:
+        int: Number of deleted notifications.
+
+    Example:
+        delete_old_read_notifications(90, 500)
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    old_read = Notification.objects.filter(is_read=True, created_at__lt=cutoff).order_by()
+    deleted = 0
+    while True:
+        ids = list(old_read.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            deleted += Notification.objects.filter(id__in=ids).delete()[0]
+        if pause:
+            time.sleep(pause)
+
+
+def compact_unread_notifications(days, batch_size, pause=0):
+    """
+    Collapse a user's unread notifications of the same manga older than the given age into one digest row.
+
+    The newest notification of each group is kept with grouped_count set to the number of chapters it
+    stands for, the older ones are deleted. Groups are processed in batches, each in its own transaction.
+
+    Args:
+        days (int): Age in days after which unread notifications are collapsed.
+        batch_size (int): Groups collapsed per transaction.
+        pause (float, optional): Seconds to sleep between batches.
+
+    Returns:
+        int: Number of deleted notifications.
+
+    Example:
+        compact_unread_notifications(1, 500)
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    old_unread = Notification.objects.filter(is_read=False, created_at__lt=cutoff)
+    groups = (
+        old_unread.values("user_id", "chapter__manga_id")
+        .annotate(rows=Count("id"), total=Sum("grouped_count"), latest=Max("id"))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    deleted = 0
+    while True:
+        batch = list(groups[:batch_size])
+        if not batch:
+            return deleted
+        with transaction.atomic():
+            for group in batch:
+                Notification.objects.filter(pk=group["latest"]).update(grouped_count=group["total"])
+                removed = (
+                    old_unread.filter(
+                        user_id=group["user_id"], chapter__manga_id=group["chapter__manga_id"], id__lt=group["latest"]
+                    )
+                    .order_by()
+                    .delete()[0]
+                )
+                deleted += removed
+                transaction.on_commit(
+                    lambda user_id=group["user_id"], removed=removed: adjust_unread_counts([user_id], -removed)
+                )
+        if pause:
+            time.sleep(pause)
@@ -0,0 +1,225 @@
+import atexit
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.utils import timezone
+
+from manga.models import Chapter
+from users.models import CustomUser, ReadingProgress
+
+# Chapter slugs never change, so their IDs are cached for a day to keep page turns off the database.
+CHAPTER_IDS_TIMEOUT = 60 * 60 * 24
+
+
+class ProgressBuffer:
+    """
+    In-process buffer coalescing reading positions before they are written.
+
+    Only the latest position per (user, manga) is kept. The buffered positions are written with one upsert
+    at most READING_PROGRESS_FLUSH_SECONDS after the first page turn since the previous flush, so a reader
+    turning pages costs a dictionary update instead of a write. Positions still buffered when the process
+    is killed are lost and the reader resumes from the previous flush.
+
+    Every web worker process has its own buffer, so a reader whose requests reach several workers is flushed
+    by each of them in any order. A flush skips positions older than the stored one, so a worker flushing
+    late cannot move the reader back.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty buffer.
+
+        Returns:
+            None
+        """
+        self._positions = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+
+    def record(self, user_id, manga_id, chapter_id, page):
+        """
+        Buffer a reading position, replacing the previous one of the same manga.
+
+        Args:
+            user_id (int): The reader's ID.
+            manga_id (int): The manga ID.
+            chapter_id (int): The chapter ID.
+            page (int): The page number.
+
+        Returns:
+            None
+        """
+        interval = settings.READING_PROGRESS_FLUSH_SECONDS
+        with self._lock:
+            self._positions[(user_id, manga_id)] = (chapter_id, page, timezone.now())
+            if interval and self._timer is None:
+                self._timer = threading.Timer(interval, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+        if not interval:
+            self.flush()
+
+    def _flush_in_background(self):
+        """
+        Flush the buffer from the timer thread and release the thread's database connection.
+
+        Returns:
+            None
+        """
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+    def flush(self, user_id=None):
+        """
+        Write the buffered positions with one INSERT ... ON CONFLICT DO UPDATE.
+
+        Flushes run one at a time from taking the positions to writing them, so a flush that took older
+        positions cannot overwrite the newer ones of a later flush.
+
+        Args:
+            user_id (int, optional): Only write the positions of this user.
+
+        Returns:
+            int: Number of positions written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if user_id is None:
+                    positions, self._positions = self._positions, {}
+                    if self._timer is not None:
+                        self._timer.cancel()
+                        self._timer = None
+                else:
+                    positions = {key: self._positions.pop(key) for key in list(self._positions) if key[0] == user_id}
+            if not positions:
+                return 0
+            return self._write(positions)
+
+    def _write(self, positions):
+        """
+        Upsert positions, dropping those of chapters or users deleted in the meantime and those older than
+        the stored position, which another process may have written.
+
+        Args:
+            positions (dict): (chapter ID, page, updated_at) per (user ID, manga ID).
+
+        Returns:
+            int: Number of positions written.
+        """
+        chapters = {chapter for chapter, _, _ in positions.values()}
+        users = {user for user, _ in positions}
+        mangas = {manga for _, manga in positions}
+        existing_chapters = set(Chapter.objects.filter(id__in=chapters).values_list("id", flat=True))
+        existing_users = set(CustomUser.objects.filter(id__in=users).values_list("id", flat=True))
+        with transaction.atomic():
+            stored = {
+                (user, manga): updated_at
+                for user, manga, updated_at in ReadingProgress.objects.select_for_update()
+                .filter(user_id__in=users, manga_id__in=mangas)
+                .values_list("user_id", "manga_id", "updated_at")
+            }
+            progress = [
+                ReadingProgress(user_id=user, manga_id=manga, chapter_id=chapter, page=page, updated_at=updated_at)
+                for (user, manga), (chapter, page, updated_at) in positions.items()
+                if chapter in existing_chapters
+                and user in existing_users
+                and updated_at >= stored.get((user, manga), updated_at)
+            ]
+            ReadingProgress.objects.bulk_create(
+                progress,
+                update_conflicts=True,
+                unique_fields=["user", "manga"],
+                update_fields=["chapter", "page", "updated_at"],
+            )
+        return len(progress)
+
+
+progress_buffer = ProgressBuffer()
+atexit.register(progress_buffer.flush)
+
+
+def chapter_ids(chapter_slug):
+    """
+    Look up the IDs of a chapter and its manga by the chapter slug, cached.
+
+    Args:
+        chapter_slug (str): The chapter slug.
+
+    Returns:
+        tuple or None: (chapter ID, manga ID), None if the chapter does not exist.
+    """
+    key = f"chapter:ids:{chapter_slug}"
+    ids = cache.get(key)
+    if ids is None:
+        ids = Chapter.objects.filter(slug=chapter_slug).values_list("id", "manga_id").first()
+        if ids is None:
+            return None
+        cache.set(key, ids, CHAPTER_IDS_TIMEOUT)
+    return ids
+
+
+def record_reading_progress(user, chapter_slug, page):
+    """
+    Remember the page of a chapter the user is reading.
+
+    Args:
+        user (CustomUser): The reader.
+        chapter_slug (str): The chapter slug.
+        page (int): The page number.
+
+    Returns:
+        bool: False if the chapter does not exist.
+
+    Example:
+        record_reading_progress(request.user, "naruto-1-1", 12)
+    """
+    ids = chapter_ids(chapter_slug)
+    if ids is None:
+        return False
+    chapter_id, manga_id = ids
+    progress_buffer.record(user.pk, manga_id, chapter_id, page)
+    return True
+
+
+def continue_reading(user, limit=20):
+    """
+    List the manga the user read most recently with the chapter and page to continue from.
+
+    The user's buffered positions are written first. The list is one query over the (user, updated_at)
+    index joined with the manga and the chapter.
+
+    Args:
+        user (CustomUser): The reader.
+        limit (int, optional): Maximum number of manga.
+
+    Returns:
+        QuerySet: ReadingProgress objects, most recent first.
+
+    Example:
+        continue_reading(request.user)
+    """
+    progress_buffer.flush(user.pk)
+    return (
+        ReadingProgress.objects.filter(user=user)
+        .select_related("manga", "chapter")
+        .only(
+            "page",
+            "updated_at",
+            "manga",
+            "chapter",
+            "manga__name_manga",
+            "manga__slug",
+            "manga__thumbnail",
+            "manga__dominant_color",
+            "manga__blurhash",
+            "chapter__volume",
+            "chapter__chapter_number",
+            "chapter__slug",
+        )
+        .order_by("-updated_at")[:limit]
+    )
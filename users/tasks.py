@@ -0,0 +1,18 @@
+from users.service.service_notifications import notify_chapter_followers
+
+
+def fan_out_chapter_notifications(chapter_id, manga_id):
+    """
+    Background task that notifies the followers of a manga about a new chapter.
+
+    Args:
+        chapter_id (int): The ID of the new chapter.
+        manga_id (int): The ID of the chapter's manga.
+
+    Returns:
+        None
+
+    Example:
+        fan_out_chapter_notifications(7, 42)
+    """
+    notify_chapter_followers(chapter_id, manga_id)
@@ -0,0 +1,185 @@
+import asyncio
+import threading
+from unittest import skipIf
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from manga.models import Category, Chapter, Manga
+from manga_back.events import Broker, InProcessBroker, RedisBroker, get_broker
+from users.models import CustomUser, MangaList
+from users.service.service_notifications import notification_channel, notify_chapter_followers
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+class InProcessBrokerTest(TestCase):
+    """
+    Test suite for the broker interface and the in-process event broker.
+    """
+
+    def test_partial_broker_cannot_be_created(self):
+        """
+        Test that a broker missing part of the interface fails when it is created.
+
+        Returns:
+            None
+        """
+
+        class PublishOnlyBroker(Broker):
+            def publish(self, channel, message):
+                pass
+
+        with self.assertRaises(TypeError):
+            PublishOnlyBroker()
+
+    async def test_publish_from_another_thread(self):
+        """
+        Test that a message published from a worker thread reaches the subscriber's event loop.
+
+        Returns:
+            None
+        """
+        broker = InProcessBroker()
+        subscription = broker.subscribe("channel")
+        threading.Thread(target=broker.publish, args=("channel", {"id": 1})).start()
+        self.assertEqual(await subscription.get(1), {"id": 1})
+        self.assertIsNone(await subscription.get(0.01))
+        subscription.close()
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    @override_settings(EVENT_QUEUE_SIZE=2)
+    async def test_slow_subscriber_keeps_newest_messages(self):
+        """
+        Test that a subscriber that falls behind loses the oldest messages.
+
+        Returns:
+            None
+        """
+        broker = InProcessBroker()
+        subscription = broker.subscribe("channel")
+        for message_id in range(4):
+            broker.publish("channel", {"id": message_id})
+        await asyncio.sleep(0)
+        self.assertEqual([(await subscription.get(1))["id"] for _ in range(2)], [2, 3])
+
+
+@skipIf(fakeredis is None, "fakeredis is not installed")
+@override_settings(REDIS_URL="redis://localhost:6379/0")
+class RedisBrokerTest(TestCase):
+    """
+    Test suite for the Redis event broker, run against an in-memory fake Redis server.
+    """
+
+    async def test_message_published_by_another_process_reaches_subscriber(self):
+        """
+        Test that a message published through one broker is delivered to the subscribers of another.
+
+        Returns:
+            None
+        """
+        server = fakeredis.FakeServer()
+        with (
+            patch("redis.Redis.from_url", lambda url: fakeredis.FakeRedis(server=server)),
+            patch("redis.asyncio.Redis.from_url", lambda url: fakeredis.FakeAsyncRedis(server=server)),
+        ):
+            broker, publisher = RedisBroker(), RedisBroker()
+            subscription = broker.subscribe("channel")
+            while not publisher._client.pubsub_numpat():
+                await asyncio.sleep(0.01)
+            await asyncio.to_thread(publisher.publish, "channel", {"id": 1})
+            publisher.publish("other", {"id": 2})
+
+            self.assertEqual(await subscription.get(1), {"id": 1})
+            self.assertIsNone(await subscription.get(0.05))
+            subscription.close()
+            for listener in broker._listeners.values():
+                listener.cancel()
+            await asyncio.gather(*broker._listeners.values(), return_exceptions=True)
+
+
+class NotificationStreamTest(TestCase):
+    """
+    Test suite for live notifications pushed to server-sent event streams.
+    """
+
+    def setUp(self):
+        """
+        Set up a follower of a manga.
+
+        Returns:
+            None
+        """
+        self.manga = Manga.objects.create(
+            category=Category.objects.create(category_name="Manga"),
+            name_manga="Test Manga",
+            english_only_field="Test_English",
+            review="Test Review",
+            slug="test-manga",
+        )
+        self.user = CustomUser.objects.create(username="reader", email="reader@example.com")
+        MangaList.objects.create(user=self.user, manga=self.manga, name="Reading")
+
+    def test_fan_out_publishes_notifications(self):
+        """
+        Test that the chapter fan-out publishes each committed notification to the follower's channel.
+
+        Returns:
+            None
+        """
+        loop = asyncio.new_event_loop()
+        try:
+
+            async def subscribe():
+                return get_broker().subscribe(notification_channel(self.user.pk))
+
+            subscription = loop.run_until_complete(subscribe())
+            chapter = Chapter.objects.create(manga=self.manga, chapter_number=1, volume=1)
+            with self.captureOnCommitCallbacks(execute=True):
+                notify_chapter_followers(chapter.pk, self.manga.pk)
+            message = loop.run_until_complete(subscription.get(1))
+            subscription.close()
+        finally:
+            loop.close()
+        self.assertEqual(message["chapter"]["slug"], chapter.slug)
+        self.assertFalse(message["is_read"])
+
+    async def test_stream_requires_authentication(self):
+        """
+        Test that anonymous clients cannot open a stream.
+
+        Returns:
+            None
+        """
+        response = await self.async_client.get("/auth/notifications/stream/")
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_sends_published_notifications(self):
+        """
+        Test that an open stream sends a published notification as an event.
+
+        Returns:
+            None
+        """
+        response = await self.async_client.get(
+            "/auth/notifications/stream/", headers={"authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 5000\n\n")
+        frame = asyncio.ensure_future(anext(stream))
+        while not get_broker().subscriber_count():
+            await asyncio.sleep(0.01)
+        get_broker().publish(notification_channel(self.user.pk), {"id": 7})
+        self.assertEqual(await frame, b'id: 7\nevent: notification\ndata: {"id": 7}\n\n')
+        # Django cancels the response task when the client disconnects.
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertEqual(get_broker().subscriber_count(), 0)
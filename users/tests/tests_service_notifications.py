@@ -0,0 +1,482 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from common.models import BackgroundTask, MangaRating
+from common.service.service_tasks import run_pending_tasks
+from manga.models import Category, Chapter, Manga
+from users.models import CustomUser, MangaList, Notification, NotificationWatermark
+from users.service.service import get_notifications
+from users.service.service_notifications import (
+    delete_old_read_notifications,
+    mark_notifications_seen,
+    notify_chapter_followers,
+    unread_notification_count,
+)
+
+
+class ChapterNotificationFanOutTest(TestCase):
+    """
+    Test suite for the batched new chapter notification fan-out.
+    """
+
+    def setUp(self):
+        """
+        Set up a manga with five followers and one user who does not follow it.
+
+        Returns:
+            None
+        """
+        self.manga = Manga.objects.create(
+            category=Category.objects.create(category_name="Manga"),
+            name_manga="Test Manga",
+            english_only_field="Test_English",
+            review="Test Review",
+            slug="test-manga",
+        )
+        self.followers = [
+            CustomUser.objects.create(username=f"follower{i}", email=f"follower{i}@example.com") for i in range(5)
+        ]
+        for user in self.followers:
+            MangaList.objects.create(user=user, manga=self.manga, name="Reading")
+        CustomUser.objects.create(username="stranger", email="stranger@example.com")
+
+    def test_chapter_save_queues_fan_out(self):
+        """
+        Test that saving a chapter only queues the fan-out and the worker notifies every follower.
+
+        Returns:
+            None
+        """
+        chapter = Chapter.objects.create(manga=self.manga, chapter_number=1, volume=1)
+        self.assertFalse(Notification.objects.exists())
+        self.assertTrue(BackgroundTask.objects.filter(name="users.tasks.fan_out_chapter_notifications").exists())
+
+        run_pending_tasks()
+
+        self.assertEqual(
+            set(Notification.objects.filter(chapter=chapter).values_list("user_id", flat=True)),
+            {user.pk for user in self.followers},
+        )
+
+    @override_settings(NOTIFICATION_BATCH_SIZE=2)
+    def test_fan_out_is_batched_and_skips_notified_users(self):
+        """
+        Test that followers are inserted in batches and a repeated fan-out does not notify anyone twice.
+
+        Returns:
+            None
+        """
+        chapter = Chapter.objects.create(manga=self.manga, chapter_number=1, volume=1)
+        Notification.objects.create(user=self.followers[0], chapter=chapter)
+
+        # Chapter with its manga (and stored rating) for the live payload, follower stream,
+        # then per batch of 2: savepoint, SELECT notified users, INSERT, release.
+        with self.assertNumQueries(1 + 1 + 3 * 4):
+            created = notify_chapter_followers(chapter.pk, self.manga.pk)
+
+        self.assertEqual(created, 4)
+        self.assertEqual(notify_chapter_followers(chapter.pk, self.manga.pk), 0)
+        self.assertEqual(Notification.objects.filter(chapter=chapter).count(), 5)
+
+
+@override_settings(NOTIFICATION_MODE="read")
+class WatermarkNotificationTest(TestCase):
+    """
+    Test suite for notifications computed at read time from per-user watermarks.
+    """
+
+    def setUp(self):
+        """
+        Set up a user following one of two manga.
+
+        Returns:
+            None
+        """
+        category = Category.objects.create(category_name="Manga")
+        self.followed = Manga.objects.create(
+            category=category, name_manga="Followed", english_only_field="Followed", review="Review", slug="followed"
+        )
+        self.other = Manga.objects.create(
+            category=category, name_manga="Other", english_only_field="Other", review="Review", slug="other"
+        )
+        self.user = CustomUser.objects.create(username="reader", email="reader@example.com")
+        MangaList.objects.create(user=self.user, manga=self.followed, name="Reading")
+
+    def test_new_chapters_are_unread_without_rows(self):
+        """
+        Test that new chapters of followed manga are listed as unread and no rows or tasks are written.
+
+        Returns:
+            None
+        """
+        chapter = Chapter.objects.create(manga=self.followed, chapter_number=1, volume=1)
+        Chapter.objects.create(manga=self.other, chapter_number=1, volume=1)
+
+        self.assertFalse(Notification.objects.exists())
+        self.assertFalse(BackgroundTask.objects.exists())
+        unread = list(get_notifications(self.user, unread_only=True))
+        self.assertEqual(unread, [chapter])
+        self.assertFalse(unread[0].is_read)
+
+    def test_mark_seen_moves_watermark_forward_only(self):
+        """
+        Test that marking notifications seen reads every listed chapter and never moves the watermark back.
+
+        Returns:
+            None
+        """
+        Chapter.objects.create(manga=self.followed, chapter_number=1, volume=1)
+        mark_notifications_seen(self.user)
+        seen_at = NotificationWatermark.objects.get(user=self.user).seen_at
+
+        mark_notifications_seen(self.user, seen_at - timedelta(days=1))
+
+        self.assertEqual(NotificationWatermark.objects.get(user=self.user).seen_at, seen_at)
+        self.assertFalse(get_notifications(self.user, unread_only=True).exists())
+        self.assertTrue(all(chapter.is_read for chapter in get_notifications(self.user)))
+
+    def test_views_render_chapters_as_notifications(self):
+        """
+        Test that the list endpoint renders chapters like notification rows and the seen endpoint reads them.
+
+        Returns:
+            None
+        """
+        chapter = Chapter.objects.create(manga=self.followed, chapter_number=1, volume=1)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get("/auth/notifications/profile/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["chapter"]["slug"], chapter.slug)
+        self.assertIsNone(response.data["results"][0]["id"])
+        self.assertFalse(response.data["results"][0]["is_read"])
+
+        self.assertEqual(client.post("/auth/notifications/seen/").status_code, 204)
+        self.assertTrue(client.get("/auth/notifications/profile/").data["results"][0]["is_read"])
+
+
+class UnreadNotificationCountTest(TestCase):
+    """
+    Test suite for the cached unread notification counter.
+    """
+
+    def setUp(self):
+        """
+        Set up an authenticated follower of a manga and clear the cache.
+
+        Returns:
+            None
+        """
+        cache.clear()
+        self.manga = Manga.objects.create(
+            category=Category.objects.create(category_name="Manga"),
+            name_manga="Test Manga",
+            english_only_field="Test_English",
+            review="Test Review",
+            slug="test-manga",
+        )
+        self.user = CustomUser.objects.create(username="reader", email="reader@example.com")
+        MangaList.objects.create(user=self.user, manga=self.manga, name="Reading")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def unread_count(self):
+        """
+        Helper method to poll the unread counter endpoint.
+
+        Returns:
+            int: The unread count.
+        """
+        response = self.client.get("/auth/notifications/unread-count/")
+        self.assertEqual(response.status_code, 200)
+        return response.data["unread_count"]
+
+    def test_counter_follows_fan_out_and_mark_as_read(self):
+        """
+        Test that the counter is served from the cache and updated by the fan-out and mark-as-read.
+
+        Returns:
+            None
+        """
+        self.assertEqual(self.unread_count(), 0)
+        for number in (1, 2):
+            Chapter.objects.create(manga=self.manga, chapter_number=number, volume=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            run_pending_tasks()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.unread_count(), 2)
+
+        notification = Notification.objects.filter(user=self.user).first()
+        for _ in range(2):
+            response = self.client.patch(f"/auth/notifications/{notification.pk}/mark-as-read/", {})
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.unread_count(), 1)
+
+        self.assertEqual(self.client.post("/auth/notifications/seen/").status_code, 204)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.unread_count(), 0)
+
+    @override_settings(NOTIFICATION_MODE="read")
+    def test_counter_in_read_mode(self):
+        """
+        Test that in "read" mode the counter is computed from the watermark and reset when notifications are seen.
+
+        Returns:
+            None
+        """
+        Chapter.objects.create(manga=self.manga, chapter_number=1, volume=1)
+        self.assertEqual(self.unread_count(), 1)
+        self.client.post("/auth/notifications/seen/")
+        self.assertEqual(self.unread_count(), 0)
+
+
+class BulkMarkNotificationsReadTest(TestCase):
+    """
+    Test suite for marking many notifications as read in one request.
+    """
+
+    def setUp(self):
+        """
+        Set up a user with five unread notifications and another user with one.
+
+        Returns:
+            None
+        """
+        cache.clear()
+        manga = Manga.objects.create(
+            category=Category.objects.create(category_name="Manga"),
+            name_manga="Test Manga",
+            english_only_field="Test_English",
+            review="Test Review",
+            slug="test-manga",
+        )
+        self.user = CustomUser.objects.create(username="reader", email="reader@example.com")
+        self.other = CustomUser.objects.create(username="other", email="other@example.com")
+        self.notifications = []
+        for number in range(1, 6):
+            chapter = Chapter.objects.create(manga=manga, chapter_number=number, volume=1)
+            self.notifications.append(Notification.objects.create(user=self.user, chapter=chapter))
+        Notification.objects.create(user=self.other, chapter=chapter)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def mark_read(self, data):
+        """
+        Helper method to call the bulk mark-as-read endpoint with a single UPDATE.
+
+        Args:
+            data (dict): Request body.
+
+        Returns:
+            int: Number of notifications marked as read.
+        """
+        with self.assertNumQueries(1):
+            response = self.client.post("/auth/notifications/mark-as-read/", data, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.data["updated"]
+
+    def test_mark_list_up_to_id_and_all(self):
+        """
+        Test that ids, up_to_id and all each mark only the user's unread notifications.
+
+        Returns:
+            None
+        """
+        ids = [notification.pk for notification in self.notifications]
+        self.assertEqual(self.mark_read({"ids": [ids[0], ids[4]]}), 2)
+        self.assertEqual(self.mark_read({"up_to_id": ids[2]}), 2)
+        self.assertEqual(self.mark_read({"all": True}), 1)
+        self.assertEqual(self.mark_read({"all": True}), 0)
+        self.assertFalse(Notification.objects.filter(user=self.user, is_read=False).exists())
+        self.assertTrue(Notification.objects.filter(user=self.other, is_read=False).exists())
+
+    def test_counter_is_decremented(self):
+        """
+        Test that the cached unread counter drops by the number of notifications marked as read.
+
+        Returns:
+            None
+        """
+        self.assertEqual(self.client.get("/auth/notifications/unread-count/").data["unread_count"], 5)
+        self.mark_read({"up_to_id": self.notifications[1].pk})
+        self.assertEqual(self.client.get("/auth/notifications/unread-count/").data["unread_count"], 3)
+
+    def test_selection_is_required(self):
+        """
+        Test that a request without exactly one selection is rejected.
+
+        Returns:
+            None
+        """
+        for data in ({}, {"all": True, "ids": [1]}, {"ids": []}):
+            response = self.client.post("/auth/notifications/mark-as-read/", data, format="json")
+            self.assertEqual(response.status_code, 400)
+
+
+class NotificationRetentionTest(TestCase):
+    """
+    Test suite for notification retention, digests and cursor pagination.
+    """
+
+    def setUp(self):
+        """
+        Set up a user with notifications about two manga.
+
+        Returns:
+            None
+        """
+        cache.clear()
+        category = Category.objects.create(category_name="Manga")
+        self.user = CustomUser.objects.create(username="reader", email="reader@example.com")
+        self.chapters = {}
+        for slug in ("first", "second"):
+            manga = Manga.objects.create(
+                category=category, name_manga=slug, english_only_field=slug, review="Review", slug=slug
+            )
+            self.chapters[slug] = [
+                Chapter.objects.create(manga=manga, chapter_number=number, volume=1) for number in range(1, 4)
+            ]
+
+    def notify(self, chapter, days_ago, is_read=False):
+        """
+        Helper method to create a notification of the given age.
+
+        Args:
+            chapter (Chapter): The chapter.
+            days_ago (int): Age in days.
+            is_read (bool): Whether the notification was read.
+
+        Returns:
+            Notification: The notification.
+        """
+        notification = Notification.objects.create(user=self.user, chapter=chapter, is_read=is_read)
+        Notification.objects.filter(pk=notification.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+        return notification
+
+    def test_prune_deletes_old_read_notifications_in_batches(self):
+        """
+        Test that only read notifications older than the retention age are deleted.
+
+        Returns:
+            None
+        """
+        old_read = [self.notify(chapter, 100, is_read=True) for chapter in self.chapters["first"]]
+        recent_read = self.notify(self.chapters["second"][0], 10, is_read=True)
+        old_unread = self.notify(self.chapters["second"][1], 100)
+
+        self.assertEqual(delete_old_read_notifications(90, batch_size=2), len(old_read))
+        self.assertEqual(set(Notification.objects.values_list("pk", flat=True)), {recent_read.pk, old_unread.pk})
+
+    def test_unread_notifications_are_collapsed_into_digest(self):
+        """
+        Test that old unread notifications of the same manga become one row counting all of their chapters.
+
+        Returns:
+            None
+        """
+        first = [self.notify(chapter, 5 - number) for number, chapter in enumerate(self.chapters["first"])]
+        second = self.notify(self.chapters["second"][0], 5)
+        fresh = self.notify(self.chapters["second"][1], 0)
+        self.assertEqual(unread_notification_count(self.user), 5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("prune_notifications", digest_after_days=1, batch_size=1, sleep=0, stdout=StringIO())
+
+        remaining = {notification.pk: notification.grouped_count for notification in Notification.objects.all()}
+        self.assertEqual(remaining, {first[-1].pk: 3, second.pk: 1, fresh.pk: 1})
+        self.assertEqual(unread_notification_count(self.user), 3)
+
+    def test_list_views_use_cursor_pagination(self):
+        """
+        Test that both notification lists are paginated with a cursor.
+
+        Returns:
+            None
+        """
+        for days_ago, chapter in enumerate(self.chapters["first"] + self.chapters["second"]):
+            self.notify(chapter, days_ago)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        for url in ("/auth/notifications/", "/auth/notifications/profile/"):
+            page = client.get(url, {"page_size": 4}).data
+            self.assertEqual(len(page["results"]), 4)
+            self.assertIn("cursor=", page["next"])
+            self.assertEqual(len(client.get(page["next"]).data["results"]), 2)
+
+
+class NotificationQueryCountTest(TestCase):
+    """
+    Test suite for the number of queries of the notification list endpoints.
+    """
+
+    def setUp(self):
+        """
+        Set up a user following rated manga with one notification per chapter.
+
+        Returns:
+            None
+        """
+        category = Category.objects.create(category_name="Manga")
+        self.user = CustomUser.objects.create(username="reader", email="reader@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for index in range(10):
+            manga = Manga.objects.create(
+                category=category,
+                name_manga=f"Manga {index}",
+                english_only_field=f"manga-{index}",
+                review="Review",
+                slug=f"manga-{index}",
+            )
+            MangaList.objects.create(user=self.user, manga=manga, name="Reading")
+            MangaRating.objects.create(user=self.user, manga=manga, rating=4)
+            for number in range(1, 4):
+                chapter = Chapter.objects.create(manga=manga, chapter_number=number, volume=1)
+                Notification.objects.create(user=self.user, chapter=chapter)
+
+    def assert_constant_queries(self, url, queries):
+        """
+        Assert that small and large pages of a notification list cost the same number of queries.
+
+        Args:
+            url (str): The list endpoint.
+            queries (int): Expected number of queries.
+
+        Returns:
+            None
+        """
+        for page_size in (2, 30):
+            with self.assertNumQueries(queries):
+                response = self.client.get(url, {"page_size": page_size})
+            self.assertEqual(len(response.data["results"]), page_size)
+            self.assertEqual(response.data["results"][0]["chapter"]["manga"]["average_rating"], 4)
+
+    def test_notification_lists_in_write_mode(self):
+        """
+        Test that a page of notification rows costs one query whatever its size.
+
+        Returns:
+            None
+        """
+        self.assert_constant_queries("/auth/notifications/profile/", 1)
+        self.assert_constant_queries("/auth/notifications/", 1)
+
+    @override_settings(NOTIFICATION_MODE="read")
+    def test_notification_lists_in_read_mode(self):
+        """
+        Test that a page of followed chapters costs two queries, the watermark included.
+
+        Returns:
+            None
+        """
+        self.assert_constant_queries("/auth/notifications/profile/", 2)
+        self.assert_constant_queries("/auth/notifications/", 2)
@@ -0,0 +1,98 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from common.models import Comment
+from manga.models import Category, Chapter, Manga
+from users.models import CustomUser, MangaList
+from users.service.service import PROFILE_PREVIEW_SIZE
+
+
+class UserProfileTest(TestCase):
+    """
+    Test suite for the user profile previews and the paginated lists behind them.
+    """
+
+    def setUp(self):
+        """
+        Set up a reader with 15 manga list entries and 25 comments, and a reader with one of each.
+
+        Returns:
+            None
+        """
+        category = Category.objects.create(category_name="Manga")
+        manga = [
+            Manga.objects.create(
+                category=category, name_manga=f"Manga {i}", english_only_field=f"manga-{i}", review="-", slug=f"m-{i}"
+            )
+            for i in range(15)
+        ]
+        chapter = Chapter.objects.create(manga=manga[0], chapter_number=1, volume=1)
+        self.reader = CustomUser.objects.create(username="reader", slug="reader")
+        self.casual = CustomUser.objects.create(username="casual", slug="casual")
+        for i, title in enumerate(manga):
+            MangaList.objects.create(user=self.reader, manga=title, name="Reading" if i % 2 else "Read")
+        for i in range(25):
+            target = {"chapter": chapter} if i % 2 else {"manga": manga[i % 15]}
+            Comment.objects.create(user=self.reader, content=f"Comment {i}", **target)
+        MangaList.objects.create(user=self.casual, manga=manga[0], name="Reading")
+        Comment.objects.create(user=self.casual, chapter=chapter, content="Comment")
+        self.client = APIClient()
+
+    def test_profile_previews_cost_constant_queries(self):
+        """
+        Test that profiles embed bounded previews with totals in three queries, however long the lists are.
+
+        Returns:
+            None
+        """
+        for user in (self.reader, self.casual):
+            with self.assertNumQueries(3):
+                response = self.client.get(f"/auth/users/{user.slug}/")
+            self.assertEqual(response.status_code, 200)
+
+        self.client.force_authenticate(self.reader)
+        with self.assertNumQueries(3):
+            response = self.client.get("/auth/user/")
+
+        self.assertEqual(len(response.data["list_manga"]), PROFILE_PREVIEW_SIZE)
+        self.assertEqual(response.data["list_manga_count"], 15)
+        self.assertEqual(len(response.data["comments"]), PROFILE_PREVIEW_SIZE)
+        self.assertEqual(response.data["comments_count"], 25)
+        self.assertEqual(response.data["comments"][0]["content"], "Comment 24")
+        self.assertEqual(response.data["comments"][0]["manga_url"], "/m-9/")
+        self.assertEqual(response.data["comments"][1]["chapter_name"], 1)
+        self.assertEqual(response.data["list_manga"][0]["manga"]["url"], "/m-14/")
+
+    def test_comments_endpoint_pages_through_every_comment(self):
+        """
+        Test that the comments endpoint lists every comment once, newest first, two queries per page.
+
+        Returns:
+            None
+        """
+        contents = []
+        url = "/auth/users/reader/comments/?page_size=10"
+        while url:
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            contents.extend(comment["content"] for comment in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(contents, [f"Comment {i}" for i in reversed(range(25))])
+        self.assertEqual(self.client.get("/auth/users/missing/comments/").status_code, 404)
+
+    def test_manga_list_endpoint(self):
+        """
+        Test that the manga list endpoint pages through all or one of the lists in two queries.
+
+        Returns:
+            None
+        """
+        with self.assertNumQueries(2):
+            response = self.client.get("/auth/users/reader/manga-list/", {"page_size": 20})
+        self.assertEqual(len(response.data["results"]), 15)
+
+        response = self.client.get("/auth/users/reader/manga-list/", {"name": "Reading", "page_size": 20})
+        self.assertEqual({entry["name"] for entry in response.data["results"]}, {"Reading"})
+        self.assertEqual(len(response.data["results"]), 7)
+        self.assertEqual(self.client.get("/auth/users/reader/manga-list/", {"name": "Other"}).status_code, 400)
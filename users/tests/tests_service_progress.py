@@ -0,0 +1,181 @@
+import threading
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from manga.models import Category, Chapter, Manga
+from users.models import CustomUser, ReadingProgress
+from users.service.service_progress import ProgressBuffer
+
+
+class ReadingProgressTest(TestCase):
+    """
+    Test suite for buffered reading progress and the "continue reading" list.
+    """
+
+    def setUp(self):
+        """
+        Set up a reader and two manga with two chapters each.
+
+        Returns:
+            None
+        """
+        cache.clear()
+        category = Category.objects.create(category_name="Manga")
+        self.user = CustomUser.objects.create(username="reader", email="reader@example.com")
+        self.chapters = {}
+        for slug in ("first", "second"):
+            manga = Manga.objects.create(
+                category=category, name_manga=slug, english_only_field=slug, review="Review", slug=slug
+            )
+            self.chapters[slug] = [
+                Chapter.objects.create(manga=manga, chapter_number=number, volume=1) for number in (1, 2)
+            ]
+
+    def record(self, buffer, chapter, page, user=None):
+        """
+        Helper method to buffer a position in a chapter.
+
+        Args:
+            buffer (ProgressBuffer): The buffer.
+            chapter (Chapter): The chapter.
+            page (int): The page number.
+            user (CustomUser, optional): The reader, self.user by default.
+
+        Returns:
+            None
+        """
+        buffer.record((user or self.user).pk, chapter.manga_id, chapter.pk, page)
+
+    def test_positions_are_coalesced_into_one_upsert(self):
+        """
+        Test that only the latest position per manga is written, with one upsert for the whole buffer.
+
+        Returns:
+            None
+        """
+        buffer = ProgressBuffer()
+        first, second = self.chapters["first"], self.chapters["second"]
+        with self.settings(READING_PROGRESS_FLUSH_SECONDS=3600):
+            for page in range(1, 21):
+                self.record(buffer, first[0], page)
+            self.record(buffer, first[1], 3)
+            self.record(buffer, second[0], 7)
+        self.assertFalse(ReadingProgress.objects.exists())
+
+        # Existing chapters, existing users, the stored positions and the upsert, in a savepoint.
+        with self.assertNumQueries(6):
+            self.assertEqual(buffer.flush(), 2)
+
+        self.assertEqual(
+            set(ReadingProgress.objects.values_list("chapter", "page")), {(first[1].pk, 3), (second[0].pk, 7)}
+        )
+        self.assertEqual(buffer.flush(), 0)
+
+    def test_older_position_of_another_process_is_skipped(self):
+        """
+        Test that a buffer flushing after another one does not overwrite a newer position with an older one.
+
+        Returns:
+            None
+        """
+        early, late = ProgressBuffer(), ProgressBuffer()
+        first = self.chapters["first"]
+        with self.settings(READING_PROGRESS_FLUSH_SECONDS=3600):
+            self.record(early, first[0], 3)
+            self.record(late, first[1], 8)
+            self.record(early, self.chapters["second"][0], 1)
+
+        self.assertEqual(late.flush(), 1)
+        self.assertEqual(early.flush(), 1)
+        self.assertEqual(ReadingProgress.objects.get(manga=first[0].manga_id).chapter_id, first[1].pk)
+        self.assertEqual(ReadingProgress.objects.count(), 2)
+
+    def test_flush_one_user_and_skip_deleted_chapters(self):
+        """
+        Test that a user's positions can be written alone and positions of deleted chapters are dropped.
+
+        Returns:
+            None
+        """
+        buffer = ProgressBuffer()
+        other = CustomUser.objects.create(username="other", email="other@example.com")
+        with self.settings(READING_PROGRESS_FLUSH_SECONDS=3600):
+            self.record(buffer, self.chapters["first"][0], 5)
+            self.record(buffer, self.chapters["second"][0], 1, user=other)
+            self.record(buffer, self.chapters["second"][1], 2)
+        self.chapters["second"][1].delete()
+
+        self.assertEqual(buffer.flush(self.user.pk), 1)
+        self.assertEqual(list(ReadingProgress.objects.values_list("user", "page")), [(self.user.pk, 5)])
+        self.assertEqual(buffer.flush(), 1)
+
+    @override_settings(READING_PROGRESS_FLUSH_SECONDS=0)
+    def test_continue_reading_endpoint(self):
+        """
+        Test that positions sent by the reader are listed most recent first with one query.
+
+        Returns:
+            None
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+        for chapter, page in ((self.chapters["first"][0], 4), (self.chapters["second"][1], 9)):
+            response = client.post("/auth/reading-progress/", {"chapter": chapter.slug, "page": page}, format="json")
+            self.assertEqual(response.status_code, 202)
+        self.assertEqual(
+            client.post("/auth/reading-progress/", {"chapter": "missing", "page": 1}, format="json").status_code, 404
+        )
+
+        with self.assertNumQueries(1):
+            response = client.get("/auth/reading-progress/")
+
+        self.assertEqual([entry["manga_url"] for entry in response.data], ["/second/", "/first/"])
+        self.assertEqual(response.data[0]["chapter_slug"], self.chapters["second"][1].slug)
+        self.assertEqual(response.data[0]["page"], 9)
+
+
+class ProgressFlushOrderTest(TransactionTestCase):
+    """
+    Test suite for concurrent flushes of the reading progress buffer.
+
+    A TransactionTestCase, so the second flush can write from its own thread and connection.
+    """
+
+    def test_later_flush_waits_for_the_running_one(self):
+        """
+        Test that a flush started while another one is writing cannot be overwritten by the older position.
+
+        Returns:
+            None
+        """
+        category = Category.objects.create(category_name="Manga")
+        manga = Manga.objects.create(
+            category=category, name_manga="Manga", english_only_field="manga", review="Review", slug="manga"
+        )
+        chapter = Chapter.objects.create(manga=manga, chapter_number=1, volume=1)
+        user = CustomUser.objects.create(username="reader", email="reader@example.com")
+        buffer = ProgressBuffer()
+        write = buffer._write
+        user_flush = threading.Thread(target=buffer.flush, args=(user.pk,))
+
+        def write_while_reader_turns_page(positions):
+            if threading.current_thread() is user_flush:
+                return write(positions)
+            # The timer flush took page 1. The reader turns to page 2 and a GET flushes their positions.
+            buffer.record(user.pk, manga.pk, chapter.pk, 2)
+            user_flush.start()
+            user_flush.join(0.2)
+            self.assertTrue(user_flush.is_alive())
+            return write(positions)
+
+        with self.settings(READING_PROGRESS_FLUSH_SECONDS=3600):
+            buffer.record(user.pk, manga.pk, chapter.pk, 1)
+            with patch.object(buffer, "_write", side_effect=write_while_reader_turns_page):
+                buffer.flush()
+            user_flush.join()
+        buffer.flush()
+
+        self.assertEqual(ReadingProgress.objects.get(user=user).page, 2)
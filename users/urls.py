@@ -8,14 +8,21 @@ from users.views import UpdateNotificationIsReadView
 urlpatterns = [
     path("notifications/profile/", views.NotificationListProfileView.as_view(), name="notification-list"),
     path("notifications/", views.NotificationListView.as_view(), name="notification-detail"),
+    path("notifications/seen/", views.MarkNotificationsSeenView.as_view(), name="notification-seen"),
+    path("notifications/stream/", views.notification_stream, name="notification-stream"),
+    path("notifications/mark-as-read/", views.BulkMarkNotificationsReadView.as_view(), name="notification-bulk-read"),
+    path("notifications/unread-count/", views.UnreadNotificationCountView.as_view(), name="notification-unread-count"),
     path(
         "notifications/<int:pk>/mark-as-read/", UpdateNotificationIsReadView.as_view(), name="notification-mark-as-read"
     ),
+    path("reading-progress/", views.ReadingProgressView.as_view(), name="reading-progress"),
     path("user/update/gender/", views.GenderUpdateView.as_view(), name="user-update-gender"),
     path("user/update/adult/", views.AdultUpdateView.as_view(), name="user-update-adult"),
     path("user/update/avatar/", views.AvatarUpdateView.as_view(), name="user-update-avatar"),
     path("change-email/", views.change_email, name="change-email"),
     path("users/<slug:slug>/", views.OtherUserDetailView.as_view(), name="other-user-detail"),
+    path("users/<slug:slug>/comments/", views.UserCommentsView.as_view(), name="user-comments"),
+    path("users/<slug:slug>/manga-list/", views.UserMangaListView.as_view(), name="user-manga-list"),
     path("last-users/", views.LatestUsersView.as_view(), name="latest-users"),
     path("user/", views.CustomUserDetailsView.as_view(), name="rest_user_details"),
     path("registration/account-confirm-email/<str:key>/", ConfirmEmailView.as_view()),
@@ -1,24 +1,57 @@
+from asgiref.sync import sync_to_async
 from dj_rest_auth.registration.views import RegisterView
+from django.conf import settings
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.generics import RetrieveAPIView
+from rest_framework.exceptions import AuthenticationFailed, ParseError
+from rest_framework.generics import RetrieveAPIView, get_object_or_404
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
+from common.serializers import CommentUserPageSerializer
+from common.views import CommentPagination
+from manga.serializers import MangaListSerializer
+from manga.service.service import mangalist_entries
+from manga.views import MangaListPagination
+from manga_back.constants import NAME_LIST_MANGA
 from manga_back.service import data_acquisition_and_serialization
 
 from .models import CustomUser, Notification
 from .serializers import (
     AdultUpdateSerializer,
     AvatarUpdateSerializer,
+    ChapterFeedNotificationSerializer,
     CustomRegisterSerializer,
     CustomUserDetailsSerializer,
     GenderUpdateSerializer,
+    NotificationBulkReadSerializer,
     NotificationSerializer,
+    ReadingProgressSerializer,
+    ReadingProgressUpdateSerializer,
+)
+from .service.service import (
+    extract_and_serialize_data_on_recent_users,
+    get_notifications,
+    profile_queryset,
+    user_comments,
 )
-from .service.service import extract_and_serialize_data_on_recent_users, get_notifications
 from .service.service_change_email import change_email_address, existing_user_func, user_instance_func
+from .service.service_notifications import (
+    adjust_unread_counts,
+    mark_notifications_read,
+    mark_notifications_seen,
+    notification_events,
+    notifications_read_mode,
+    unread_notification_count,
+)
+from .service.service_progress import continue_reading, record_reading_progress
 
 
 class CustomRegisterView(RegisterView):
@@ -46,16 +79,16 @@ class CustomUserDetailsView(RetrieveAPIView):
     """
 
     permission_classes = [IsAuthenticated]
-    queryset, serializer_class = data_acquisition_and_serialization(CustomUser, CustomUserDetailsSerializer)
+    serializer_class = CustomUserDetailsSerializer
 
     def get_object(self):
         """
-        Get the current user object.
+        Get the current user object with the profile previews.
 
         Returns:
             CustomUser: The current user instance.
         """
-        return self.request.user
+        return profile_queryset().get(pk=self.request.user.pk)
 
 
 class OtherUserDetailView(generics.RetrieveAPIView):
@@ -63,10 +96,51 @@ class OtherUserDetailView(generics.RetrieveAPIView):
     API view to display another user's data by slug.
     """
 
-    queryset, serializer_class = data_acquisition_and_serialization(CustomUser, CustomUserDetailsSerializer)
+    queryset, serializer_class = profile_queryset(), CustomUserDetailsSerializer
     lookup_field = "slug"
 
 
+class UserCommentsView(generics.ListAPIView):
+    """
+    API view to display all comments of a user by slug, cursor-paginated.
+    """
+
+    serializer_class = CommentUserPageSerializer
+    pagination_class = CommentPagination
+
+    def get_queryset(self):
+        """
+        Get queryset of the user's comments.
+
+        Returns:
+            QuerySet: Comments of the user, newest first.
+        """
+        return user_comments(get_object_or_404(CustomUser.objects.only("id"), slug=self.kwargs["slug"]))
+
+
+class UserMangaListView(generics.ListAPIView):
+    """
+    API view to display the manga list of a user by slug, cursor-paginated.
+
+    `?name=<list name>` limits it to one of the lists.
+    """
+
+    serializer_class = MangaListSerializer
+    pagination_class = MangaListPagination
+
+    def get_queryset(self):
+        """
+        Get queryset of the user's manga list entries.
+
+        Returns:
+            QuerySet: Manga list entries of the user, newest first.
+        """
+        name = self.request.query_params.get("name")
+        if name is not None and name not in dict(NAME_LIST_MANGA):
+            raise ParseError("Unknown list name.")
+        return mangalist_entries(get_object_or_404(CustomUser.objects.only("id"), slug=self.kwargs["slug"]), name)
+
+
 class LatestUsersView(APIView):
     """
     API view to display ten newly created users.
@@ -164,13 +238,37 @@ def change_email(request):
         return Response({"error": "User not found."}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class NotificationListProfileView(generics.ListAPIView):
+class NotificationPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-created_at"
+
+
+class NotificationSerializerMixin:
+    """
+    Mixin choosing the notification serializer for the configured NOTIFICATION_MODE.
+    """
+
+    def get_serializer_class(self):
+        """
+        Get the serializer for notification rows or, in "read" mode, for chapters of followed manga.
+
+        Returns:
+            type: The serializer class.
+        """
+        if notifications_read_mode():
+            return ChapterFeedNotificationSerializer
+        return NotificationSerializer
+
+
+class NotificationListProfileView(NotificationSerializerMixin, generics.ListAPIView):
     """
     API view to display a list of all notifications for the authenticated user.
     """
 
-    serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = NotificationPagination
 
     def get_queryset(self):
         """
@@ -182,13 +280,13 @@ class NotificationListProfileView(generics.ListAPIView):
         return get_notifications(self.request.user)
 
 
-class NotificationListView(generics.ListAPIView):
+class NotificationListView(NotificationSerializerMixin, generics.ListAPIView):
     """
     API view to display a list of unread notifications for the authenticated user.
     """
 
-    serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = NotificationPagination
 
     def get_queryset(self):
         """
@@ -197,7 +295,7 @@ class NotificationListView(generics.ListAPIView):
         Returns:
             QuerySet: Unread notifications for the user.
         """
-        return get_notifications(self.request.user, False)
+        return get_notifications(self.request.user, unread_only=True)
 
 
 class UpdateNotificationIsReadView(generics.UpdateAPIView):
@@ -206,7 +304,16 @@ class UpdateNotificationIsReadView(generics.UpdateAPIView):
     """
 
     permission_classes = [IsAuthenticated]
-    serializer_class, queryset = data_acquisition_and_serialization(Notification, NotificationSerializer)
+    queryset, serializer_class = data_acquisition_and_serialization(Notification, NotificationSerializer)
+
+    def get_queryset(self):
+        """
+        Get the notifications of the authenticated user.
+
+        Returns:
+            QuerySet: Notifications the user may mark as read.
+        """
+        return super().get_queryset().filter(user=self.request.user)
 
     def perform_update(self, serializer):
         """
@@ -218,5 +325,170 @@ class UpdateNotificationIsReadView(generics.UpdateAPIView):
         Returns:
             None
         """
+        was_unread = not serializer.instance.is_read
         serializer.instance.is_read = True
         serializer.save()
+        if was_unread:
+            adjust_unread_counts([serializer.instance.user_id], -1)
+
+
+class MarkNotificationsSeenView(APIView):
+    """
+    API view to mark all current notifications of the authenticated user as read.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Move the user's notification watermark to now, or mark their notification rows read in "write" mode.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            Response: Empty response with status 204.
+        """
+        mark_notifications_seen(request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ReadingProgressView(APIView):
+    """
+    API view to record and list where the authenticated user stopped reading.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Return the most recently read manga with the chapter and page to continue from.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            Response: Serialized reading positions, most recent first.
+        """
+        return Response(ReadingProgressSerializer(continue_reading(request.user), many=True).data)
+
+    def post(self, request):
+        """
+        Record the page the user is on. The position is buffered and written in a batch a few seconds later.
+
+        Body: {"chapter": "<chapter slug>", "page": 12}.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            Response: Empty response with status 202, or 404 if the chapter does not exist.
+        """
+        serializer = ReadingProgressUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if not record_reading_progress(request.user, data["chapter"], data["page"]):
+            return Response({"error": "Chapter not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_202_ACCEPTED)
+
+
+class UnreadNotificationCountView(APIView):
+    """
+    API view to return the number of unread notifications for the notification badge.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Return the cached unread notification counter of the authenticated user.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            Response: {"unread_count": int}
+        """
+        return Response({"unread_count": unread_notification_count(request.user)})
+
+
+class BulkMarkNotificationsReadView(APIView):
+    """
+    API view to mark many notifications of the authenticated user as read in one request.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Mark all notifications, those up to an ID or a list of IDs as read with a single UPDATE.
+
+        Body: {"all": true}, {"up_to_id": 120} or {"ids": [118, 119, 120]}.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            Response: {"updated": int} or validation errors with status 400.
+        """
+        serializer = NotificationBulkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if notifications_read_mode():
+            if not data.get("all"):
+                return Response(
+                    {"error": "Only all notifications can be marked as read in this notification mode."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            updated = unread_notification_count(request.user)
+            mark_notifications_seen(request.user)
+            return Response({"updated": updated})
+        if data.get("up_to_id"):
+            condition = Q(id__lte=data["up_to_id"])
+        elif data.get("ids"):
+            condition = Q(id__in=data["ids"])
+        else:
+            condition = None
+        return Response({"updated": mark_notifications_read(request.user, condition)})
+
+
+def authenticate_api_user(request):
+    """
+    Authenticate a plain Django request with the REST framework authentication classes.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        CustomUser or None: The authenticated user.
+    """
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        user = drf_request.user
+    except AuthenticationFailed:
+        return None
+    return user if user.is_authenticated else None
+
+
+@require_GET
+async def notification_stream(request):
+    """
+    Stream new notifications of the authenticated user as server-sent events.
+
+    Must be served under ASGI, every open stream only holds a queue in the event loop. Notifications are
+    pushed by the chapter fan-out through the configured event broker.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        StreamingHttpResponse: A text/event-stream response, or 401 if the user is not authenticated.
+    """
+    user = await sync_to_async(authenticate_api_user)(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    return StreamingHttpResponse(
+        notification_events(user.pk, settings.SSE_HEARTBEAT_SECONDS),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )